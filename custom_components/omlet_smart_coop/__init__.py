@@ -5,20 +5,23 @@ import logging
 import re
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 
 from .coordinator import OmletDataCoordinator
-from .services import async_register_services
-from .entity import (
+from .services import async_register_services, async_track_target_index
+from .core.identity import (
     build_entity_unique_id,
     extract_known_suffix,
     normalize_device_serial,
 )
-from .sensor import SENSOR_TYPES
+from .core.devices import device_platforms
+from .core.entity_keys import SERIAL_UNIQUE_ID_SUFFIXES
+from .core.phase_timer import PhaseTimer
 from .const import (
     DOMAIN,
     PLATFORMS,
@@ -28,8 +31,8 @@ from .const import (
     CONF_WEBHOOK_ID,
     CONF_DISABLE_POLLING,
     CONF_WEBHOOK_NOTIFIED_ID,
+    WEBHOOK_JOURNAL_FILE,
 )
-from homeassistant.components import persistent_notification as pn
 from .const import CONF_WEBHOOK_TIP_SHOWN
 from .webhook_helpers import (
     ensure_omlet_webhook_id,
@@ -37,6 +40,7 @@ from .webhook_helpers import (
     register_omlet_webhook,
     unregister_omlet_webhook,
 )
+from .webhook_journal import WebhookJournal
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
@@ -45,30 +49,6 @@ _LOGGER = logging.getLogger(__name__)
 _SERIAL_UNIQUE_ID_MIGRATION_FLAG = "unique_id_migrated_v3"
 _STALE_DUPLICATE_CLEANUP_FLAG = "stale_duplicate_cleanup_v1"
 _NUMERIC_ENTITY_ID_SUFFIX_RE = re.compile(r"_\d+$")
-_SERIAL_UNIQUE_ID_SUFFIXES = {
-    "fan",
-    "door",
-    "feeder",
-    "light",
-    *SENSOR_TYPES.keys(),
-    "fan_mode",
-    "fan_manual_speed",
-    "fan_time_speed_1",
-    "fan_time_speed_2",
-    "fan_time_speed_3",
-    "fan_time_speed_4",
-    "fan_thermostat_speed",
-    "tempOn",
-    "tempOff",
-    "timeOn1",
-    "timeOn2",
-    "timeOn3",
-    "timeOn4",
-    "timeOff1",
-    "timeOff2",
-    "timeOff3",
-    "timeOff4",
-}
 
 
 def _entity_has_numeric_suffix(entity_id: str) -> bool:
@@ -124,7 +104,7 @@ async def _async_migrate_serial_unique_ids(
         for reg_entry in reg_entries:
             suffix = extract_known_suffix(
                 reg_entry.unique_id or "",
-                _SERIAL_UNIQUE_ID_SUFFIXES,
+                SERIAL_UNIQUE_ID_SUFFIXES,
             )
             if not suffix:
                 continue
@@ -201,6 +181,40 @@ async def _async_migrate_serial_unique_ids(
                 )
 
 
+def _platforms_needed(coordinator: OmletDataCoordinator) -> list[Platform]:
+    """Return the platforms with entities for the coordinator's devices, in PLATFORMS order."""
+    needed = device_platforms(coordinator.capabilities.values())
+    return [platform for platform in PLATFORMS if platform.value in needed]
+
+
+@callback
+def _async_forward_new_platforms(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: OmletDataCoordinator
+) -> None:
+    """Forward the entry to platforms that newly added devices need."""
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if entry_data is None:
+        return
+    forwarded = entry_data["platforms"]
+    new_platforms = [
+        platform for platform in _platforms_needed(coordinator) if platform not in forwarded
+    ]
+    if not new_platforms:
+        return
+    forwarded.update(new_platforms)
+    _LOGGER.info(
+        "Setting up %s for new Omlet devices", ", ".join(p.value for p in new_platforms)
+    )
+    # Forwarding after setup has finished must take the entry's setup lock
+    # (Home Assistant 2024.7+); older versions only have the plain call.
+    forward = getattr(
+        hass.config_entries,
+        "async_late_forward_entry_setups",
+        hass.config_entries.async_forward_entry_setups,
+    )
+    hass.async_create_task(forward(entry, new_platforms))
+
+
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Omlet Smart Coop integration."""
     hass.data.setdefault(DOMAIN, {})
@@ -214,6 +228,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.info(
         "Setting up Omlet Smart Coop integration for entry: %s", entry.entry_id
     )
+    timer = PhaseTimer()
 
     # Initialize the data coordinator
     try:
@@ -222,13 +237,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             entry.data["api_key"],
             entry,
         )
+        timer.mark("coordinator")
         await coordinator.async_config_entry_first_refresh()
     except Exception as ex:
         _LOGGER.error("Failed to initialize Omlet Smart Coop: %s", ex)
         raise ConfigEntryNotReady from ex
+    timer.mark("first_refresh")
+    coordinator.setup_phases = timer
 
-    # Store the coordinator in hass.data
-    hass.data[DOMAIN][entry.entry_id] = {"coordinator": coordinator}
+    # Store the coordinator in hass.data; "platforms" are those forwarded so far.
+    hass.data[DOMAIN][entry.entry_id] = {"coordinator": coordinator, "platforms": set()}
+    await coordinator.async_load_journal()
+    timer.mark("journal")
+
+    # Service targets resolve through a domain-wide index; keep it in step with
+    # this account's devices and registry entries while the entry is loaded.
+    async_track_target_index(hass, entry, coordinator)
 
     # Ensure services are registered even if HA hasn't been restarted (dev upgrades).
     # Registration is idempotent in services.py.
@@ -236,10 +260,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await async_register_services(hass, None)
     except Exception as ex:
         _LOGGER.warning("Service registration during setup_entry failed: %r", ex)
+    timer.mark("services")
 
     # One-time setup tip: guide users to enable webhooks in Options
     try:
         if not entry.options.get(CONF_ENABLE_WEBHOOKS, False) and not entry.data.get(CONF_WEBHOOK_TIP_SHOWN):
+            from homeassistant.components import persistent_notification as pn
+
             pn.async_create(
                 hass,
                 (
@@ -375,6 +402,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
     except Exception as ex:
         _LOGGER.warning("Stale duplicate cleanup skipped due to error: %r", ex)
+    timer.mark("migrations")
 
     # Optionally register webhook support
     try:
@@ -387,9 +415,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 webhook_id,
                 source="setup",
             )
+            if url_info.warning:
+                coordinator.async_update_webhook_issue(url_info.warning)
             # Notify only once per webhook_id unless rotated
             if entry.data.get(CONF_WEBHOOK_NOTIFIED_ID) != webhook_id:
                 try:
+                    from homeassistant.components import persistent_notification as pn
+
                     pn.async_create(
                         hass,
                         format_webhook_url_message(
@@ -407,9 +439,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 )
     except Exception as ex:
         _LOGGER.exception("Failed to set up webhook: %r", ex)
-
-    # Forward the entry to platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator.async_configure_watchdog()
+    timer.mark("webhook")
+
+    # Forward the entry to the platforms the account's devices need; others are
+    # forwarded when a device that needs them appears.
+    platforms = _platforms_needed(coordinator)
+    hass.data[DOMAIN][entry.entry_id]["platforms"].update(platforms)
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+    entry.async_on_unload(
+        coordinator.async_add_device_listener(
+            lambda _added, _removed: _async_forward_new_platforms(hass, entry, coordinator)
+        )
+    )
+    timer.mark("platforms")
+    _LOGGER.debug("Omlet setup phases for %s: %s", entry.entry_id, timer.as_dict())
 
     # Add an update listener for handling options changes
     entry.async_on_unload(entry.add_update_listener(update_listener))
@@ -422,13 +466,15 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.info("Unloading Omlet Smart Coop integration for entry: %s", entry.entry_id)
 
     # Unload platforms first
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    platforms = hass.data[DOMAIN].get(entry.entry_id, {}).get("platforms", PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, list(platforms))
 
     if unload_ok:
         # Clean up coordinator
         entry_data = hass.data[DOMAIN].pop(entry.entry_id, {})
         coordinator = entry_data.get("coordinator")
         if coordinator:
+            coordinator.async_update_webhook_issue(None)
             await coordinator.async_shutdown()
 
         # Unregister webhook if present
@@ -442,6 +488,17 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the webhook journal of a removed entry."""
+    journal = WebhookJournal(
+        hass.config.path(".storage", f"{WEBHOOK_JOURNAL_FILE}.{entry.entry_id}.jsonl")
+    )
+    try:
+        await hass.async_add_executor_job(journal.remove)
+    except OSError as ex:
+        _LOGGER.debug("Failed to remove the webhook journal: %s", ex)
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry):
     """Handle options updates."""
     _LOGGER.info("Updating options for entry: %s", entry.entry_id)
@@ -450,6 +507,10 @@ async def update_listener(hass: HomeAssistant, entry: ConfigEntry):
     entry_data = hass.data[DOMAIN][entry.entry_id]
     coordinator = entry_data["coordinator"]
 
+    # The webhook token may have changed: stop accepting the cached one before
+    # anything below yields to webhooks still arriving.
+    coordinator.webhook_tokens.invalidate()
+
     # Extract the new polling interval from options
     disable_polling = entry.options.get(CONF_DISABLE_POLLING, False)
     new_interval = None if disable_polling else entry.options.get(
@@ -483,9 +544,13 @@ async def update_listener(hass: HomeAssistant, entry: ConfigEntry):
                 current_id,
                 source="options",
             )
+            if url_info.warning:
+                coordinator.async_update_webhook_issue(url_info.warning)
             # Notify only once per webhook_id unless rotated
             if entry.data.get(CONF_WEBHOOK_NOTIFIED_ID) != current_id:
                 try:
+                    from homeassistant.components import persistent_notification as pn
+
                     pn.async_create(
                         hass,
                         format_webhook_url_message(
@@ -510,3 +575,4 @@ async def update_listener(hass: HomeAssistant, entry: ConfigEntry):
                     pass
     except Exception as ex:
         _LOGGER.exception("Webhook option update handling failed: %r", ex)
+    coordinator.async_configure_watchdog()
@@ -0,0 +1,325 @@
+"""Per-device command sequencing for Omlet devices.
+
+This module intentionally avoids Home Assistant imports so it can be loaded
+directly by tests. The coordinator owns one CommandQueue; every action and
+configuration PATCH sent to a device goes through it, so commands for the same
+device never interleave while different devices still run concurrently.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+KIND_ACTION = "action"
+KIND_PATCH = "patch"
+KIND_SEQUENCE = "sequence"
+
+# execute(device_id, kind, payload) sends one action (payload: actionValue) or
+# one configuration PATCH (payload: body) and returns the API response.
+Executor = Callable[[str, str, Any], Awaitable[Any]]
+
+
+# Actions that drive the same part of a device: open/close move a door or
+# feeder, on/off/boost switch a fan or light. Other actions only group with
+# themselves.
+_ACTION_GROUPS = {
+    "open": "motion",
+    "close": "motion",
+    "on": "power",
+    "off": "power",
+    "boost": "power",
+}
+
+
+def _action_group(action: str) -> str:
+    return _ACTION_GROUPS.get(action, action)
+
+
+SUPPRESSED_RECENT = "recent"
+SUPPRESSED_IN_PROGRESS = "in_progress"
+
+
+@dataclass(frozen=True)
+class SuppressedAction:
+    """Returned in place of an API response for an action that was not sent.
+
+    reason is SUPPRESSED_RECENT (the same action was just sent to that part of
+    the device) or SUPPRESSED_IN_PROGRESS (the device reports it as pending).
+    """
+
+    action: str
+    section: str | None
+    reason: str
+
+
+def _merge_patch(base: dict[str, Any], update: dict[str, Any]) -> dict[str, Any]:
+    """Merge configuration PATCH bodies section by section; update wins."""
+    merged = {section: dict(values) for section, values in base.items()}
+    for section, values in update.items():
+        if isinstance(values, dict) and isinstance(merged.get(section), dict):
+            merged[section].update(values)
+        else:
+            merged[section] = values
+    return merged
+
+
+@dataclass
+class _Command:
+    kind: str
+    payload: Any
+    future: asyncio.Future
+    enqueued: float
+    merged: int = 0
+    section: str | None = None
+
+    def absorb(self, kind: str, payload: Any, section: str | None = None) -> bool:
+        """Fold a newer command into this pending one if it makes it redundant.
+
+        A newer action replaces a pending action of the same group (on+on,
+        off+on, open+close, ...) for the same section: only the latest
+        requested state of that part of the device matters. An open never
+        merges into an on, nor a light on into a fan off. PATCH bodies are
+        merged. Sequences are never merged, so an explicit off/on cycle always
+        runs in full.
+        """
+        if kind != self.kind or kind == KIND_SEQUENCE:
+            return False
+        if kind == KIND_ACTION:
+            if section != self.section or _action_group(payload) != _action_group(
+                self.payload
+            ):
+                return False
+            self.payload = payload
+        else:
+            self.payload = _merge_patch(self.payload, payload)
+        self.merged += 1
+        return True
+
+
+@dataclass
+class CommandQueueStats:
+    """Queue latency (enqueue -> start) and throughput counters."""
+
+    executed: int = 0
+    merged: int = 0
+    failed: int = 0
+    last_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    total_wait_ms: float = 0.0
+    last_run_ms: float = 0.0
+    max_depth: int = 0
+    suppressed_recent: int = 0
+    suppressed_pending: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters with the derived mean queue wait."""
+        return {
+            "executed": self.executed,
+            "merged": self.merged,
+            "failed": self.failed,
+            "last_wait_ms": round(self.last_wait_ms, 1),
+            "max_wait_ms": round(self.max_wait_ms, 1),
+            "mean_wait_ms": (
+                round(self.total_wait_ms / self.executed, 1) if self.executed else 0.0
+            ),
+            "last_run_ms": round(self.last_run_ms, 1),
+            "max_depth": self.max_depth,
+            "suppressed_recent": self.suppressed_recent,
+            "suppressed_pending": self.suppressed_pending,
+        }
+
+
+class CommandQueue:
+    """Serialize commands per device, merging redundant pending commands.
+
+    Each step starts as soon as the previous step's API call has returned,
+    instead of after a fixed sleep. There is no background worker: whichever
+    caller holds a device's lock runs the oldest pending command for it, and
+    every caller returns once its own (possibly merged) command has run.
+
+    An action is acknowledged without being sent (returning a
+    SuppressedAction) when the same action was the last command sent to that
+    section (door, feeder, light, fan) of the device less than
+    idempotency_window seconds ago, or when in_progress(device_id, action,
+    section) reports the device is already carrying it out.
+    """
+
+    def __init__(
+        self,
+        execute: Executor,
+        clock: Callable[[], float] = time.monotonic,
+        *,
+        idempotency_window: float = 0.0,
+        in_progress: Callable[[str, str, str | None], bool] | None = None,
+    ) -> None:
+        self._execute = execute
+        self._clock = clock
+        self._idempotency_window = idempotency_window
+        self._in_progress = in_progress
+        self._pending: dict[str, deque[_Command]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # device_id -> {section: (action, monotonic time)} of the last action
+        # sent to each section; a PATCH or sequence clears the device.
+        self._last_action: dict[str, dict[str | None, tuple[str, float]]] = {}
+        self._running: dict[str, _Command] = {}
+        self.stats = CommandQueueStats()
+
+    def depth(self, device_id: str | None = None) -> int:
+        """Return pending commands for a device, or for all devices."""
+        if device_id is not None:
+            return len(self._pending.get(device_id, ()))
+        return sum(len(queue) for queue in self._pending.values())
+
+    async def async_action(
+        self, device_id: str, action: str, section: str | None = None
+    ) -> Any:
+        """Queue an action (on, off, open, ...) and return the API response.
+
+        section names the part of the device the action drives; idempotency
+        and in-progress checks only look at that part.
+        """
+        action = (action or "").lower()
+        running = self._running.get(device_id)
+        if (
+            self._idempotency_window
+            and running is not None
+            and running.kind == KIND_ACTION
+            and running.payload == action
+            and running.section == section
+            and not self.depth(device_id)
+        ):
+            # The same action is in flight right now; share its result.
+            self.stats.suppressed_recent += 1
+            return await asyncio.shield(running.future)
+        reason = self._suppression_reason(device_id, action, section)
+        if reason is not None:
+            return SuppressedAction(action, section, reason)
+        return await self._submit(device_id, KIND_ACTION, action, section)
+
+    def _suppression_reason(
+        self, device_id: str, action: str, section: str | None
+    ) -> str | None:
+        last = self._last_action.get(device_id, {}).get(section)
+        if (
+            last is not None
+            and last[0] == action
+            and self._clock() - last[1] < self._idempotency_window
+            and not self.depth(device_id)
+        ):
+            self.stats.suppressed_recent += 1
+            _LOGGER.debug("Skipping repeated %s %s for %s", section, action, device_id)
+            return SUPPRESSED_RECENT
+        if self._in_progress is not None and self._in_progress(device_id, action, section):
+            self.stats.suppressed_pending += 1
+            _LOGGER.debug(
+                "Skipping %s %s for %s: already in progress", section, action, device_id
+            )
+            return SUPPRESSED_IN_PROGRESS
+        return None
+
+    async def async_patch(self, device_id: str, patch: dict[str, Any]) -> Any:
+        """Queue a configuration PATCH and return the API response."""
+        return await self._submit(device_id, KIND_PATCH, patch)
+
+    async def async_sequence(
+        self, device_id: str, steps: Sequence[tuple[str, Any]]
+    ) -> Any:
+        """Queue (kind, payload) steps that run back to back, unmerged.
+
+        Only the last step is the command proper: a failing earlier step
+        (e.g. switching the fan to manual first) is logged and skipped.
+        Returns the last step's response.
+        """
+        return await self._submit(device_id, KIND_SEQUENCE, tuple(steps))
+
+    async def _submit(
+        self, device_id: str, kind: str, payload: Any, section: str | None = None
+    ) -> Any:
+        queue = self._pending.setdefault(device_id, deque())
+        if queue and queue[-1].absorb(kind, payload, section):
+            command = queue[-1]
+            self.stats.merged += 1
+        else:
+            command = _Command(
+                kind,
+                payload,
+                asyncio.get_running_loop().create_future(),
+                self._clock(),
+                section=section,
+            )
+            queue.append(command)
+            self.stats.max_depth = max(self.stats.max_depth, len(queue))
+
+        lock = self._locks.setdefault(device_id, asyncio.Lock())
+        while not command.future.done():
+            async with lock:
+                if command.future.done() or not queue:
+                    break
+                running = self._running[device_id] = queue.popleft()
+                try:
+                    await self._run(device_id, running)
+                finally:
+                    del self._running[device_id]
+        return command.future.result()
+
+    async def _run(self, device_id: str, command: _Command) -> None:
+        started = self._clock()
+        wait_ms = (started - command.enqueued) * 1000
+        stats = self.stats
+        stats.executed += 1
+        stats.last_wait_ms = wait_ms
+        stats.max_wait_ms = max(stats.max_wait_ms, wait_ms)
+        stats.total_wait_ms += wait_ms
+        try:
+            if command.kind == KIND_SEQUENCE:
+                result = await self._run_sequence(device_id, command.payload)
+            else:
+                result = await self._execute(device_id, command.kind, command.payload)
+        except BaseException as err:
+            stats.failed += 1
+            if not command.future.done():
+                command.future.set_exception(err)
+            if not isinstance(err, Exception):
+                raise
+        else:
+            command.future.set_result(result)
+            if command.kind == KIND_ACTION:
+                self._last_action.setdefault(device_id, {})[command.section] = (
+                    command.payload,
+                    self._clock(),
+                )
+            else:
+                self._last_action.pop(device_id, None)
+        finally:
+            stats.last_run_ms = (self._clock() - started) * 1000
+            _LOGGER.debug(
+                "Ran %s %s for %s after %.0f ms in queue (%d merged)",
+                command.kind,
+                command.payload,
+                device_id,
+                wait_ms,
+                command.merged,
+            )
+
+    async def _run_sequence(
+        self, device_id: str, steps: tuple[tuple[str, Any], ...]
+    ) -> Any:
+        if not steps:
+            return None
+        for kind, payload in steps[:-1]:
+            try:
+                await self._execute(device_id, kind, payload)
+            except Exception as err:
+                _LOGGER.debug(
+                    "Preparatory %s %s failed for %s: %r", kind, payload, device_id, err
+                )
+        kind, payload = steps[-1]
+        return await self._execute(device_id, kind, payload)
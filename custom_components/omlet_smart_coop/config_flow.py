@@ -11,6 +11,9 @@ from .const import (
     CONF_ENABLE_WEBHOOKS,
     CONF_WEBHOOK_TOKEN,
     CONF_DISABLE_POLLING,
+    CONF_WEBHOOK_HEARTBEAT,
+    DEFAULT_WEBHOOK_HEARTBEAT,
+    CONF_AUTO_TUNE_POLLING,
 )
 from .api_client import OmletApiClient
 
@@ -183,6 +186,11 @@ class OmletOptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Optional(CONF_ENABLE_WEBHOOKS, default=self._get_current_option(config_entry, CONF_ENABLE_WEBHOOKS, False)): bool,
                     vol.Optional(CONF_WEBHOOK_TOKEN, default=self._get_current_option(config_entry, CONF_WEBHOOK_TOKEN, "")): str,
                     vol.Optional(CONF_DISABLE_POLLING, default=self._get_current_option(config_entry, CONF_DISABLE_POLLING, False)): bool,
+                    vol.Optional(
+                        CONF_WEBHOOK_HEARTBEAT,
+                        default=self._get_current_option(config_entry, CONF_WEBHOOK_HEARTBEAT, DEFAULT_WEBHOOK_HEARTBEAT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+                    vol.Optional(CONF_AUTO_TUNE_POLLING, default=self._get_current_option(config_entry, CONF_AUTO_TUNE_POLLING, False)): bool,
                 }
             ),
             errors=errors,
@@ -0,0 +1,206 @@
+"""Configuration profiles and snapshots for a fleet of Omlet devices.
+
+This module intentionally avoids Home Assistant imports so it can be loaded
+directly by tests. A profile maps configuration sections (door, light, fan,
+general) to the API keys and values every device in the profile should have.
+A snapshot records each device's configuration so it can be restored later.
+services.py keeps both in Home Assistant storage and applies them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+import hashlib
+import json
+from typing import Any
+
+PROFILE_SECTIONS = ("door", "light", "fan", "general")
+SNAPSHOT_SECTIONS = ("door", "light", "fan", "general", "feeder")
+
+
+def validate_profile(profile: Any) -> dict[str, dict[str, Any]]:
+    """Return a normalized profile, raising ValueError if it is malformed.
+
+    Sections that are omitted or empty are dropped; at least one is required.
+    """
+    if not isinstance(profile, Mapping):
+        raise ValueError("Profile must be a mapping of configuration sections")
+    unknown = set(profile) - set(PROFILE_SECTIONS)
+    if unknown:
+        raise ValueError(
+            f"Unknown profile sections: {', '.join(sorted(unknown))} "
+            f"(expected {', '.join(PROFILE_SECTIONS)})"
+        )
+    normalized: dict[str, dict[str, Any]] = {}
+    for section in PROFILE_SECTIONS:
+        values = profile.get(section)
+        if values is None:
+            continue
+        if not isinstance(values, Mapping):
+            raise ValueError(f"Profile section '{section}' must be a mapping")
+        if values:
+            normalized[section] = dict(values)
+    if not normalized:
+        raise ValueError("Profile must set at least one configuration section")
+    return normalized
+
+
+def configuration_patch(
+    configuration: Mapping[str, Any] | None, desired: Mapping[str, Mapping[str, Any]]
+) -> dict[str, dict[str, Any]]:
+    """Return {section: {key: value}} for every desired value not yet applied.
+
+    Sections with no differences are left out, so the result can be sent as a
+    configuration PATCH as-is; an empty result means the device already matches.
+    """
+    configuration = configuration if isinstance(configuration, Mapping) else {}
+    patch: dict[str, dict[str, Any]] = {}
+    for section, values in desired.items():
+        current = configuration.get(section)
+        if not isinstance(current, Mapping):
+            current = {}
+        changed = {key: value for key, value in values.items() if current.get(key) != value}
+        if changed:
+            patch[section] = changed
+    return patch
+
+
+def configuration_drift(
+    configuration: Mapping[str, Any] | None, desired: Mapping[str, Mapping[str, Any]]
+) -> dict[str, dict[str, dict[str, Any]]]:
+    """Return {section: {key: {"current": ..., "desired": ...}}} for differences."""
+    configuration = configuration if isinstance(configuration, Mapping) else {}
+    drift: dict[str, dict[str, dict[str, Any]]] = {}
+    for section, changed in configuration_patch(configuration, desired).items():
+        current = configuration.get(section)
+        if not isinstance(current, Mapping):
+            current = {}
+        drift[section] = {
+            key: {"current": current.get(key), "desired": value}
+            for key, value in changed.items()
+        }
+    return drift
+
+
+def content_hash(value: Any) -> str:
+    """Return a short, stable hash of JSON-serializable content."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+def snapshot_sections(configuration: Mapping[str, Any] | None) -> dict[str, dict[str, Any]]:
+    """Return the non-empty snapshot sections of a device configuration."""
+    if not isinstance(configuration, Mapping):
+        return {}
+    return {
+        section: dict(values)
+        for section in SNAPSHOT_SECTIONS
+        if isinstance(values := configuration.get(section), Mapping) and values
+    }
+
+
+class SnapshotLibrary:
+    """Versioned configuration snapshots, deduplicated by content hash.
+
+    Each device configuration is stored once as a blob keyed by its hash, and a
+    snapshot only maps device ids to blob hashes. The snapshot id is the hash of
+    that mapping, so capturing an unchanged fleet again adds nothing.
+    """
+
+    def __init__(self, data: Mapping[str, Any] | None = None, max_snapshots: int = 20) -> None:
+        data = data or {}
+        self.max_snapshots = max_snapshots
+        self._blobs: dict[str, dict[str, Any]] = dict(data.get("blobs") or {})
+        # Oldest first.
+        self._snapshots: list[dict[str, Any]] = [
+            dict(snapshot) for snapshot in data.get("snapshots") or []
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the storage payload."""
+        return {"blobs": self._blobs, "snapshots": self._snapshots}
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def capture(
+        self,
+        configurations: Mapping[str, Mapping[str, Any] | None],
+        *,
+        name: str | None = None,
+        created: str | None = None,
+    ) -> tuple[str, bool]:
+        """Record {device_id: configuration}; return (snapshot_id, added).
+
+        added is False when an identical snapshot already exists; it is then
+        moved to the newest position and renamed if a name is given.
+        """
+        devices: dict[str, str] = {}
+        for device_id, configuration in configurations.items():
+            sections = snapshot_sections(configuration)
+            if not sections:
+                continue
+            blob_id = content_hash(sections)
+            self._blobs.setdefault(blob_id, sections)
+            devices[device_id] = blob_id
+
+        snapshot_id = content_hash(devices)
+        existing = self._find(snapshot_id)
+        if existing is not None:
+            self._snapshots.remove(existing)
+            if name:
+                existing["name"] = name
+            self._snapshots.append(existing)
+            return snapshot_id, False
+
+        self._snapshots.append(
+            {"id": snapshot_id, "name": name, "created": created, "devices": devices}
+        )
+        self._prune()
+        return snapshot_id, True
+
+    def _find(self, key: str | None) -> dict[str, Any] | None:
+        if not self._snapshots:
+            return None
+        if not key:
+            return self._snapshots[-1]
+        # Newest match wins when several snapshots share a name.
+        for snapshot in reversed(self._snapshots):
+            if key in (snapshot["id"], snapshot.get("name")):
+                return snapshot
+        return None
+
+    def get(self, key: str | None = None) -> dict[str, dict[str, Any]] | None:
+        """Return {device_id: sections} for a snapshot id or name (latest if None)."""
+        snapshot = self._find(key)
+        if snapshot is None:
+            return None
+        return {
+            device_id: self._blobs[blob_id]
+            for device_id, blob_id in snapshot["devices"].items()
+            if blob_id in self._blobs
+        }
+
+    def summaries(self) -> list[dict[str, Any]]:
+        """Return id, name, created and device count of every snapshot, newest first."""
+        return [
+            {
+                "id": snapshot["id"],
+                "name": snapshot.get("name"),
+                "created": snapshot.get("created"),
+                "devices": len(snapshot["devices"]),
+            }
+            for snapshot in reversed(self._snapshots)
+        ]
+
+    def _prune(self) -> None:
+        """Drop the oldest snapshots over the limit and blobs no longer used."""
+        if len(self._snapshots) <= self.max_snapshots:
+            return
+        del self._snapshots[: len(self._snapshots) - self.max_snapshots]
+        used: set[str] = set()
+        for snapshot in self._snapshots:
+            used.update(snapshot["devices"].values())
+        for blob_id in [blob_id for blob_id in self._blobs if blob_id not in used]:
+            del self._blobs[blob_id]
+
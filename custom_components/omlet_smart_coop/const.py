@@ -23,6 +23,10 @@ CONF_POLLING_INTERVAL = "polling_interval"  # API Polling Interval
 CONF_DEFAULT_POLLING_INTERVAL = 300  # Polling interval in seconds
 MIN_POLLING_INTERVAL = 60  # Minimum allowed polling interval in seconds
 MAX_POLLING_INTERVAL = 86400  # Maximum allowed polling interval in seconds
+MAX_CONCURRENT_COMMANDS = 8  # Cloud commands in flight at once across service calls
+CONFIG_CACHE_MAX_AGE = 900  # Max age in seconds of cached config used to diff updates
+ACTION_IDEMPOTENCY_WINDOW = 5  # Seconds an identical action to a device is not re-sent
+CONFIG_VERIFY_DELAY = 10  # Seconds after a configuration PATCH before reading it back
 
 # Service constants
 SERVICE_OPEN_DOOR = "open_door"
@@ -31,9 +35,38 @@ SERVICE_RESTART_DEVICE = "restart_device"
 SERVICE_UPDATE_OVERNIGHT_SLEEP = "update_overnight_sleep"
 SERVICE_UPDATE_DOOR_SCHEDULE = "update_door_schedule"
 SERVICE_SHOW_WEBHOOK_URL = "show_webhook_url"
+SERVICE_SAVE_PROFILE = "save_profile"
+SERVICE_APPLY_PROFILE = "apply_profile"
+
+# Fleet configuration profiles (Home Assistant storage)
+PROFILE_STORAGE_KEY = f"{DOMAIN}.profiles"
+PROFILE_STORAGE_VERSION = 1
+
+# Fleet configuration snapshots (Home Assistant storage)
+SERVICE_SNAPSHOT_CONFIGURATION = "snapshot_configuration"
+SERVICE_RESTORE_CONFIGURATION = "restore_configuration"
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshots"
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_RETENTION = 20  # Snapshots kept; the oldest are dropped first
+
+# Webhook event journal (JSON Lines in .storage, one file per entry)
+SERVICE_REPLAY_WEBHOOK_EVENTS = "replay_webhook_events"
+WEBHOOK_JOURNAL_FILE = f"{DOMAIN}.webhook_journal"
+WEBHOOK_JOURNAL_MAX_EVENTS = 500  # Events kept; the file is compacted past twice this
+WEBHOOK_JOURNAL_FLUSH_DELAY = 5  # Seconds events are batched before being written
+
+# Traffic traces for offline replay (JSON Lines under <config>/omlet_smart_coop_traces)
+SERVICE_CAPTURE_TRACE = "capture_trace"
+TRACE_DIR = f"{DOMAIN}_traces"
+TRACE_DEFAULT_DURATION = 600  # Seconds a capture runs unless stopped earlier
+TRACE_FLUSH_DELAY = 5  # Seconds records are batched before being written
 
 # Service Fields/Attributes
 ATTR_ENABLED = "enabled"
+ATTR_LIMIT = "limit"
+ATTR_REALTIME = "realtime"
+ATTR_DURATION = "duration"
+ATTR_STOP = "stop"
 ATTR_START_TIME = "start_time"
 ATTR_END_TIME = "end_time"
 ATTR_DOOR_MODE = "door_mode"
@@ -44,6 +77,9 @@ ATTR_CLOSE_LIGHT_LEVEL = "close_light_level"
 ATTR_OPEN_DELAY = "open_delay"
 ATTR_CLOSE_DELAY = "close_delay"
 ATTR_POLL_MODE = "poll_mode"
+ATTR_PROFILE = "profile"
+ATTR_CHECK_MODE = "check_mode"
+ATTR_SNAPSHOT = "snapshot"
 POLL_MODE_RESPONSIVE = "responsive"
 POLL_MODE_POWER_SAVINGS = "power_savings"
 POLL_MODE_NOTIFICATIONS_ONLY = "notifications_only"
@@ -61,6 +97,9 @@ CONF_WEBHOOK_TOKEN = "webhook_token"
 CONF_DISABLE_POLLING = "disable_polling"  # Webhooks-only mode
 CONF_WEBHOOK_NOTIFIED_ID = "webhook_notified_id"  # Last webhook_id shown in notification
 CONF_WEBHOOK_TIP_SHOWN = "webhook_tip_shown"      # One-time setup tip shown
+CONF_WEBHOOK_HEARTBEAT = "webhook_heartbeat_interval"  # Poll after this much silence (0 = off)
+CONF_AUTO_TUNE_POLLING = "auto_tune_polling"  # Tune the polling interval from webhook misses
+DEFAULT_WEBHOOK_HEARTBEAT = 3600  # Seconds without webhooks or fetches before a heartbeat poll
 
 
 # Log Messages
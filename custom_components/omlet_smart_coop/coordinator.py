@@ -1,10 +1,51 @@
+import asyncio
 import logging
+import time
 from datetime import timedelta
-from typing import Dict, Any, Set, List, Callable
+from typing import Dict, Any, Set, List, Callable, Iterable
 from dataclasses import dataclass, field
+from homeassistant.core import callback
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from .api_client import OmletApiClient
-from .const import MIN_POLLING_INTERVAL, MAX_POLLING_INTERVAL, CONF_DISABLE_POLLING
+from .command_queue import KIND_ACTION, CommandQueue
+from .config_helpers import content_hash
+from .core.convergence import ConvergenceTracker
+from .poll_drift import PollDriftDetector, event_state
+from .refresh_schedule import RefreshSchedule
+from .webhook_helpers import WebhookMetrics, WebhookTokenVerifier
+from .webhook_journal import WebhookJournal
+from .trace_capture import TRACE_KIND_DEVICES, TRACE_KIND_WEBHOOK, TraceRecorder
+from .webhook_watchdog import WebhookWatchdog
+from .core.devices import (
+    EMPTY_CAPABILITIES,
+    DeviceCapabilities,
+    action_in_progress,
+    apply_configuration_patch,
+    build_action_index,
+    build_device_capabilities,
+    fallback_action_url,
+)
+from .core.identity import get_stable_device_identity
+from .core.phase_timer import PhaseTimer
+from .core.parsing import REQUIRED_ACTION_FIELDS, REQUIRED_DEVICE_FIELDS, parse_devices
+from .const import (
+    ACTION_IDEMPOTENCY_WINDOW,
+    CONFIG_VERIFY_DELAY,
+    MIN_POLLING_INTERVAL,
+    MAX_POLLING_INTERVAL,
+    CONF_AUTO_TUNE_POLLING,
+    CONF_DISABLE_POLLING,
+    CONF_ENABLE_WEBHOOKS,
+    CONF_WEBHOOK_HEARTBEAT,
+    DEFAULT_WEBHOOK_HEARTBEAT,
+    DOMAIN,
+    WEBHOOK_JOURNAL_FILE,
+    WEBHOOK_JOURNAL_FLUSH_DELAY,
+    WEBHOOK_JOURNAL_MAX_EVENTS,
+    TRACE_FLUSH_DELAY,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,48 +56,14 @@ class ValidationConfig:
 
     min_polling_interval: int = MIN_POLLING_INTERVAL
     max_polling_interval: int = MAX_POLLING_INTERVAL
-    required_device_fields: Set[str] = field(default_factory=lambda: {"deviceId"})
+    required_device_fields: Set[str] = field(
+        default_factory=lambda: set(REQUIRED_DEVICE_FIELDS)
+    )
     required_action_fields: Set[str] = field(
-        default_factory=lambda: {"actionName", "description", "actionValue"}
+        default_factory=lambda: set(REQUIRED_ACTION_FIELDS)
     )
 
 
-class DataParser:
-    """Utility class for parsing data safely."""
-
-    @staticmethod
-    def safe_parse(
-        data: Dict[str, Any], parser_func: Callable[[Dict[str, Any]], Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """Safely parse data using the provided parser function.
-
-        Args:
-            data: Dictionary of data to parse
-            parser_func: Function to use for parsing
-
-        Returns:
-            Parsed data dictionary or empty dict if parsing fails
-        """
-        try:
-            return parser_func(data)
-        except Exception as err:
-            _LOGGER.error("Error parsing data: %s", str(err))
-            return {}
-
-    @staticmethod
-    def extract_fields(data: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
-        """Extract specified fields from a dictionary.
-
-        Args:
-            data: Source dictionary
-            fields: List of fields to extract
-
-        Returns:
-            Dictionary containing requested fields (only non-None values)
-        """
-        return {field: data.get(field) for field in fields if data.get(field) is not None}
-
-
 class OmletDataCoordinator(DataUpdateCoordinator):
     """Coordinator to handle Omlet data updates."""
 
@@ -65,9 +72,62 @@ class OmletDataCoordinator(DataUpdateCoordinator):
         self.api_key = api_key
         self.api_client = OmletApiClient(api_key, hass)
         self.devices: Dict[str, Any] = {}
+        self.capabilities: Dict[str, DeviceCapabilities] = {}
+        self.action_urls: Dict[str, Dict[str, str]] = {}
+        # (device_id, action) pairs already warned about the direct endpoint.
+        self._fallback_actions_warned: Set[tuple[str, str]] = set()
         self.config_entry = config_entry
+        # time.monotonic() of the last successful refresh, for cache-age checks.
+        self.last_refresh_monotonic: float | None = None
         self.validation = ValidationConfig()
+        # Serializes actions/PATCHes per device and merges redundant ones.
+        self.command_queue = CommandQueue(
+            self._async_send_command,
+            idempotency_window=ACTION_IDEMPOTENCY_WINDOW,
+            in_progress=lambda device_id, action, section: action_in_progress(
+                (self.data or {}).get(device_id), action, section
+            ),
+        )
+        # Commanded states shown until devices report them; drives follow-up polls.
+        self.convergence = ConvergenceTracker()
+        # Follow-up refreshes requested after commands, merged per window.
+        self.followups = RefreshSchedule()
+        # One timer drives both convergence polls and follow-up refreshes.
+        self._unsub_followup: Callable[[], None] | None = None
+        # Set up by async_configure_watchdog while webhooks are enabled.
+        self.webhook_watchdog: WebhookWatchdog | None = None
+        self._unsub_heartbeat: Callable[[], None] | None = None
+        self._heartbeat_in_progress = False
+        # Changes polling found that no webhook reported; tunes the interval.
+        self.poll_drift = PollDriftDetector()
+        # Webhook handler counters and latencies for this entry.
+        self.webhook_metrics = WebhookMetrics()
+        # Cached expected webhook token; invalidated when options change.
+        self.webhook_tokens = WebhookTokenVerifier(config_entry)
+        # Accepted webhook events, written to .storage in batches off the loop.
+        self.webhook_journal = WebhookJournal(
+            hass.config.path(
+                ".storage", f"{WEBHOOK_JOURNAL_FILE}.{config_entry.entry_id}.jsonl"
+            ),
+            WEBHOOK_JOURNAL_MAX_EVENTS,
+        )
+        self._unsub_journal_flush: Callable[[], None] | None = None
+        # Set while a capture_trace capture runs.
+        self.trace_recorder: TraceRecorder | None = None
+        self._unsub_trace_flush: Callable[[], None] | None = None
+        self._unsub_trace_stop: Callable[[], None] | None = None
+        # Serializes journal and trace file writes.
+        self._write_lock = asyncio.Lock()
+        # Phase durations of the last async_setup_entry, for diagnostics.
+        self.setup_phases: PhaseTimer | None = None
         self._unsub_refresh = None
+        # Stable identities seen on the last successful refresh; None until the
+        # first refresh so initial platform setup is not reported as "added".
+        self._known_identities: Set[str] | None = None
+        self._device_listeners: List[Callable[[List[str], Set[str]], None]] = []
+        # Entity update callbacks by stable device identity, so device-scoped
+        # updates still reach entities after a device's deviceId changes.
+        self._entity_listeners: Dict[str, List[Callable[[], None]]] = {}
 
         # Validate and set the polling interval (or disable if requested)
         if config_entry.options.get(CONF_DISABLE_POLLING, False):
@@ -102,6 +162,462 @@ class OmletDataCoordinator(DataUpdateCoordinator):
             return {}
         return next(iter(self.devices.values()))
 
+    def get_capabilities(self, device_id: str | None) -> DeviceCapabilities:
+        """Return the capabilities computed for a device on the last refresh."""
+        capabilities = self.capabilities.get(device_id)
+        if capabilities is not None:
+            return capabilities
+        device_data = (self.data or {}).get(device_id)
+        if not device_data:
+            return EMPTY_CAPABILITIES
+        return build_device_capabilities(device_data)
+
+    def data_age(self) -> float | None:
+        """Seconds since the last successful refresh, or None before the first."""
+        if self.last_refresh_monotonic is None:
+            return None
+        return time.monotonic() - self.last_refresh_monotonic
+
+    def get_action_url(self, device_id: str, action_value: str) -> str:
+        """Return the URL for a device action, falling back to the direct endpoint."""
+        action_value = (action_value or "").lower()
+        index = self.action_urls.get(device_id)
+        if index is None:
+            index = build_action_index(
+                ((self.data or {}).get(device_id) or {}).get("actions")
+            )
+        url = index.get(action_value)
+        if url:
+            return url
+        key = (device_id, action_value)
+        if key in self._fallback_actions_warned:
+            log = _LOGGER.debug
+        else:
+            self._fallback_actions_warned.add(key)
+            log = _LOGGER.warning
+        log(
+            "Action %s missing in device actions for %s; falling back to direct action endpoint",
+            action_value,
+            device_id,
+        )
+        return fallback_action_url(device_id, action_value)
+
+    async def _async_send_command(self, device_id: str, kind: str, payload: Any) -> Any:
+        """Send one queued command to the API."""
+        self.poll_drift.command_sent(device_id)
+        if kind == KIND_ACTION:
+            return await self.api_client.execute_action(
+                self.get_action_url(device_id, payload)
+            )
+        response = await self.api_client.patch_device_configuration(device_id, payload)
+        self._async_write_through(device_id, payload, response)
+        return response
+
+    @callback
+    def _async_write_through(
+        self, device_id: str, patch: Dict[str, Any], response: Any
+    ) -> None:
+        """Apply an accepted PATCH to the cached device and verify it later.
+
+        Only the entities of that device are updated; one follow-up refresh
+        confirms what the API actually stored.
+        """
+        device_data = (self.data or {}).get(device_id)
+        if not device_data:
+            return
+        device_data = apply_configuration_patch(device_data, patch, response)
+        self.data[device_id] = device_data
+        self.capabilities[device_id] = build_device_capabilities(device_data)
+        self.async_update_device_listeners(device_id)
+        self.async_schedule_followup_refresh((CONFIG_VERIFY_DELAY,))
+
+    @callback
+    def async_add_entity_listener(
+        self, identity: str, update_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Register an entity for updates of the device with a stable identity.
+
+        Returns a callback that unsubscribes.
+        """
+        self._entity_listeners.setdefault(identity, []).append(update_callback)
+
+        @callback
+        def _unsubscribe() -> None:
+            callbacks = self._entity_listeners.get(identity)
+            if callbacks and update_callback in callbacks:
+                callbacks.remove(update_callback)
+                if not callbacks:
+                    del self._entity_listeners[identity]
+
+        return _unsubscribe
+
+    @callback
+    def async_update_device_listeners(self, device_id: str) -> None:
+        """Notify only the entities of the device currently known as device_id."""
+        identity = get_stable_device_identity((self.data or {}).get(device_id), device_id)
+        for update_callback in list(self._entity_listeners.get(identity, ())):
+            update_callback()
+
+    async def async_execute_action(
+        self, device_id: str, action_value: str, section: str | None = None
+    ) -> Any:
+        """Queue a device action and return the API response.
+
+        section is the part of the device the action drives (door, feeder,
+        light, fan). A SuppressedAction is returned instead of a response when
+        that part was just sent the same action or is already carrying it out.
+        """
+        return await self.command_queue.async_action(device_id, action_value, section)
+
+    async def async_patch_configuration(
+        self, device_id: str, configuration: Dict[str, Any]
+    ) -> Any:
+        """Queue a configuration PATCH and return the API response."""
+        return await self.command_queue.async_patch(device_id, configuration)
+
+    async def async_execute_sequence(
+        self, device_id: str, steps: List[tuple[str, Any]]
+    ) -> Any:
+        """Queue (kind, payload) steps that run back to back for one device."""
+        return await self.command_queue.async_sequence(device_id, steps)
+
+    @callback
+    def async_track_convergence(
+        self, device_id: str, section: str, optimistic: str, targets: Set[str]
+    ) -> None:
+        """Show optimistic until the device reports one of targets for section.
+
+        The device's entities are updated right away; the coordinator then
+        refreshes on a backoff schedule only until the state converges or
+        times out.
+        """
+        self.convergence.start(device_id, section, optimistic, targets)
+        self._async_schedule_followup()
+        self.async_update_device_listeners(device_id)
+
+    @callback
+    def async_schedule_followup_refresh(self, delays: Iterable[float]) -> None:
+        """Refresh again after each delay; nearby and duplicate requests collapse."""
+        self.followups.add(delays)
+        self._async_schedule_followup()
+
+    @callback
+    def _async_schedule_followup(self) -> None:
+        """(Re)arm the single follow-up timer, or cancel it when idle."""
+        if self._unsub_followup is not None:
+            self._unsub_followup()
+            self._unsub_followup = None
+        delays = [
+            delay
+            for delay in (self.followups.next_delay(), self.convergence.next_delay())
+            if delay is not None
+        ]
+        if delays:
+            self._unsub_followup = async_call_later(
+                self.hass, min(delays), self._async_followup
+            )
+
+    async def _async_followup(self, _now) -> None:
+        self._unsub_followup = None
+        self.convergence.mark_polled()
+        self.followups.pop_due()
+        await self.async_request_refresh()
+        # A failed refresh does not notify listeners; re-arm for what is left.
+        self._async_schedule_followup()
+
+    @callback
+    def async_configure_watchdog(self) -> None:
+        """Start, retune or stop the webhook watchdog from the entry options."""
+        options = self.config_entry.options
+        heartbeat = int(options.get(CONF_WEBHOOK_HEARTBEAT, DEFAULT_WEBHOOK_HEARTBEAT))
+        if not options.get(CONF_ENABLE_WEBHOOKS, False) or heartbeat <= 0:
+            self.webhook_watchdog = None
+            self._async_cancel_heartbeat()
+            self.async_update_webhook_issue(None)
+            return
+        if self.webhook_watchdog is None:
+            self.webhook_watchdog = WebhookWatchdog(heartbeat)
+        else:
+            self.webhook_watchdog.heartbeat_after = heartbeat
+        self._async_arm_heartbeat()
+
+    @callback
+    def async_webhook_received(
+        self, event: Dict[str, Any] | None = None, token_source: str | None = None
+    ) -> None:
+        """Record an accepted webhook event and journal it."""
+        event = event or {}
+        self.webhook_journal.record(event, token_source)
+        if self._unsub_journal_flush is None:
+            self._unsub_journal_flush = async_call_later(
+                self.hass, WEBHOOK_JOURNAL_FLUSH_DELAY, self._async_flush_journal
+            )
+        self.poll_drift.webhook_received(event.get("deviceId"))
+        watchdog = self.webhook_watchdog
+        if watchdog is None:
+            return
+        if watchdog.webhook_received():
+            _LOGGER.info("Omlet webhooks are arriving again")
+        # Any webhook proves the URL works, including after a registration warning.
+        self.async_update_webhook_issue(None)
+        self._async_arm_heartbeat()
+
+    @callback
+    def async_trace_webhook(self, payload: Any, token_source: str | None) -> None:
+        """Record an accepted webhook's raw body while a capture runs.
+
+        The body is kept as received (redacted by the recorder) together with
+        where its token came from, so a replay can rebuild the request.
+        """
+        self._async_trace(
+            TRACE_KIND_WEBHOOK, {"body": payload, "token_source": token_source}
+        )
+
+    async def async_load_journal(self) -> None:
+        """Load the webhook events journaled by a previous run."""
+        try:
+            await self.hass.async_add_executor_job(self.webhook_journal.load)
+        except OSError as err:
+            _LOGGER.warning("Could not read the Omlet webhook journal: %s", err)
+
+    async def _async_flush_journal(self, _now=None) -> None:
+        """Write pending journal events in one batch."""
+        self._unsub_journal_flush = None
+        async with self._write_lock:
+            batch, rewrite = self.webhook_journal.take_batch()
+            if not batch:
+                return
+            try:
+                await self.hass.async_add_executor_job(
+                    self.webhook_journal.write, batch, rewrite
+                )
+            except OSError as err:
+                _LOGGER.warning("Could not write the Omlet webhook journal: %s", err)
+
+    @callback
+    def async_start_trace(self, path: str, duration: float) -> None:
+        """Record /device responses and webhook payloads to path for duration seconds."""
+        # Deferred: diagnostics pulls in homeassistant.components.diagnostics.
+        from .diagnostics import _REDACT_KEYS
+
+        if self._unsub_trace_stop is not None:
+            self._unsub_trace_stop()
+        previous = self.trace_recorder
+        if previous is not None:
+            self.hass.async_create_task(self._async_flush_trace(recorder=previous))
+        self.trace_recorder = TraceRecorder(path, _REDACT_KEYS)
+        self._unsub_trace_stop = async_call_later(
+            self.hass, duration, self.async_stop_trace
+        )
+        _LOGGER.info("Capturing Omlet traffic to %s for %s s", path, duration)
+
+    async def async_stop_trace(self, _now=None) -> Dict[str, Any] | None:
+        """Stop the running capture, write what is left and return its summary."""
+        recorder = self.trace_recorder
+        if recorder is None:
+            return None
+        self.trace_recorder = None
+        for unsub in (self._unsub_trace_stop, self._unsub_trace_flush):
+            if unsub is not None:
+                unsub()
+        self._unsub_trace_stop = self._unsub_trace_flush = None
+        await self._async_flush_trace(recorder=recorder)
+        _LOGGER.info("Omlet traffic capture finished: %s", recorder.as_dict())
+        return recorder.as_dict()
+
+    @callback
+    def _async_trace(self, kind: str, data: Any) -> None:
+        recorder = self.trace_recorder
+        if recorder is None or not recorder.record(kind, data):
+            return
+        if self._unsub_trace_flush is None:
+            self._unsub_trace_flush = async_call_later(
+                self.hass, TRACE_FLUSH_DELAY, self._async_flush_trace
+            )
+
+    async def _async_flush_trace(
+        self, _now=None, *, recorder: TraceRecorder | None = None
+    ) -> None:
+        """Write pending trace records in one batch."""
+        if recorder is None:
+            self._unsub_trace_flush = None
+            recorder = self.trace_recorder
+        if recorder is None:
+            return
+        async with self._write_lock:
+            batch = recorder.take_batch()
+            if not batch:
+                return
+            try:
+                await self.hass.async_add_executor_job(recorder.write, batch)
+            except OSError as err:
+                _LOGGER.warning("Could not write the Omlet traffic trace: %s", err)
+
+    @callback
+    def async_update_webhook_issue(self, reason: str | None) -> None:
+        """Raise (reason given) or clear the webhook delivery repair issue."""
+        issue_id = f"webhook_delivery_{self.config_entry.entry_id}"
+        if reason is None:
+            ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+            return
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            issue_id,
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="webhook_delivery",
+            translation_placeholders={
+                "title": self.config_entry.title,
+                "reason": reason,
+            },
+        )
+
+    @callback
+    def _async_cancel_heartbeat(self) -> None:
+        if self._unsub_heartbeat is not None:
+            self._unsub_heartbeat()
+            self._unsub_heartbeat = None
+
+    @callback
+    def _async_arm_heartbeat(self) -> None:
+        """Schedule the heartbeat poll for the end of the current silence."""
+        self._async_cancel_heartbeat()
+        if self.webhook_watchdog is not None:
+            self._unsub_heartbeat = async_call_later(
+                self.hass, self.webhook_watchdog.heartbeat_due_in(), self._async_heartbeat
+            )
+
+    async def _async_heartbeat(self, _now) -> None:
+        self._unsub_heartbeat = None
+        watchdog = self.webhook_watchdog
+        if watchdog is None:
+            return
+        if watchdog.heartbeat_due_in() <= 0:
+            _LOGGER.debug(
+                "No Omlet webhook or update for %s s; polling once", watchdog.heartbeat_after
+            )
+            self._heartbeat_in_progress = True
+            try:
+                await self.async_request_refresh()
+            finally:
+                self._heartbeat_in_progress = False
+        self._async_arm_heartbeat()
+
+    @callback
+    def _async_fetch_completed(self, devices: Dict[str, Any]) -> None:
+        """Feed a successful fetch to the webhook watchdog and drift detector."""
+        if not self.config_entry.options.get(CONF_ENABLE_WEBHOOKS, False):
+            return
+        fingerprints = {
+            device_id: content_hash(event_state(device))
+            for device_id, device in devices.items()
+        }
+        if self.poll_drift.fetch_completed(fingerprints):
+            _LOGGER.debug(
+                "Omlet poll found changes without a webhook; miss rate %s",
+                self.poll_drift.miss_rate(),
+            )
+        self._async_tune_polling_interval()
+        watchdog = self.webhook_watchdog
+        if watchdog is None:
+            return
+        fingerprint = content_hash(fingerprints)
+        if watchdog.fetch_completed(fingerprint, heartbeat=self._heartbeat_in_progress):
+            _LOGGER.warning(
+                "Omlet heartbeat polls found %d device changes without a webhook",
+                watchdog.missed,
+            )
+            self.async_update_webhook_issue(
+                f"{watchdog.missed} heartbeat polls in a row found device changes "
+                "that no webhook had reported."
+            )
+        if not self._heartbeat_in_progress:
+            self._async_arm_heartbeat()
+
+    @callback
+    def _async_tune_polling_interval(self) -> None:
+        """Lengthen or shorten polling from the webhook miss rate, if enabled."""
+        if (
+            self.update_interval is None
+            or not self.config_entry.options.get(CONF_AUTO_TUNE_POLLING, False)
+        ):
+            return
+        current = int(self.update_interval.total_seconds())
+        miss_rate = self.poll_drift.miss_rate()
+        suggested = self.poll_drift.suggest_interval(
+            current,
+            self.validation.min_polling_interval,
+            self.validation.max_polling_interval,
+        )
+        if suggested == current:
+            return
+        # Takes effect when the coordinator schedules the next refresh.
+        self.update_interval = timedelta(seconds=suggested)
+        _LOGGER.info(
+            "Polling interval auto-tuned from %s to %s seconds (webhook miss rate %s)",
+            current,
+            suggested,
+            miss_rate,
+        )
+
+    @callback
+    def async_add_device_listener(
+        self, listener: Callable[[List[str], Set[str]], None]
+    ) -> Callable[[], None]:
+        """Listen for devices appearing or disappearing between refreshes.
+
+        The listener receives the deviceIds that were added and the stable
+        identities that were removed. Returns a callback that unsubscribes.
+        """
+        self._device_listeners.append(listener)
+
+        @callback
+        def _unsubscribe() -> None:
+            if listener in self._device_listeners:
+                self._device_listeners.remove(listener)
+
+        return _unsubscribe
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Dispatch device additions/removals, then notify entity listeners."""
+        if self.last_update_success:
+            self._async_dispatch_device_changes()
+            self.convergence.observe(self.data)
+            self.followups.pop_due()
+            self.webhook_metrics.entities_updated()
+        self._async_schedule_followup()
+        super().async_update_listeners()
+
+    @callback
+    def _async_dispatch_device_changes(self) -> None:
+        """Diff device identities against the previous refresh."""
+        current = {
+            get_stable_device_identity(device_data, device_id): device_id
+            for device_id, device_data in (self.data or {}).items()
+        }
+        known = self._known_identities
+        self._known_identities = set(current)
+        if known is None:
+            return
+
+        added = [device_id for identity, device_id in current.items() if identity not in known]
+        removed = known - current.keys()
+        if not added and not removed:
+            return
+
+        _LOGGER.info(
+            "Omlet devices changed: added=%s removed=%s",
+            added,
+            sorted(removed),
+        )
+        for listener in list(self._device_listeners):
+            try:
+                listener(added, removed)
+            except Exception:
+                _LOGGER.exception("Error handling Omlet device changes")
+
     def _validate_polling_interval(self, interval: int) -> int:
         """Validate and adjust polling interval if needed."""
         if interval < self.validation.min_polling_interval:
@@ -133,14 +649,11 @@ class OmletDataCoordinator(DataUpdateCoordinator):
         """Fetch updated data from API."""
         try:
             devices_data = await self.api_client.fetch_devices()
-            self._validate_devices_data(devices_data)
-
-            self.devices = {
-                device["deviceId"]: self._parse_device(device)
-                for device in devices_data
-                if self._is_valid_device(device)
-            }
+            self._async_trace(TRACE_KIND_DEVICES, devices_data)
+            self._process_devices(devices_data)
 
+            self.last_refresh_monotonic = time.monotonic()
+            self._async_fetch_completed(self.devices)
             _LOGGER.debug("Device data updated: %s", self.devices)
             return self.devices
 
@@ -148,158 +661,37 @@ class OmletDataCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Error fetching devices data: %s", str(err))
             raise UpdateFailed(f"Error fetching devices: {str(err)}") from err
 
-    def _validate_devices_data(self, data: Any) -> None:
-        """Validate the devices data received from the API."""
-        if not data:
-            raise UpdateFailed("No data received from API")
-        if not isinstance(data, list):
-            raise UpdateFailed(f"Invalid data format received: {type(data)}")
-
-    def _is_valid_device(self, device: Dict[str, Any]) -> bool:
-        """Check if a device has all required fields."""
-        missing_fields = [
-            field
-            for field in self.validation.required_device_fields
-            if field not in device
-        ]
-        if missing_fields:
-            _LOGGER.warning(
-                "Device %s is missing fields: %s",
-                device.get("deviceId", "Unknown"),
-                missing_fields,
-            )
-        return not missing_fields
-
-    def _parse_device(self, device: Dict[str, Any]) -> Dict[str, Any]:
-        """Parse device data into standard format."""
-        state = device.get("state", {})
-        if not isinstance(state, dict):
-            _LOGGER.warning(
-                "Device %s returned non-dict state (%s); using empty state",
-                device.get("deviceId", "Unknown"),
-                type(state).__name__,
-            )
-            state = {}
-        general_state = state.get("general", {})
-        firmware = general_state.get("firmwareVersionCurrent", "Unknown")
-        config = device.get("configuration", {})
-        if not isinstance(config, dict):
-            _LOGGER.warning(
-                "Device %s returned non-dict configuration (%s); using empty configuration",
-                device.get("deviceId", "Unknown"),
-                type(config).__name__,
-            )
-            config = {}
-        actions = device.get("actions", [])
-        if not isinstance(actions, list):
-            _LOGGER.warning(
-                "Device %s returned non-list actions (%s); using empty actions",
-                device.get("deviceId", "Unknown"),
-                type(actions).__name__,
-            )
-            actions = []
-        actions = self._ensure_restart_action(device.get("deviceId"), actions)
-
-        parsed_device = {
-            "deviceId": device.get("deviceId"),
-            "deviceSerial": device.get("deviceSerial"),
-            "firmware": firmware,
-            "name": device.get("name", "Unknown"),
-            "deviceType": device.get("deviceType", "Unknown Model"),
-            "state": self._parse_device_state(state),
-            "configuration": self._parse_device_configuration(config),
-            "actions": self._parse_device_actions(actions),
-        }
-
-        _LOGGER.debug("Parsed device data: %s", parsed_device)
-        return parsed_device
-
-    def _parse_device_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Parse device state data."""
-        if not isinstance(state, dict):
-            return {}
-        parser = DataParser()
-        general_fields = [
-            "firmwareVersionCurrent",
-            "batteryLevel",
-            "powerSource",
-            "uptime",
-        ]
-        connectivity_fields = ["wifiStrength", "ssid", "connected"]
-        door_fields = ["state", "lastOpenTime", "lastCloseTime", "fault", "lightLevel"]
-        light_fields = ["state"]
-        fan_fields = ["state", "temperature", "humidity"]
-        feeder_fields = [
-            "state",
-            "lastOpenTime",
-            "lastCloseTime",
-            "fault",
-            "feedLevel",
-            "lightLevel",
-            "mode",
-        ]
+    def _process_devices(self, devices_data: Any) -> None:
+        """Validate and parse a /device response into devices and their indexes.
 
-        parsed_state = {
-            "general": parser.extract_fields(state.get("general", {}), general_fields),
-            "connectivity": parser.extract_fields(
-                state.get("connectivity", {}), connectivity_fields
-            ),
+        Needs no Home Assistant state, so scripts/replay_trace.py can time it.
+        """
+        self.devices = parse_devices(
+            devices_data,
+            required_device_fields=self.validation.required_device_fields,
+            required_action_fields=self.validation.required_action_fields,
+        )
+        self.capabilities = {
+            device_id: build_device_capabilities(device_data)
+            for device_id, device_data in self.devices.items()
         }
-
-        door_state = parser.extract_fields(state.get("door", {}), door_fields)
-        if door_state:
-            parsed_state["door"] = door_state
-
-        light_state = parser.extract_fields(state.get("light", {}), light_fields)
-        if light_state:
-            parsed_state["light"] = light_state
-
-        fan_state = parser.extract_fields(state.get("fan", {}), fan_fields)
-        if fan_state:
-            parsed_state["fan"] = fan_state
-
-        feeder_state = parser.extract_fields(state.get("feeder", {}), feeder_fields)
-        if feeder_state:
-            parsed_state["feeder"] = feeder_state
-
-        return parsed_state
-
-    def _parse_device_configuration(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Parse device configuration data."""
-        if not isinstance(config, dict):
-            return {}
-        config_fields = ["light", "door", "fan", "feeder", "connectivity", "general"]
-        return {key: config.get(key, {}) for key in config_fields}
-
-    def _parse_device_actions(self, actions: list) -> list:
-        """Parse device actions."""
-        if not isinstance(actions, list):
-            return []
-        return [
-            action
-            for action in actions
-            if all(field in action for field in self.validation.required_action_fields)
-        ]
-
-    def _ensure_restart_action(self, device_id: str | None, actions: list) -> list:
-        """Ensure a restart action is present for the device."""
-        if not device_id or not isinstance(actions, list):
-            return actions if isinstance(actions, list) else []
-        for action in actions:
-            if (action.get("actionValue") or "").lower() == "restart":
-                return actions
-        restart_action = {
-            "actionName": "restart",
-            "description": "Restart",
-            "actionValue": "restart",
-            "pendingValue": None,
-            "callback": None,
-            "url": f"/device/{device_id}/action/restart",
+        self.action_urls = {
+            device_id: build_action_index(device_data.get("actions"))
+            for device_id, device_data in self.devices.items()
         }
-        return [*actions, restart_action]
 
     async def async_shutdown(self) -> None:
         """Shut down the coordinator."""
         _LOGGER.info("Shutting down Omlet Data Coordinator")
+        self.followups.clear()
+        self.webhook_watchdog = None
+        self._async_cancel_heartbeat()
+        if self._unsub_followup is not None:
+            self._unsub_followup()
+            self._unsub_followup = None
+        if self._unsub_journal_flush is not None:
+            self._unsub_journal_flush()
+        await self._async_flush_journal()
+        await self.async_stop_trace()
         if self._unsub_refresh is not None:
             self._unsub_refresh()
@@ -0,0 +1,11 @@
+"""Home Assistant-independent logic of the Omlet integration.
+
+Nothing in this package imports homeassistant or the integration modules
+around it (imports stay within core), so tests, benchmarks and
+scripts/replay_trace.py can load it on its own: /device parsing, sensor
+value extraction, device identity, capabilities, convergence tracking, fan
+helpers, timestamp parsing and entity registry checks. The coordinator and platforms wrap these
+functions.
+
+Submodules are not imported here; import the one you need.
+"""
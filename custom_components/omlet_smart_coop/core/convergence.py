@@ -0,0 +1,142 @@
+"""Optimistic state and convergence tracking for Omlet actuators.
+
+After a command, the coordinator records the commanded state here so entities
+can show it immediately, polls on a backoff schedule while the device has not
+reported a target state yet, and stops polling as soon as it has.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from .devices import device_state
+
+# Seconds between convergence polls; the last delay repeats until the timeout.
+DEFAULT_BACKOFF = (1.5, 3.0, 6.0, 12.0, 24.0)
+DEFAULT_TIMEOUT = 60.0
+
+
+@dataclass
+class _Pending:
+    optimistic: str
+    targets: frozenset[str]
+    started: float
+    deadline: float
+    next_poll: float
+    polls: int = 0
+
+
+class ConvergenceTracker:
+    """Commanded state per (device_id, section) until the device reports it."""
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        backoff: tuple[float, ...] = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self._clock = clock
+        self._backoff = backoff
+        self._timeout = timeout
+        self._pending: dict[tuple[str, str], _Pending] = {}
+        self.converged = 0
+        self.timed_out = 0
+        self.last_converge_ms: float | None = None
+        self.max_converge_ms = 0.0
+        self._total_converge_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def start(
+        self, device_id: str, section: str, optimistic: str, targets: Iterable[str]
+    ) -> None:
+        """Track a command; a newer command for the same section replaces it.
+
+        Repeating the command that is already being tracked keeps its timing.
+        """
+        now = self._clock()
+        optimistic = optimistic.lower()
+        targets = frozenset(target.lower() for target in targets)
+        current = self._pending.get((device_id, section))
+        if (
+            current is not None
+            and current.optimistic == optimistic
+            and current.targets == targets
+            and now < current.deadline
+        ):
+            return
+        self._pending[(device_id, section)] = _Pending(
+            optimistic=optimistic,
+            targets=targets,
+            started=now,
+            deadline=now + self._timeout,
+            next_poll=now + self._backoff[0],
+        )
+
+    def optimistic_state(self, device_id: str, section: str) -> str | None:
+        """Return the commanded state while waiting for the device, else None."""
+        pending = self._pending.get((device_id, section))
+        if pending is None or self._clock() >= pending.deadline:
+            return None
+        return pending.optimistic
+
+    def observe(self, data: Mapping[str, Mapping[str, Any]] | None) -> list[tuple[str, str]]:
+        """Check fresh device data; return the (device_id, section) keys that converged.
+
+        Entries past their timeout are dropped without counting as converged.
+        """
+        if not self._pending:
+            return []
+        now = self._clock()
+        data = data or {}
+        done: list[tuple[str, str]] = []
+        for key, pending in list(self._pending.items()):
+            device_id, section = key
+            if device_state(data.get(device_id), section) in pending.targets:
+                elapsed_ms = (now - pending.started) * 1000
+                self.converged += 1
+                self.last_converge_ms = elapsed_ms
+                self.max_converge_ms = max(self.max_converge_ms, elapsed_ms)
+                self._total_converge_ms += elapsed_ms
+                del self._pending[key]
+                done.append(key)
+            elif now >= pending.deadline:
+                self.timed_out += 1
+                del self._pending[key]
+        return done
+
+    def next_delay(self) -> float | None:
+        """Seconds until the next convergence poll is due, or None if idle."""
+        if not self._pending:
+            return None
+        due = min(min(p.next_poll, p.deadline) for p in self._pending.values())
+        return max(0.0, due - self._clock())
+
+    def mark_polled(self) -> None:
+        """Advance the backoff of every entry whose poll was due."""
+        now = self._clock()
+        for pending in self._pending.values():
+            if pending.next_poll > now:
+                continue
+            pending.polls += 1
+            step = self._backoff[min(pending.polls, len(self._backoff) - 1)]
+            pending.next_poll = now + step
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return convergence counters and time-to-converge."""
+        return {
+            "pending": len(self._pending),
+            "converged": self.converged,
+            "timed_out": self.timed_out,
+            "last_converge_ms": (
+                None if self.last_converge_ms is None else round(self.last_converge_ms, 1)
+            ),
+            "max_converge_ms": round(self.max_converge_ms, 1),
+            "mean_converge_ms": (
+                round(self._total_converge_ms / self.converged, 1) if self.converged else None
+            ),
+        }
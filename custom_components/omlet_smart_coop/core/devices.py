@@ -0,0 +1,227 @@
+"""Per-device capability detection and action lookup for Omlet devices.
+
+This module intentionally avoids Home Assistant imports so it can be loaded
+directly by tests. The coordinator computes one DeviceCapabilities and one
+actionValue -> URL index per device on every refresh, and all platforms read
+from those instead of re-scanning state, configuration and actions on their own.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+_DOOR_ACTION_VALUES = frozenset({"open", "close"})
+
+
+def _section(device_data: Mapping[str, Any], key: str) -> Mapping[str, Any]:
+    """Return a state/configuration mapping, tolerating None or bad types."""
+    value = device_data.get(key)
+    return value if isinstance(value, Mapping) else {}
+
+
+def device_action_values(device_data: Mapping[str, Any]) -> frozenset[str]:
+    """Return the lower-cased actionValue of every advertised action."""
+    actions = device_data.get("actions") or []
+    if not isinstance(actions, list):
+        return frozenset()
+    return frozenset(
+        (action.get("actionValue") or "").lower()
+        for action in actions
+        if isinstance(action, Mapping)
+    )
+
+
+def build_action_index(actions: Any) -> dict[str, str]:
+    """Map lower-cased actionValue to action URL; the first match wins."""
+    index: dict[str, str] = {}
+    if not isinstance(actions, list):
+        return index
+    for action in actions:
+        if not isinstance(action, Mapping):
+            continue
+        action_value = (action.get("actionValue") or "").lower()
+        url = action.get("url")
+        if action_value and url and action_value not in index:
+            index[action_value] = url
+    return index
+
+
+def fallback_action_url(device_id: str, action_value: str) -> str:
+    """Return the direct action endpoint used when an action is not advertised."""
+    return f"device/{device_id}/action/{(action_value or '').lower()}"
+
+
+def device_state(device_data: Mapping[str, Any] | None, section: str) -> str:
+    """Return the lower-cased state of a state section (door, feeder, fan...)."""
+    if not device_data:
+        return ""
+    value = _section(device_data, "state").get(section)
+    if not isinstance(value, Mapping):
+        return ""
+    return str(value.get("state") or "").lower()
+
+
+# States meaning the device is already carrying out an action.
+_ACTION_PENDING_STATES = {
+    "open": frozenset({"openpending", "opening"}),
+    "close": frozenset({"closepending", "closing"}),
+    "on": frozenset({"onpending"}),
+    "off": frozenset({"offpending"}),
+    "boost": frozenset({"boostpending"}),
+}
+
+
+def action_in_progress(
+    device_data: Mapping[str, Any] | None,
+    action_value: str,
+    section: str | None = None,
+) -> bool:
+    """Return True if the state section reports the action as already pending.
+
+    Without a section every state section is checked.
+    """
+    pending = _ACTION_PENDING_STATES.get((action_value or "").lower())
+    if not pending or not device_data:
+        return False
+    states = _section(device_data, "state")
+    values = states.values() if section is None else (states.get(section),)
+    return any(
+        isinstance(value, Mapping) and str(value.get("state") or "").lower() in pending
+        for value in values
+    )
+
+
+def configuration_section(
+    device_data: Mapping[str, Any] | None, section: str
+) -> Mapping[str, Any] | None:
+    """Return a non-empty configuration section (door, fan...), else None."""
+    if not device_data:
+        return None
+    current = _section(device_data, "configuration").get(section)
+    if not isinstance(current, Mapping) or not current:
+        return None
+    return current
+
+
+def configuration_matches(
+    device_data: Mapping[str, Any] | None, section: str, expected: Mapping[str, Any]
+) -> bool:
+    """True if every expected key of a configuration section has that value."""
+    current = configuration_section(device_data, section)
+    if current is None:
+        return False
+    return all(current.get(key) == value for key, value in expected.items())
+
+
+def configuration_diff(
+    current: Mapping[str, Any], updates: Mapping[str, Any]
+) -> dict[str, Any]:
+    """Return only the keys of updates whose value differs from current."""
+    return {key: value for key, value in updates.items() if current.get(key) != value}
+
+
+def apply_configuration_patch(
+    device_data: Mapping[str, Any],
+    patch: Mapping[str, Any],
+    response: Any = None,
+) -> dict[str, Any]:
+    """Return a copy of device_data with a successful configuration PATCH applied.
+
+    If the PATCH response carries configuration (the whole device or just its
+    configuration sections), those values are used; otherwise the sent patch
+    is merged in. Sections that did not change are shared with device_data.
+    """
+    updates: Mapping[str, Any] = patch
+    if isinstance(response, Mapping):
+        body = response.get("configuration", response)
+        if isinstance(body, Mapping) and any(
+            isinstance(body.get(section), Mapping) for section in patch
+        ):
+            updates = body
+    configuration = dict(_section(device_data, "configuration"))
+    for section, values in updates.items():
+        if not isinstance(values, Mapping):
+            continue
+        current = configuration.get(section)
+        configuration[section] = {
+            **(current if isinstance(current, Mapping) else {}),
+            **values,
+        }
+    return {**device_data, "configuration": configuration}
+
+
+def device_has_fan(device_data: Mapping[str, Any]) -> bool:
+    """True if this device reports fan state/config."""
+    state = _section(device_data, "state")
+    config = _section(device_data, "configuration")
+    return bool(state.get("fan") or config.get("fan"))
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceCapabilities:
+    """What a single Omlet device can do, derived from one refresh."""
+
+    door: bool = False
+    feeder: bool = False
+    light: bool = False
+    fan: bool = False
+    boost: bool = False
+    fan_on: bool = False
+    fan_off: bool = False
+    restart: bool = False
+    # Stand-alone fan hardware: keep door/light specific sensors off it.
+    pure_fan: bool = False
+    actions: frozenset[str] = frozenset()
+
+    def has_action(self, action_value: str) -> bool:
+        """Return True if the device advertises the given action."""
+        return (action_value or "").lower() in self.actions
+
+
+EMPTY_CAPABILITIES = DeviceCapabilities()
+
+
+def build_device_capabilities(device_data: Mapping[str, Any] | None) -> DeviceCapabilities:
+    """Derive capabilities from parsed coordinator device data."""
+    if not device_data:
+        return EMPTY_CAPABILITIES
+
+    state = _section(device_data, "state")
+    actions = device_action_values(device_data)
+    has_door_actions = not actions.isdisjoint(_DOOR_ACTION_VALUES)
+    fan = device_has_fan(device_data)
+    device_type = str(device_data.get("deviceType") or "").lower()
+
+    return DeviceCapabilities(
+        door=bool(state.get("door")) and has_door_actions,
+        feeder=bool(state.get("feeder")) and has_door_actions,
+        light=bool(state.get("light")),
+        fan=fan,
+        boost="boost" in actions,
+        fan_on="on" in actions,
+        fan_off="off" in actions,
+        restart="restart" in actions,
+        pure_fan=(
+            "fan" in device_type and not state.get("door") and not state.get("light")
+        ),
+        actions=actions,
+    )
+
+
+def device_platforms(capabilities: Iterable[DeviceCapabilities]) -> frozenset[str]:
+    """Return the entity platforms that have entities for these devices.
+
+    Every device gets sensors; the other platforms mirror the capability
+    checks in each platform's entity builder.
+    """
+    platforms = {"sensor"}
+    for device in capabilities:
+        if device.door or device.feeder:
+            platforms.add("cover")
+        if device.light:
+            platforms.add("light")
+        if device.fan:
+            platforms.update(("fan", "select", "time", "number"))
+    return frozenset(platforms)
@@ -0,0 +1,52 @@
+"""Entity keys and unique_id suffixes of every Omlet platform.
+
+Kept apart from the platforms so that the entry setup (unique_id migrations)
+can use them without importing sensor.py and its Home Assistant dependencies.
+tests/test_core_entity_keys.py checks them against the platform modules.
+"""
+
+from __future__ import annotations
+
+from .sensor_values import SENSOR_VALUE_KEYS
+
+# OmletCoordinatorSensor keys (sensor.COORDINATOR_SENSOR_TYPES). Their
+# unique_ids are built from the config entry id, not a device serial.
+COORDINATOR_SENSOR_KEYS = frozenset(
+    {
+        "webhook_miss_rate",
+        "polling_interval",
+        "webhooks_received",
+        "webhook_handler_latency",
+        "webhook_update_latency",
+    }
+)
+
+# cover, fan and light entities.
+DEVICE_ENTITY_SUFFIXES = frozenset({"fan", "door", "feeder", "light"})
+
+# select, time and number entities of the Smart Coop Fan.
+FAN_CONFIG_SUFFIXES = frozenset(
+    {
+        "fan_mode",
+        "fan_manual_speed",
+        "fan_time_speed_1",
+        "fan_time_speed_2",
+        "fan_time_speed_3",
+        "fan_time_speed_4",
+        "fan_thermostat_speed",
+        "tempOn",
+        "tempOff",
+        "timeOn1",
+        "timeOn2",
+        "timeOn3",
+        "timeOn4",
+        "timeOff1",
+        "timeOff2",
+        "timeOff3",
+        "timeOff4",
+    }
+)
+
+# Every suffix an Omlet unique_id can end with; the serial unique_id
+# migration only touches registry entries that match one of them.
+SERIAL_UNIQUE_ID_SUFFIXES = DEVICE_ENTITY_SUFFIXES | SENSOR_VALUE_KEYS | FAN_CONFIG_SUFFIXES
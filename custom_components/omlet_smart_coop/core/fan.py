@@ -0,0 +1,45 @@
+"""Fan state and configuration helpers shared by the fan-related platforms."""
+
+from __future__ import annotations
+
+from datetime import time as dt_time
+from typing import Any
+
+# Observed Omlet manual speed values.
+FAN_SPEED_MAP: dict[str, int] = {"low": 60, "medium": 80, "high": 100}
+
+# Fan state values that indicate the fan is running (or effectively running).
+_FAN_RUNNING_STATES = {"on", "onpending", "boost", "boostpending", "offpending"}
+
+
+def fan_config(device_data: dict[str, Any]) -> dict[str, Any]:
+    return (device_data.get("configuration", {}) or {}).get("fan", {}) or {}
+
+
+def fan_state(device_data: dict[str, Any]) -> dict[str, Any]:
+    return (device_data.get("state", {}) or {}).get("fan", {}) or {}
+
+
+def fan_is_running(device_data: dict[str, Any]) -> bool:
+    state = (fan_state(device_data).get("state") or "").lower()
+    return state in _FAN_RUNNING_STATES
+
+
+def parse_hhmm(value: Any) -> dt_time | None:
+    """Parse 'HH:MM' (or datetime.time) into datetime.time."""
+    if not value:
+        return None
+    if isinstance(value, dt_time):
+        return value
+    s = str(value)
+    if ":" not in s:
+        return None
+    try:
+        hh, mm = s.split(":", 1)
+        return dt_time(hour=int(hh), minute=int(mm))
+    except Exception:
+        return None
+
+
+def format_hhmm(value: dt_time) -> str:
+    return f"{value.hour:02d}:{value.minute:02d}"
@@ -0,0 +1,52 @@
+"""Stable device identity and entity unique_id helpers.
+
+Omlet can hand out a new deviceId for the same coop (after a re-pair, for
+example), so entities are keyed by the device serial when one is reported
+and fall back to the deviceId otherwise.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+
+def normalize_device_serial(serial: Any) -> str | None:
+    """Return a usable serial string, or None if not available."""
+    if serial is None:
+        return None
+    normalized = str(serial).strip()
+    if not normalized or normalized.lower() == "unknown":
+        return None
+    return normalized
+
+
+def get_stable_device_identity(
+    device_data: Mapping[str, Any] | None,
+    fallback_device_id: str | None,
+) -> str:
+    """Return the stable identity for a device."""
+    data = device_data or {}
+    serial = normalize_device_serial(data.get("deviceSerial"))
+    if serial:
+        return serial
+    device_id = data.get("deviceId") or fallback_device_id
+    return str(device_id)
+
+
+def build_entity_unique_id(
+    device_data: Mapping[str, Any] | None,
+    fallback_device_id: str | None,
+    suffix: str,
+) -> str:
+    """Build a unique_id from the stable device identity and entity suffix."""
+    clean_suffix = str(suffix).lstrip("_")
+    return f"{get_stable_device_identity(device_data, fallback_device_id)}_{clean_suffix}"
+
+
+def extract_known_suffix(unique_id: str, known_suffixes: Iterable[str]) -> str | None:
+    """Return the matching entity suffix from a known suffix allowlist."""
+    for suffix in sorted(known_suffixes, key=len, reverse=True):
+        if unique_id.endswith(f"_{suffix}"):
+            return suffix
+    return None
@@ -0,0 +1,217 @@
+"""Parsing of Omlet /device responses into the coordinator's device data.
+
+The coordinator validates each response and keeps one parsed dict per device:
+only the state fields the platforms read, the configuration sections and the
+well-formed actions, plus a synthesized restart action.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Collection
+import logging
+from typing import Any, Dict, List
+
+_LOGGER = logging.getLogger(__name__)
+
+REQUIRED_DEVICE_FIELDS = frozenset({"deviceId"})
+REQUIRED_ACTION_FIELDS = frozenset({"actionName", "description", "actionValue"})
+
+_GENERAL_FIELDS = ["firmwareVersionCurrent", "batteryLevel", "powerSource", "uptime"]
+_CONNECTIVITY_FIELDS = ["wifiStrength", "ssid", "connected"]
+# Optional state sections, kept only when they report at least one field.
+_SECTION_FIELDS = {
+    "door": ["state", "lastOpenTime", "lastCloseTime", "fault", "lightLevel"],
+    "light": ["state"],
+    "fan": ["state", "temperature", "humidity"],
+    "feeder": [
+        "state",
+        "lastOpenTime",
+        "lastCloseTime",
+        "fault",
+        "feedLevel",
+        "lightLevel",
+        "mode",
+    ],
+}
+_CONFIG_SECTIONS = ["light", "door", "fan", "feeder", "connectivity", "general"]
+
+
+class DeviceDataError(ValueError):
+    """The /device response is empty or not a list of devices."""
+
+
+class DataParser:
+    """Utility class for parsing data safely."""
+
+    @staticmethod
+    def safe_parse(
+        data: Dict[str, Any], parser_func: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Safely parse data using the provided parser function.
+
+        Args:
+            data: Dictionary of data to parse
+            parser_func: Function to use for parsing
+
+        Returns:
+            Parsed data dictionary or empty dict if parsing fails
+        """
+        try:
+            return parser_func(data)
+        except Exception as err:
+            _LOGGER.error("Error parsing data: %s", str(err))
+            return {}
+
+    @staticmethod
+    def extract_fields(data: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+        """Extract specified fields from a dictionary.
+
+        Args:
+            data: Source dictionary
+            fields: List of fields to extract
+
+        Returns:
+            Dictionary containing requested fields (only non-None values)
+        """
+        return {field: data.get(field) for field in fields if data.get(field) is not None}
+
+
+def parse_devices(
+    devices_data: Any,
+    *,
+    required_device_fields: Collection[str] = REQUIRED_DEVICE_FIELDS,
+    required_action_fields: Collection[str] = REQUIRED_ACTION_FIELDS,
+) -> Dict[str, Dict[str, Any]]:
+    """Validate a /device response and return the parsed devices by deviceId."""
+    validate_devices_data(devices_data)
+    return {
+        device["deviceId"]: parse_device(device, required_action_fields)
+        for device in devices_data
+        if is_valid_device(device, required_device_fields)
+    }
+
+
+def validate_devices_data(data: Any) -> None:
+    """Validate the devices data received from the API."""
+    if not data:
+        raise DeviceDataError("No data received from API")
+    if not isinstance(data, list):
+        raise DeviceDataError(f"Invalid data format received: {type(data)}")
+
+
+def is_valid_device(
+    device: Dict[str, Any], required_fields: Collection[str] = REQUIRED_DEVICE_FIELDS
+) -> bool:
+    """Check if a device has all required fields."""
+    missing_fields = [field for field in required_fields if field not in device]
+    if missing_fields:
+        _LOGGER.warning(
+            "Device %s is missing fields: %s",
+            device.get("deviceId", "Unknown"),
+            missing_fields,
+        )
+    return not missing_fields
+
+
+def parse_device(
+    device: Dict[str, Any],
+    required_action_fields: Collection[str] = REQUIRED_ACTION_FIELDS,
+) -> Dict[str, Any]:
+    """Parse device data into standard format."""
+    state = device.get("state", {})
+    if not isinstance(state, dict):
+        _LOGGER.warning(
+            "Device %s returned non-dict state (%s); using empty state",
+            device.get("deviceId", "Unknown"),
+            type(state).__name__,
+        )
+        state = {}
+    general_state = state.get("general", {})
+    firmware = general_state.get("firmwareVersionCurrent", "Unknown")
+    config = device.get("configuration", {})
+    if not isinstance(config, dict):
+        _LOGGER.warning(
+            "Device %s returned non-dict configuration (%s); using empty configuration",
+            device.get("deviceId", "Unknown"),
+            type(config).__name__,
+        )
+        config = {}
+    actions = device.get("actions", [])
+    if not isinstance(actions, list):
+        _LOGGER.warning(
+            "Device %s returned non-list actions (%s); using empty actions",
+            device.get("deviceId", "Unknown"),
+            type(actions).__name__,
+        )
+        actions = []
+    actions = ensure_restart_action(device.get("deviceId"), actions)
+
+    parsed_device = {
+        "deviceId": device.get("deviceId"),
+        "deviceSerial": device.get("deviceSerial"),
+        "firmware": firmware,
+        "name": device.get("name", "Unknown"),
+        "deviceType": device.get("deviceType", "Unknown Model"),
+        "state": parse_device_state(state),
+        "configuration": parse_device_configuration(config),
+        "actions": parse_device_actions(actions, required_action_fields),
+    }
+
+    _LOGGER.debug("Parsed device data: %s", parsed_device)
+    return parsed_device
+
+
+def parse_device_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse device state data."""
+    if not isinstance(state, dict):
+        return {}
+    parser = DataParser()
+    parsed_state = {
+        "general": parser.extract_fields(state.get("general", {}), _GENERAL_FIELDS),
+        "connectivity": parser.extract_fields(
+            state.get("connectivity", {}), _CONNECTIVITY_FIELDS
+        ),
+    }
+    for section, fields in _SECTION_FIELDS.items():
+        section_state = parser.extract_fields(state.get(section, {}), fields)
+        if section_state:
+            parsed_state[section] = section_state
+    return parsed_state
+
+
+def parse_device_configuration(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse device configuration data."""
+    if not isinstance(config, dict):
+        return {}
+    return {key: config.get(key, {}) for key in _CONFIG_SECTIONS}
+
+
+def parse_device_actions(
+    actions: list, required_fields: Collection[str] = REQUIRED_ACTION_FIELDS
+) -> list:
+    """Parse device actions."""
+    if not isinstance(actions, list):
+        return []
+    return [
+        action
+        for action in actions
+        if all(field in action for field in required_fields)
+    ]
+
+
+def ensure_restart_action(device_id: str | None, actions: list) -> list:
+    """Ensure a restart action is present for the device."""
+    if not device_id or not isinstance(actions, list):
+        return actions if isinstance(actions, list) else []
+    for action in actions:
+        if (action.get("actionValue") or "").lower() == "restart":
+            return actions
+    restart_action = {
+        "actionName": "restart",
+        "description": "Restart",
+        "actionValue": "restart",
+        "pendingValue": None,
+        "callback": None,
+        "url": f"/device/{device_id}/action/restart",
+    }
+    return [*actions, restart_action]
@@ -0,0 +1,38 @@
+"""Durations of the sequential phases of a setup run."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import time
+from typing import Any
+
+
+class PhaseTimer:
+    """Time consecutive phases: each mark() ends the phase started by the last one."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._started = self._last = clock()
+        self.phases: dict[str, float] = {}
+
+    def mark(self, phase: str) -> float:
+        """End phase now and return its duration in seconds."""
+        now = self._clock()
+        duration = now - self._last
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+        self._last = now
+        return duration
+
+    @property
+    def total(self) -> float:
+        """Seconds from creation to the last mark."""
+        return self._last - self._started
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return phase durations and the total in milliseconds."""
+        return {
+            "phases_ms": {
+                phase: round(duration * 1000, 2) for phase, duration in self.phases.items()
+            },
+            "total_ms": round(self.total * 1000, 2),
+        }
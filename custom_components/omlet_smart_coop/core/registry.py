@@ -0,0 +1,32 @@
+"""Entity registry checks made while platforms set up their entities.
+
+entity.should_add_entity passes Home Assistant's entity registry and the
+loaded EntityComponents in; anything with the same lookup methods works, so
+tests/test_registry_lookup_benchmark.py runs this code against fakes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+
+def loaded_entity_id(
+    entity_registry: Any,
+    entity_components: Mapping[str, Any],
+    entity_domain: str,
+    platform: str,
+    unique_id: str,
+) -> str | None:
+    """Return the entity_id of unique_id if that entity is already loaded.
+
+    Only entities loaded in their EntityComponent count: a registered entity
+    whose state was merely restored still has to be added.
+    """
+    existing = entity_registry.async_get_entity_id(entity_domain, platform, unique_id)
+    if not existing:
+        return None
+    entity_comp = entity_components.get(entity_domain)
+    if entity_comp is None or entity_comp.get_entity(existing) is None:
+        return None
+    return existing
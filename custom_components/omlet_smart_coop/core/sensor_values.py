@@ -0,0 +1,84 @@
+"""Sensor values read from parsed Omlet device data.
+
+Most sensors are a plain lookup of device_data[section][group][field]; those
+are kept in a table so reading one is a single dict lookup instead of a walk
+through every sensor key. The few with extra handling follow the table.
+"""
+
+from __future__ import annotations
+
+from .timestamps import parse_timestamp
+
+# sensor key -> (section, group, field)
+_VALUE_PATHS: dict[str, tuple[str, str, str]] = {
+    # General/shared sensors
+    "battery_level": ("state", "general", "batteryLevel"),
+    "power_source": ("state", "general", "powerSource"),
+    "uptime": ("state", "general", "uptime"),
+    "wifi_ssid": ("state", "connectivity", "ssid"),
+    "wifi_strength": ("state", "connectivity", "wifiStrength"),
+    "wifi_connected": ("state", "connectivity", "connected"),
+    "door_state": ("state", "door", "state"),
+    "door_fault": ("state", "door", "fault"),
+    "door_light_level": ("state", "door", "lightLevel"),
+    "door_open_mode": ("configuration", "door", "openMode"),
+    "door_close_mode": ("configuration", "door", "closeMode"),
+    "feeder_state": ("state", "feeder", "state"),
+    "feeder_fault": ("state", "feeder", "fault"),
+    "feeder_feed_level": ("state", "feeder", "feedLevel"),
+    "feeder_light_level": ("state", "feeder", "lightLevel"),
+    "light_state": ("state", "light", "state"),
+    "light_mode": ("configuration", "light", "mode"),
+    "light_minutes_before_close": ("configuration", "light", "minutesBeforeClose"),
+    "light_max_on_time": ("configuration", "light", "maxOnTime"),
+    "light_equipped": ("configuration", "light", "equipped"),
+    "fan_state": ("state", "fan", "state"),
+    "fan_temperature": ("state", "fan", "temperature"),
+    "fan_humidity": ("state", "fan", "humidity"),
+    "fan_manual_speed": ("configuration", "fan", "manualSpeed"),
+    "fan_temp_on": ("configuration", "fan", "tempOn"),
+    "fan_temp_off": ("configuration", "fan", "tempOff"),
+    "fan_temp_speed": ("configuration", "fan", "tempSpeed"),
+    # Door configuration times
+    "door_open_time": ("configuration", "door", "openTime"),
+    "door_close_time": ("configuration", "door", "closeTime"),
+    # Overnight sleep times
+    "overnight_sleep_start": ("configuration", "general", "overnightSleepStart"),
+    "overnight_sleep_end": ("configuration", "general", "overnightSleepEnd"),
+}
+
+# sensor key -> (state group, field) holding an ISO timestamp string
+_TIMESTAMP_PATHS: dict[str, tuple[str, str]] = {
+    "last_open_time": ("door", "lastOpenTime"),
+    "last_close_time": ("door", "lastCloseTime"),
+    "feeder_last_open_time": ("feeder", "lastOpenTime"),
+    "feeder_last_close_time": ("feeder", "lastCloseTime"),
+}
+
+SENSOR_VALUE_KEYS = frozenset({*_VALUE_PATHS, *_TIMESTAMP_PATHS, "feeder_mode", "fan_mode"})
+
+
+def extract_sensor_value(sensor_key, device_data):
+    """Extract the value for a given sensor key from device data."""
+    path = _VALUE_PATHS.get(sensor_key)
+    if path is not None:
+        section, group, field = path
+        return device_data.get(section, {}).get(group, {}).get(field)
+
+    state = device_data.get("state", {})
+    timestamp_path = _TIMESTAMP_PATHS.get(sensor_key)
+    if timestamp_path is not None:
+        group, field = timestamp_path
+        return parse_timestamp(state.get(group, {}).get(field))
+
+    config = device_data.get("configuration", {})
+    if sensor_key == "feeder_mode":
+        return state.get("feeder", {}).get("mode") or config.get("feeder", {}).get("mode")
+    if sensor_key == "fan_mode":
+        mode = config.get("fan", {}).get("mode")
+        # Omlet uses "temperature" internally; present as "thermostatic" for UI consistency.
+        if isinstance(mode, str) and mode.lower() == "temperature":
+            return "thermostatic"
+        return mode
+
+    return None
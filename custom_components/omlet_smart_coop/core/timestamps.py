@@ -0,0 +1,58 @@
+"""Timestamp parsing helpers for Omlet sensors.
+
+This module intentionally avoids Home Assistant imports so it can be loaded
+directly by tests.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Log at most one parse failure per interval; a malformed value would otherwise
+# be reported on every state write.
+PARSE_FAILURE_LOG_INTERVAL = 3600.0
+
+_failure_state: dict[str, Any] = {"last_logged": None, "suppressed": 0}
+
+
+def _log_parse_failure(value: Any, err: Exception) -> None:
+    """Log a parse failure, rate-limited across all timestamp sensors."""
+    now = time.monotonic()
+    last_logged = _failure_state["last_logged"]
+    if last_logged is not None and now - last_logged < PARSE_FAILURE_LOG_INTERVAL:
+        _failure_state["suppressed"] += 1
+        return
+    suppressed = _failure_state["suppressed"]
+    _failure_state["last_logged"] = now
+    _failure_state["suppressed"] = 0
+    if suppressed:
+        _LOGGER.warning(
+            "Failed to parse timestamp %r: %s (%s similar failures suppressed)",
+            value,
+            err,
+            suppressed,
+        )
+    else:
+        _LOGGER.warning("Failed to parse timestamp %r: %s", value, err)
+
+
+def parse_timestamp(timestamp_str: Any) -> datetime | None:
+    """Parse timestamp string to datetime with timezone."""
+    if not timestamp_str:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp_str)
+    except (TypeError, ValueError) as err:
+        _log_parse_failure(timestamp_str, err)
+        return None
+
+
+def reset_parse_failure_log() -> None:
+    """Forget previous parse failures, so the next one is logged again."""
+    _failure_state["last_logged"] = None
+    _failure_state["suppressed"] = 0
@@ -1,6 +1,11 @@
 from homeassistant.components.cover import CoverEntity
 from .const import DOMAIN
-from .entity import OmletEntity, build_entity_unique_id, should_add_entity
+from .entity import (
+    OmletEntity,
+    async_setup_device_entities,
+    build_entity_unique_id,
+    should_add_entity,
+)
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -18,46 +23,38 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     _LOGGER.debug("Setting up covers for devices: %s", coordinator.data)
 
-    covers = []
-    door_action_values = {"open", "close"}
-    for device_id, device_data in coordinator.data.items():
+    def _build_entities(device_id, device_data):
+        capabilities = coordinator.get_capabilities(device_id)
+        covers = []
+
         # Door Cover
-        door_state = device_data.get("state", {}).get("door")
-        if door_state:
-            has_door_actions = any(
-                (action.get("actionValue") or "").lower() in door_action_values
-                for action in device_data.get("actions", []) or []
-            )
-            if has_door_actions:
-                door_unique_id = build_entity_unique_id(device_data, device_id, "door")
-                if should_add_entity(hass, "cover", door_unique_id):
-                    covers.append(
-                        OmletDoorCover(
-                            coordinator,
-                            device_id,
-                            device_data["name"],
-                        )
+        if capabilities.door:
+            door_unique_id = build_entity_unique_id(device_data, device_id, "door")
+            if should_add_entity(hass, "cover", door_unique_id):
+                covers.append(
+                    OmletDoorCover(
+                        coordinator,
+                        device_id,
+                        device_data["name"],
                     )
+                )
 
         # Feeder Cover
-        feeder_state = device_data.get("state", {}).get("feeder")
-        if feeder_state:
-            has_feeder_actions = any(
-                (action.get("actionValue") or "").lower() in door_action_values
-                for action in device_data.get("actions", []) or []
-            )
-            if has_feeder_actions:
-                feeder_unique_id = build_entity_unique_id(device_data, device_id, "feeder")
-                if should_add_entity(hass, "cover", feeder_unique_id):
-                    covers.append(
-                        OmletFeederCover(
-                            coordinator,
-                            device_id,
-                            device_data["name"],
-                        )
+        if capabilities.feeder:
+            feeder_unique_id = build_entity_unique_id(device_data, device_id, "feeder")
+            if should_add_entity(hass, "cover", feeder_unique_id):
+                covers.append(
+                    OmletFeederCover(
+                        coordinator,
+                        device_id,
+                        device_data["name"],
                     )
+                )
+        return covers
 
-    async_add_entities(covers)
+    async_setup_device_entities(
+        hass, config_entry, coordinator, async_add_entities, _build_entities
+    )
 
 
 class OmletDoorCover(OmletEntity, CoverEntity):
@@ -83,8 +80,7 @@ class OmletDoorCover(OmletEntity, CoverEntity):
         Returns:
             bool: True if available, False otherwise
         """
-        device_data = self._device_data
-        state = device_data["state"]["door"]["state"]
+        state = self._section_state("door")
         # Only unavailable during "stopping"
         return state != "stopping"
 
@@ -95,8 +91,7 @@ class OmletDoorCover(OmletEntity, CoverEntity):
         Returns:
             bool: True if opening, False otherwise
         """
-        device_data = self._device_data
-        state = device_data["state"]["door"]["state"]
+        state = self._section_state("door")
         return state == "openpending"
 
     @property
@@ -106,8 +101,7 @@ class OmletDoorCover(OmletEntity, CoverEntity):
         Returns:
             bool: True if closing, False otherwise
         """
-        device_data = self._device_data
-        state = device_data["state"]["door"]["state"]
+        state = self._section_state("door")
         return state == "closepending"
 
     @property
@@ -117,19 +111,18 @@ class OmletDoorCover(OmletEntity, CoverEntity):
         Returns:
             bool: True if closed, False otherwise
         """
-        device_data = self._device_data
-        state = device_data["state"]["door"]["state"]
+        state = self._section_state("door")
         return state == "closed"
 
     async def async_open_cover(self, **kwargs):
         """Open the cover."""
         await self._execute_action("open")
-        await self.coordinator.async_request_refresh()
+        self._track_command("door", "openpending", {"open"})
 
     async def async_close_cover(self, **kwargs):
         """Close the cover."""
         await self._execute_action("close")
-        await self.coordinator.async_request_refresh()
+        self._track_command("door", "closepending", {"closed"})
 
     async def _execute_action(self, action):
         """Execute an action on the device.
@@ -137,18 +130,9 @@ class OmletDoorCover(OmletEntity, CoverEntity):
         Args:
             action: The action to execute (open/close)
         """
-        device_data = self._device_data
-        action = (action or "").lower()
-        action_url = next(
-            (
-                a["url"]
-                for a in device_data["actions"]
-                if (a.get("actionValue") or "").lower() == action
-            ),
-            None,
+        await self.coordinator.async_execute_action(
+            self.current_device_id, action, "door"
         )
-        if action_url:
-            await self.coordinator.api_client.execute_action(action_url)
 
 
 class OmletFeederCover(OmletEntity, CoverEntity):
@@ -164,52 +148,39 @@ class OmletFeederCover(OmletEntity, CoverEntity):
     @property
     def available(self):
         """Return if entity is available."""
-        device_data = self._device_data
-        state = ((device_data.get("state") or {}).get("feeder") or {}).get("state", "")
-        return str(state).lower() != "stopping"
+        state = self._section_state("feeder")
+        return state != "stopping"
 
     @property
     def is_opening(self):
         """Return if the feeder is opening."""
-        device_data = self._device_data
-        state = ((device_data.get("state") or {}).get("feeder") or {}).get("state", "")
-        return str(state).lower() in {"openpending", "opening"}
+        state = self._section_state("feeder")
+        return state in {"openpending", "opening"}
 
     @property
     def is_closing(self):
         """Return if the feeder is closing."""
-        device_data = self._device_data
-        state = ((device_data.get("state") or {}).get("feeder") or {}).get("state", "")
-        return str(state).lower() in {"closepending", "closing"}
+        state = self._section_state("feeder")
+        return state in {"closepending", "closing"}
 
     @property
     def is_closed(self):
         """Return if the feeder is fully closed."""
-        device_data = self._device_data
-        state = ((device_data.get("state") or {}).get("feeder") or {}).get("state", "")
-        return str(state).lower() == "closed"
+        state = self._section_state("feeder")
+        return state == "closed"
 
     async def async_open_cover(self, **kwargs):
         """Open the cover."""
         await self._execute_action("open")
-        await self.coordinator.async_request_refresh()
+        self._track_command("feeder", "openpending", {"open"})
 
     async def async_close_cover(self, **kwargs):
         """Close the cover."""
         await self._execute_action("close")
-        await self.coordinator.async_request_refresh()
+        self._track_command("feeder", "closepending", {"closed"})
 
     async def _execute_action(self, action):
         """Execute an action on the device."""
-        device_data = self._device_data
-        action = (action or "").lower()
-        action_url = next(
-            (
-                a.get("url")
-                for a in device_data.get("actions", []) or []
-                if (a.get("actionValue") or "").lower() == action
-            ),
-            None,
+        await self.coordinator.async_execute_action(
+            self.current_device_id, action, "feeder"
         )
-        if action_url:
-            await self.coordinator.api_client.execute_action(action_url)
@@ -17,6 +17,7 @@ _REDACT_KEYS = {
     "token",
     "secret",
     "webhook_token",
+    "webhookToken",
     "webhook_id",
 }
 
@@ -38,12 +39,56 @@ async def async_get_config_entry_diagnostics(
             "data": dict(config_entry.data),
             "options": dict(config_entry.options),
         },
+        "platforms": sorted(platform.value for platform in entry_data.get("platforms", ())),
         "coordinator": {
             "last_update_success": getattr(coordinator, "last_update_success", None),
             "last_update_time": getattr(coordinator, "last_update_time", None),
             "devices": getattr(coordinator, "devices", {}),
             "data": getattr(coordinator, "data", {}),
         },
+        "command_queue": (
+            coordinator.command_queue.stats.as_dict()
+            if getattr(coordinator, "command_queue", None)
+            else None
+        ),
+        "convergence": (
+            coordinator.convergence.as_dict()
+            if getattr(coordinator, "convergence", None) is not None
+            else None
+        ),
+        "webhook_watchdog": (
+            coordinator.webhook_watchdog.as_dict()
+            if getattr(coordinator, "webhook_watchdog", None) is not None
+            else None
+        ),
+        "followup_refreshes": (
+            coordinator.followups.as_dict()
+            if getattr(coordinator, "followups", None) is not None
+            else None
+        ),
+        "webhook_metrics": (
+            coordinator.webhook_metrics.as_dict()
+            if getattr(coordinator, "webhook_metrics", None) is not None
+            else None
+        ),
+        "webhook_journal": (
+            {
+                **coordinator.webhook_journal.as_dict(),
+                "recent": coordinator.webhook_journal.events(50),
+            }
+            if getattr(coordinator, "webhook_journal", None) is not None
+            else None
+        ),
+        "poll_drift": (
+            coordinator.poll_drift.as_dict()
+            if getattr(coordinator, "poll_drift", None) is not None
+            else None
+        ),
+        "setup_phases": (
+            coordinator.setup_phases.as_dict()
+            if getattr(coordinator, "setup_phases", None) is not None
+            else None
+        ),
     }
 
     return _redact(diag)
@@ -1,12 +1,20 @@
-from collections.abc import Iterable, Mapping
+from collections import defaultdict
+from collections.abc import Callable, Iterable
 from typing import Any
 
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers import entity_component as ec
 from homeassistant.helpers import entity_registry as er
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
+from .core.devices import DeviceCapabilities, device_state
+from .core.identity import (  # noqa: F401 - platforms import it from here
+    build_entity_unique_id,
+    get_stable_device_identity,
+)
+from .core.registry import loaded_entity_id
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -24,6 +32,19 @@ class OmletEntity(CoordinatorEntity):
             device_id,
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Also listen for updates of this device alone.
+
+        Device-scoped updates (coordinator.async_update_device_listeners) are
+        keyed by the stable identity, which survives deviceId changes.
+        """
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_entity_listener(
+                self._stable_identity, self._handle_coordinator_update
+            )
+        )
+
     @property
     def _device_data(self) -> dict:
         """Always return the latest device data from the coordinator.
@@ -87,6 +108,73 @@ class OmletEntity(CoordinatorEntity):
         data = self._device_data
         return str(data.get("deviceId") or self.device_id)
 
+    @property
+    def capabilities(self) -> DeviceCapabilities:
+        """Return the device capabilities computed on the last refresh."""
+        return self.coordinator.get_capabilities(self.current_device_id)
+
+    def _section_state(self, section: str) -> str:
+        """Return a section's lower-cased state, or the commanded one while converging."""
+        commanded = self.coordinator.convergence.optimistic_state(
+            self.current_device_id, section
+        )
+        if commanded is not None:
+            return commanded
+        return device_state(self._device_data, section)
+
+    @callback
+    def _track_command(self, section: str, optimistic: str, targets: set[str]) -> None:
+        """Show optimistic for section until the device reports one of targets."""
+        self.coordinator.async_track_convergence(
+            self.current_device_id, section, optimistic, targets
+        )
+
+
+@callback
+def async_setup_device_entities(
+    hass: HomeAssistant,
+    config_entry,
+    coordinator,
+    async_add_entities,
+    build_entities: Callable[[str, dict[str, Any]], list[Entity]],
+) -> None:
+    """Add entities for current devices and keep them in sync with the account.
+
+    build_entities(device_id, device_data) returns the entities for one device.
+    It runs for every device now and again for each device that appears on a
+    later refresh, so adding a coop does not require reloading the entry.
+    Entities of a device that disappears are removed from Home Assistant; their
+    registry entries are kept so customizations survive if the device returns.
+    """
+    tracked: dict[str, list[Entity]] = defaultdict(list)
+
+    def _add_devices(device_ids: Iterable[str]) -> None:
+        new_entities: list[Entity] = []
+        for device_id in device_ids:
+            device_data = (coordinator.data or {}).get(device_id)
+            if not device_data:
+                continue
+            entities = build_entities(device_id, device_data)
+            tracked[get_stable_device_identity(device_data, device_id)].extend(entities)
+            new_entities.extend(entities)
+        if new_entities:
+            async_add_entities(new_entities)
+
+    @callback
+    def _async_handle_device_changes(added: list[str], removed: set[str]) -> None:
+        for identity in removed:
+            for entity in tracked.pop(identity, []):
+                if entity.hass is None:
+                    continue
+                _LOGGER.debug("Removing %s; Omlet device %s disappeared", entity.entity_id, identity)
+                hass.async_create_task(entity.async_remove())
+        _add_devices(added)
+
+    _add_devices(list((coordinator.data or {}).keys()))
+    config_entry.async_on_unload(
+        coordinator.async_add_device_listener(_async_handle_device_changes)
+    )
+
 
 def should_add_entity(hass: HomeAssistant, entity_domain: str, unique_id: str) -> bool:
     """Return True if an entity with unique_id is not already live in HA.
@@ -96,10 +184,14 @@ def should_add_entity(hass: HomeAssistant, entity_domain: str, unique_id: str) -
     are actually loaded in the target EntityComponent, otherwise startup can
     leave restored placeholders stuck as unavailable.
     """
-    ent_reg = er.async_get(hass)
-    existing = ent_reg.async_get_entity_id(entity_domain, DOMAIN, unique_id)
-    entity_comp = hass.data.get(ec.DATA_INSTANCES, {}).get(entity_domain)
-    if existing and entity_comp and entity_comp.get_entity(existing) is not None:
+    existing = loaded_entity_id(
+        er.async_get(hass),
+        hass.data.get(ec.DATA_INSTANCES, {}),
+        entity_domain,
+        DOMAIN,
+        unique_id,
+    )
+    if existing:
         _LOGGER.debug(
             "Skipping add for %s %s; entity already loaded as %s",
             entity_domain,
@@ -108,44 +200,3 @@ def should_add_entity(hass: HomeAssistant, entity_domain: str, unique_id: str) -
         )
         return False
     return True
-
-
-def normalize_device_serial(serial: Any) -> str | None:
-    """Return a usable serial string, or None if not available."""
-    if serial is None:
-        return None
-    normalized = str(serial).strip()
-    if not normalized or normalized.lower() == "unknown":
-        return None
-    return normalized
-
-
-def get_stable_device_identity(
-    device_data: Mapping[str, Any] | None,
-    fallback_device_id: str | None,
-) -> str:
-    """Return the stable identity for a device."""
-    data = device_data or {}
-    serial = normalize_device_serial(data.get("deviceSerial"))
-    if serial:
-        return serial
-    device_id = data.get("deviceId") or fallback_device_id
-    return str(device_id)
-
-
-def build_entity_unique_id(
-    device_data: Mapping[str, Any] | None,
-    fallback_device_id: str | None,
-    suffix: str,
-) -> str:
-    """Build a unique_id from the stable device identity and entity suffix."""
-    clean_suffix = str(suffix).lstrip("_")
-    return f"{get_stable_device_identity(device_data, fallback_device_id)}_{clean_suffix}"
-
-
-def extract_known_suffix(unique_id: str, known_suffixes: Iterable[str]) -> str | None:
-    """Return the matching entity suffix from a known suffix allowlist."""
-    for suffix in sorted(known_suffixes, key=len, reverse=True):
-        if unique_id.endswith(f"_{suffix}"):
-            return suffix
-    return None
@@ -1,14 +1,17 @@
 import logging
-import asyncio
 from typing import Any
 
 from homeassistant.components.fan import FanEntity, FanEntityFeature
 from homeassistant.components import persistent_notification as pn
-from homeassistant.util import dt as dt_util
 
+from .command_queue import KIND_ACTION, KIND_PATCH
 from .const import DOMAIN
-from .entity import OmletEntity, build_entity_unique_id, should_add_entity
-from .const import CONF_ENABLE_WEBHOOKS
+from .entity import (
+    OmletEntity,
+    async_setup_device_entities,
+    build_entity_unique_id,
+    should_add_entity,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,18 +22,18 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     _LOGGER.debug("Setting up fans for devices: %s", coordinator.data)
 
-    fans = []
-    for device_id, device_data in coordinator.data.items():
+    def _build_entities(device_id, device_data):
         # Any device that reports fan state can expose a fan entity regardless of deviceType label
-        fan_state = device_data.get("state", {}).get("fan")
-        fan_cfg = device_data.get("configuration", {}).get("fan")
-        if not fan_state and not fan_cfg:
-            continue
+        if not coordinator.get_capabilities(device_id).fan:
+            return []
         unique_id = build_entity_unique_id(device_data, device_id, "fan")
-        if should_add_entity(hass, "fan", unique_id):
-            fans.append(OmletFan(coordinator, device_id, device_data["name"]))
+        if not should_add_entity(hass, "fan", unique_id):
+            return []
+        return [OmletFan(coordinator, device_id, device_data["name"])]
 
-    async_add_entities(fans)
+    async_setup_device_entities(
+        hass, config_entry, coordinator, async_add_entities, _build_entities
+    )
 
 
 class OmletFan(OmletEntity, FanEntity):
@@ -39,6 +42,7 @@ class OmletFan(OmletEntity, FanEntity):
     _ACTION_ON = "on"
     _ACTION_OFF = "off"
     _ACTION_BOOST = "boost"
+    _MANUAL_PATCH = {"fan": {"mode": "manual"}}
     def __init__(self, coordinator, device_id: str, device_name: str) -> None:
         super().__init__(coordinator, device_id)
         self._attr_translation_key = "fan"
@@ -47,9 +51,6 @@ class OmletFan(OmletEntity, FanEntity):
         # Always expose the fan as a basic on/off toggle in HA. Omlet's `actions`
         # list can be omitted temporarily, but core fan services should still work.
         self._attr_supported_features = FanEntityFeature.TURN_ON | FanEntityFeature.TURN_OFF
-        # Optimistic UI state for webhook-less installs (short-lived).
-        self._optimistic_is_on: bool | None = None
-        self._optimistic_until: float = 0.0
 
     def _device_state(self) -> dict[str, Any]:
         return self._device_data
@@ -60,18 +61,6 @@ class OmletFan(OmletEntity, FanEntity):
     def _fan_config(self) -> dict[str, Any]:
         return self._device_state().get("configuration", {}).get("fan", {}) or {}
 
-    def _find_action(self, action_value: str) -> dict[str, Any] | None:
-        actions = self._device_state().get("actions", []) or []
-        action_value = (action_value or "").lower()
-        return next(
-            (
-                action
-                for action in actions
-                if (action.get("actionValue") or "").lower() == action_value
-            ),
-            None,
-        )
-
     @property
     def available(self) -> bool:
         """Return True if the fan provides state data."""
@@ -80,46 +69,13 @@ class OmletFan(OmletEntity, FanEntity):
     @property
     def is_on(self) -> bool:
         """Return whether the fan is running."""
-        # If we've just issued a command, reflect it immediately in the UI while
-        # we wait for Omlet API to converge (polling-only installs).
-        if self._optimistic_is_on is not None and dt_util.utcnow().timestamp() < self._optimistic_until:
-            return self._optimistic_is_on
-        state = (self._fan_state().get("state") or "").lower()
         # Treat *pending-off* as still running until the device confirms "off".
-        return state in {"on", "onpending", "boost", "boostpending", "offpending"}
-
-    def _schedule_followup_refresh(self) -> None:
-        """Poll shortly after actions since Omlet may report *pending* briefly."""
-        if not getattr(self, "hass", None):
-            return
-
-        async def _delayed(delay_s: float) -> None:
-            await asyncio.sleep(delay_s)
-            await self.coordinator.async_request_refresh()
-
-        # Longer follow-ups when webhooks are disabled (polling-only installs).
-        enable_webhooks = False
-        try:
-            enable_webhooks = bool(self.coordinator.config_entry.options.get(CONF_ENABLE_WEBHOOKS, False))
-        except Exception:
-            enable_webhooks = False
-
-        delays = (1.5, 5.0) if enable_webhooks else (1.5, 5.0, 15.0, 30.0)
-        for delay in delays:
-            self.hass.async_create_task(_delayed(delay))
-
-    def _set_optimistic(self, is_on: bool, *, seconds: float = 20.0) -> None:
-        self._optimistic_is_on = bool(is_on)
-        self._optimistic_until = dt_util.utcnow().timestamp() + float(seconds)
-        try:
-            self.async_write_ha_state()
-        except Exception:
-            pass
+        return self._section_state("fan") in {"on", "onpending", "boost", "boostpending", "offpending"}
 
     @property
     def preset_mode(self) -> str | None:
         """Return the active preset mode, if any."""
-        state = (self._fan_state().get("state") or "").lower()
+        state = self._section_state("fan")
         if state in {"boost", "boostpending"} and self._has_boost():
             return "boost"
         return None
@@ -159,6 +115,7 @@ class OmletFan(OmletEntity, FanEntity):
         # so the fan entity itself is intentionally toggle-only. Ignore percentage.
         if preset == "boost" and self._has_boost():
             await self._execute_action(self._ACTION_BOOST)
+            self._track_command("fan", "boost", {"boost"})
         else:
             # If the device is in temperature (thermostatic) or time mode, "turn on"
             # can behave unexpectedly (mode may immediately take over). For predictable
@@ -175,18 +132,14 @@ class OmletFan(OmletEntity, FanEntity):
                     title="Omlet Smart Coop: Fan Mode Changed",
                 )
             if mode and mode != "manual":
-                try:
-                    await self.coordinator.api_client.patch_device_configuration(
-                        self.current_device_id, {"fan": {"mode": "manual"}}
-                    )
-                    # Give the device a brief moment to apply the mode switch before actioning "on".
-                    await asyncio.sleep(0.5)
-                except Exception as err:
-                    _LOGGER.debug("Failed to switch fan mode to manual before turning on: %r", err)
-            await self._execute_action(self._ACTION_ON)
-        self._set_optimistic(True)
-        await self.coordinator.async_request_refresh()
-        self._schedule_followup_refresh()
+                # The queue sends "on" as soon as the mode PATCH has returned.
+                await self.coordinator.async_execute_sequence(
+                    self.current_device_id,
+                    [(KIND_PATCH, self._MANUAL_PATCH), (KIND_ACTION, self._ACTION_ON)],
+                )
+            else:
+                await self._execute_action(self._ACTION_ON)
+            self._track_command("fan", "on", {"on", "boost"})
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the fan off."""
@@ -195,10 +148,15 @@ class OmletFan(OmletEntity, FanEntity):
         # the fan. To make "turn off" behave predictably, exit non-manual modes first.
         mode = (self._fan_config().get("mode") or "").lower()
         if mode and mode != "manual":
+            # The mode PATCH is queued on its own so that the notification is
+            # only shown once it succeeded; "off" is sent either way.
             try:
-                await self.coordinator.api_client.patch_device_configuration(
-                    self.current_device_id, {"fan": {"mode": "manual"}}
+                await self.coordinator.async_patch_configuration(
+                    self.current_device_id, self._MANUAL_PATCH
                 )
+            except Exception as err:
+                _LOGGER.debug("Failed to switch fan mode to manual before turning off: %r", err)
+            else:
                 if getattr(self, "hass", None):
                     friendly = "Thermostatic" if mode == "temperature" else "Time" if mode == "time" else mode
                     pn.async_create(
@@ -209,40 +167,21 @@ class OmletFan(OmletEntity, FanEntity):
                         ),
                         title="Omlet Smart Coop: Fan Mode Changed",
                     )
-            except Exception as err:
-                _LOGGER.debug("Failed to switch fan mode to manual before turning off: %r", err)
         await self._execute_action(self._ACTION_OFF)
-        self._set_optimistic(False)
-        await self.coordinator.async_request_refresh()
-        self._schedule_followup_refresh()
+        self._track_command("fan", "off", {"off"})
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode."""
         if preset_mode != "boost" or not self._has_boost():
             raise ValueError(f"Unsupported preset mode: {preset_mode}")
         await self._execute_action(self._ACTION_BOOST)
-        await self.coordinator.async_request_refresh()
+        self._track_command("fan", "boost", {"boost"})
 
     def _has_boost(self) -> bool:
-        return self._find_action(self._ACTION_BOOST) is not None
-
-    def _has_on(self) -> bool:
-        return self._find_action(self._ACTION_ON) is not None
-
-    def _has_off(self) -> bool:
-        return self._find_action(self._ACTION_OFF) is not None
+        return self.capabilities.boost
 
     async def _execute_action(self, action: str) -> None:
         """Execute an action on the fan."""
-        action_data = self._find_action(action)
-        if not action_data:
-            _LOGGER.warning(
-                "Action %s missing in device actions for fan %s; falling back to direct action endpoint",
-                action,
-                self.device_id,
-            )
-            await self.coordinator.api_client.execute_action(
-                f"device/{self.device_id}/action/{action}"
-            )
-            return
-        await self.coordinator.api_client.execute_action(action_data["url"])
+        await self.coordinator.async_execute_action(
+            self.current_device_id, action, "fan"
+        )
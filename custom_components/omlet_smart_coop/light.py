@@ -3,7 +3,12 @@ from homeassistant.components.light import (
     LightEntity,
     ColorMode,
 )
-from .entity import OmletEntity, build_entity_unique_id, should_add_entity
+from .entity import (
+    OmletEntity,
+    async_setup_device_entities,
+    build_entity_unique_id,
+    should_add_entity,
+)
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
@@ -15,11 +20,10 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     _LOGGER.debug("Setting up lights for devices: %s", coordinator.data)
 
-    lights = []
-    for device_id, device_data in coordinator.data.items():
+    def _build_entities(device_id, device_data):
+        lights = []
         # Light Entity
-        light_state = device_data.get("state", {}).get("light")
-        if light_state:
+        if coordinator.get_capabilities(device_id).light:
             unique_id = build_entity_unique_id(device_data, device_id, "light")
             if should_add_entity(hass, "light", unique_id):
                 lights.append(
@@ -29,8 +33,11 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                         device_data["name"],
                     )
                 )
+        return lights
 
-    async_add_entities(lights)
+    async_setup_device_entities(
+        hass, config_entry, coordinator, async_add_entities, _build_entities
+    )
 
 
 class OmletLight(OmletEntity, LightEntity):
@@ -50,26 +57,20 @@ class OmletLight(OmletEntity, LightEntity):
     @property
     def is_on(self):
         # Return whether the light is on.
-        device_data = self._device_data
-        state = device_data.get("state", {}).get("light", {}).get("state")
-        return state in ["on", "onpending"]
+        return self._section_state("light") in ["on", "onpending"]
 
     async def async_turn_on(self, **kwargs):
         # Turn the light on.
         await self._execute_action("on")
-        await self.coordinator.async_request_refresh()
+        self._track_command("light", "on", {"on"})
 
     async def async_turn_off(self, **kwargs):
         # Turn the light off.
         await self._execute_action("off")
-        await self.coordinator.async_request_refresh()
+        self._track_command("light", "off", {"off"})
 
     async def _execute_action(self, action):
         # Execute an action on the device.
-        device_data = self._device_data
-        action_url = next(
-            (a["url"] for a in device_data.get("actions", []) if a["actionValue"] == action),
-            None,
+        await self.coordinator.async_execute_action(
+            self.current_device_id, action, "light"
         )
-        if action_url:
-            await self.coordinator.api_client.execute_action(action_url)
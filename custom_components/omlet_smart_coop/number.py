@@ -7,16 +7,22 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.util.unit_conversion import TemperatureConverter
 
 from .const import DOMAIN
-from .entity import OmletEntity, build_entity_unique_id, should_add_entity
-from .fan_helpers import iter_fan_devices
+from .entity import (
+    OmletEntity,
+    async_setup_device_entities,
+    build_entity_unique_id,
+    should_add_entity,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
 
-    entities: list[NumberEntity] = []
-    for device_id, device_data in iter_fan_devices(coordinator):
+    def _build_entities(device_id, device_data):
+        if not coordinator.get_capabilities(device_id).fan:
+            return []
+        entities: list[NumberEntity] = []
         name = device_data.get("name") or device_id
         if should_add_entity(
             hass,
@@ -30,8 +36,11 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             build_entity_unique_id(device_data, device_id, "tempOff"),
         ):
             entities.append(OmletFanTempOff(coordinator, device_id, name))
+        return entities
 
-    async_add_entities(entities)
+    async_setup_device_entities(
+        hass, config_entry, coordinator, async_add_entities, _build_entities
+    )
 
 
 class _OmletFanNumberBase(OmletEntity, NumberEntity):
@@ -94,11 +103,10 @@ class _OmletFanNumberBase(OmletEntity, NumberEntity):
 
     async def async_set_native_value(self, value: float) -> None:
         api_val = TemperatureConverter.convert(value, self._display_unit, self._api_unit)
-        await self.coordinator.api_client.patch_device_configuration(
+        await self.coordinator.async_patch_configuration(
             self.current_device_id,
             {"fan": {self._CFG_KEY: int(round(api_val))}},
         )
-        await self.coordinator.async_request_refresh()
 
 
 class OmletFanTempOn(_OmletFanNumberBase):
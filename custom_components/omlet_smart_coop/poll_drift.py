@@ -0,0 +1,214 @@
+"""Webhook/poll drift detection and polling interval tuning.
+
+This module intentionally avoids Home Assistant imports so it can be loaded
+directly by tests. The coordinator reports the device each accepted webhook
+named and the devices our own commands touched; after every successful fetch
+it passes per-device state fingerprints. A device whose state changed with
+neither is a change that webhooks missed. The miss rate over recent fetches
+decides whether polling can back off (webhooks catch everything) or must
+tighten again (they do not).
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+import math
+import time
+from typing import Any
+
+# Fetches kept for the rolling miss rate.
+DEFAULT_WINDOW = 20
+# Changes the window must hold before the interval is tuned.
+DEFAULT_MIN_CHANGES = 5
+# Miss rate at or above which polling is tightened.
+DEFAULT_HIGH_MISS_RATE = 0.2
+# A webhook arriving this many seconds after a poll found its change still
+# counts as delivered; commands are expected to change state for as long.
+DEFAULT_GRACE = 60.0
+GROW_FACTOR = 1.5
+SHRINK_FACTOR = 0.5
+
+# Readings that drift from fetch to fetch without an event a webhook reports.
+_VOLATILE_FIELDS = frozenset(
+    {
+        "uptime",
+        "batteryLevel",
+        "wifiStrength",
+        "lightLevel",
+        "feedLevel",
+        "temperature",
+        "humidity",
+    }
+)
+
+
+def event_state(device_data: Mapping[str, Any] | None) -> dict[str, Any]:
+    """Return the parts of a device's state whose changes webhooks announce."""
+    state = (device_data or {}).get("state")
+    if not isinstance(state, Mapping):
+        return {}
+    return {
+        section: {
+            field: value for field, value in values.items() if field not in _VOLATILE_FIELDS
+        }
+        for section, values in state.items()
+        if isinstance(values, Mapping)
+    }
+
+
+@dataclass
+class _Fetch:
+    changes: int
+    missed: int
+
+
+@dataclass
+class _DeviceDrift:
+    changes: int = 0
+    missed: int = 0
+
+
+class PollDriftDetector:
+    """Count device changes found by polling that no webhook reported."""
+
+    def __init__(
+        self,
+        *,
+        window: int = DEFAULT_WINDOW,
+        min_changes: int = DEFAULT_MIN_CHANGES,
+        high_miss_rate: float = DEFAULT_HIGH_MISS_RATE,
+        grace: float = DEFAULT_GRACE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._window: deque[_Fetch] = deque(maxlen=window)
+        self._min_changes = min_changes
+        self._high_miss_rate = high_miss_rate
+        self._grace = grace
+        self._clock = clock
+        self._fingerprints: dict[str, str] = {}
+        self._last_fetch = -math.inf
+        # device_id -> monotonic time of the last webhook / command for it.
+        self._reported: dict[str, float] = {}
+        self._commanded: dict[str, float] = {}
+        # Webhooks without a deviceId since the last fetch.
+        self._anonymous = 0
+        # device_id -> (time found, fetch) for misses a late webhook may retract.
+        self._suspects: dict[str, tuple[float, _Fetch]] = {}
+        self.devices: dict[str, _DeviceDrift] = {}
+        self.fetches = 0
+        self.changes = 0
+        self.missed = 0
+        self.retracted = 0
+        self.adjustments = 0
+
+    def webhook_received(self, device_id: str | None) -> None:
+        """Record a webhook; a late one retracts the miss it would have prevented."""
+        now = self._clock()
+        if not device_id:
+            self._anonymous += 1
+            return
+        self._reported[device_id] = now
+        suspect = self._suspects.pop(device_id, None)
+        if suspect is not None and now - suspect[0] <= self._grace:
+            suspect[1].missed -= 1
+            self.missed -= 1
+            self.devices[device_id].missed -= 1
+            self.retracted += 1
+
+    def command_sent(self, device_id: str) -> None:
+        """Record a command; the state change it causes is not a missed webhook."""
+        self._commanded[device_id] = self._clock()
+
+    def fetch_completed(self, fingerprints: Mapping[str, str]) -> int:
+        """Compare a fetch with the previous one; return the changes webhooks missed.
+
+        Devices that appeared or disappeared are not counted as changes.
+        """
+        now = self._clock()
+        since = now - self._grace
+        # Webhooks and commands since the previous fetch cover its changes;
+        # so do recent ones that raced it.
+        covered_since = min(since, self._last_fetch)
+        fetch = _Fetch(0, 0)
+        changed = [
+            device_id
+            for device_id, fingerprint in fingerprints.items()
+            if self._fingerprints.get(device_id, fingerprint) != fingerprint
+        ]
+        for device_id in changed:
+            fetch.changes += 1
+            device = self.devices.setdefault(device_id, _DeviceDrift())
+            device.changes += 1
+            if (
+                self._reported.get(device_id, -math.inf) >= covered_since
+                or self._commanded.get(device_id, -math.inf) >= covered_since
+            ):
+                continue
+            if self._anonymous:
+                self._anonymous -= 1
+                continue
+            fetch.missed += 1
+            device.missed += 1
+            self._suspects[device_id] = (now, fetch)
+
+        self._fingerprints = dict(fingerprints)
+        self._last_fetch = now
+        self._anonymous = 0
+        self._reported = {k: t for k, t in self._reported.items() if t >= since}
+        self._commanded = {k: t for k, t in self._commanded.items() if t >= since}
+        self._suspects = {k: s for k, s in self._suspects.items() if s[0] >= since}
+        self._window.append(fetch)
+        self.fetches += 1
+        self.changes += fetch.changes
+        self.missed += fetch.missed
+        return fetch.missed
+
+    def miss_rate(self, device_id: str | None = None) -> float | None:
+        """Missed share of changes in the recent window, or for one device overall."""
+        if device_id is not None:
+            device = self.devices.get(device_id)
+            if device is None or not device.changes:
+                return None
+            return device.missed / device.changes
+        changes = sum(fetch.changes for fetch in self._window)
+        if not changes:
+            return None
+        return sum(fetch.missed for fetch in self._window) / changes
+
+    def suggest_interval(self, current: int, minimum: int, maximum: int) -> int:
+        """Return the polling interval the recent miss rate calls for.
+
+        Polling lengthens while webhooks report every change and shortens
+        once too many are missed. Each adjustment starts a fresh window so the
+        next one is based on evidence gathered at the new interval.
+        """
+        changes = sum(fetch.changes for fetch in self._window)
+        rate = self.miss_rate()
+        if rate is None or changes < self._min_changes:
+            return current
+        if rate >= self._high_miss_rate:
+            suggested = int(current * SHRINK_FACTOR)
+        elif rate == 0:
+            suggested = int(current * GROW_FACTOR)
+        else:
+            return current
+        suggested = max(minimum, min(maximum, suggested))
+        if suggested != current:
+            self.adjustments += 1
+            self._window.clear()
+            self._suspects.clear()
+        return suggested
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return drift counters for diagnostics."""
+        rate = self.miss_rate()
+        return {
+            "fetches": self.fetches,
+            "changes": self.changes,
+            "missed": self.missed,
+            "retracted": self.retracted,
+            "window_miss_rate": None if rate is None else round(rate, 3),
+            "adjustments": self.adjustments,
+        }
@@ -0,0 +1,82 @@
+"""Follow-up refresh deadlines for one coordinator.
+
+This module intentionally avoids Home Assistant imports so it can be loaded
+directly by tests. Commands ask for refreshes a few seconds later (the API
+reports *pending* states briefly); the coordinator keeps those requests here
+and drives them with a single timer instead of one sleeping task per delay.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Iterable
+import time
+
+DEFAULT_MERGE_WINDOW = 1.0
+
+
+class RefreshSchedule:
+    """Sorted refresh deadlines; deadlines within merge_window collapse into one."""
+
+    def __init__(
+        self,
+        merge_window: float = DEFAULT_MERGE_WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._merge_window = merge_window
+        self._clock = clock
+        self._deadlines: list[float] = []
+        self.requested = 0
+        self.merged = 0
+        self.satisfied = 0
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def add(self, delays: Iterable[float]) -> None:
+        """Request a refresh after each delay (seconds from now)."""
+        now = self._clock()
+        for delay in delays:
+            self.requested += 1
+            deadline = now + float(delay)
+            index = bisect_left(self._deadlines, deadline - self._merge_window)
+            if (
+                index < len(self._deadlines)
+                and self._deadlines[index] <= deadline + self._merge_window
+            ):
+                # A refresh already lands close enough to this one.
+                self.merged += 1
+                continue
+            insort(self._deadlines, deadline)
+
+    def next_delay(self) -> float | None:
+        """Seconds until the earliest deadline, or None if nothing is pending."""
+        if not self._deadlines:
+            return None
+        return max(0.0, self._deadlines[0] - self._clock())
+
+    def pop_due(self) -> bool:
+        """Drop deadlines due within the merge window; True if any were due.
+
+        Called when the timer fires and after every successful refresh, so a
+        refresh that happens anyway also satisfies follow-ups due around it.
+        """
+        index = bisect_right(self._deadlines, self._clock() + self._merge_window)
+        if not index:
+            return False
+        self.satisfied += index
+        del self._deadlines[:index]
+        return True
+
+    def clear(self) -> None:
+        """Cancel every pending follow-up."""
+        self._deadlines.clear()
+
+    def as_dict(self) -> dict[str, int]:
+        """Return pending/requested/merged/satisfied counters."""
+        return {
+            "pending": len(self._deadlines),
+            "requested": self.requested,
+            "merged": self.merged,
+            "satisfied": self.satisfied,
+        }
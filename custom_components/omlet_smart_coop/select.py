@@ -7,8 +7,13 @@ from homeassistant.helpers.entity_registry import async_get as async_get_entity_
 from homeassistant.helpers.entity import EntityCategory
 
 from .const import DOMAIN
-from .entity import OmletEntity, build_entity_unique_id, should_add_entity
-from .fan_helpers import FAN_SPEED_MAP, iter_fan_devices, patch_fan_config_and_refresh
+from .entity import (
+    OmletEntity,
+    async_setup_device_entities,
+    build_entity_unique_id,
+    should_add_entity,
+)
+from .fan_helpers import FAN_SPEED_MAP, patch_fan_config_and_refresh
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,8 +26,10 @@ def _fan_is_on(device_data: dict[str, Any]) -> bool:
 async def async_setup_entry(hass, config_entry, async_add_entities):
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
 
-    entities: list[SelectEntity] = []
-    for device_id, device_data in iter_fan_devices(coordinator):
+    def _build_entities(device_id, device_data):
+        if not coordinator.get_capabilities(device_id).fan:
+            return []
+        entities: list[SelectEntity] = []
         name = device_data.get("name") or device_id
         if should_add_entity(
             hass,
@@ -66,8 +73,11 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             build_entity_unique_id(device_data, device_id, "fan_thermostat_speed"),
         ):
             entities.append(OmletFanThermostatSpeedSelect(coordinator, device_id, name))
+        return entities
 
-    async_add_entities(entities)
+    async_setup_device_entities(
+        hass, config_entry, coordinator, async_add_entities, _build_entities
+    )
 
 
 class OmletFanModeSelect(OmletEntity, SelectEntity):
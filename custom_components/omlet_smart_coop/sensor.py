@@ -1,14 +1,22 @@
 """Support for Omlet sensors."""
 
-from datetime import datetime
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorDeviceClass,
     SensorEntityDescription,
+    SensorStateClass,
 )
 from homeassistant.const import PERCENTAGE, UnitOfTemperature, UnitOfTime
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity import EntityCategory
-from .entity import OmletEntity, build_entity_unique_id, should_add_entity
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from .entity import (
+    OmletEntity,
+    async_setup_device_entities,
+    build_entity_unique_id,
+    should_add_entity,
+)
+from .core.sensor_values import extract_sensor_value
 from homeassistant.helpers.typing import StateType
 from .const import DOMAIN
 import logging
@@ -222,16 +230,49 @@ SENSOR_TYPES = {
     ),
 }
 
+# Webhook and polling readings of the whole config entry, created once per
+# entry on an entry-level service device.
+COORDINATOR_SENSOR_TYPES = {
+    "webhook_miss_rate": SensorEntityDescription(
+        key="webhook_miss_rate",
+        native_unit_of_measurement=PERCENTAGE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:webhook",
+    ),
+    "polling_interval": SensorEntityDescription(
+        key="polling_interval",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:update",
+    ),
+    "webhooks_received": SensorEntityDescription(
+        key="webhooks_received",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:webhook",
+    ),
+    "webhook_handler_latency": SensorEntityDescription(
+        key="webhook_handler_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:timer-outline",
+    ),
+    "webhook_update_latency": SensorEntityDescription(
+        key="webhook_update_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:timer-sand",
+    ),
+}
 
-def parse_timestamp(timestamp_str: str) -> datetime | None:
-    """Parse timestamp string to datetime with timezone."""
-    if not timestamp_str:
-        return None
-    try:
-        return datetime.fromisoformat(timestamp_str)
-    except Exception as e:
-        _LOGGER.warning("Failed to parse timestamp: %s", e)
-        return None
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the sensors from the config entry."""
@@ -239,26 +280,27 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     _LOGGER.debug("Setting up sensors for devices: %s", coordinator.data)
 
-    sensors = []
-    for device_id, device_data in coordinator.data.items():
-        state = device_data.get("state", {}) or {}
-        config = device_data.get("configuration", {}) or {}
-        device_type = (device_data.get("deviceType") or "").lower()
-        has_fan_state = bool(state.get("fan"))
-        has_fan_config = bool(config.get("fan"))
-        fan_available = has_fan_state or has_fan_config
-        # Detect stand-alone fan hardware so we can keep door/light specific sensors off it
-        is_pure_fan_device = (
-            "fan" in device_type and not state.get("door") and not state.get("light")
+    coordinator_sensors = [
+        OmletCoordinatorSensor(coordinator, config_entry, description)
+        for description in COORDINATOR_SENSOR_TYPES.values()
+        if should_add_entity(
+            hass, "sensor", f"{config_entry.entry_id}_{description.key}"
         )
+    ]
+    if coordinator_sensors:
+        async_add_entities(coordinator_sensors)
 
+    def _build_entities(device_id, device_data):
+        capabilities = coordinator.get_capabilities(device_id)
+
+        sensors = []
         for key, description in SENSOR_TYPES.items():
             # Only surface fan sensors when the device actually reports fan data
-            if key.startswith("fan_") and not fan_available:
+            if key.startswith("fan_") and not capabilities.fan:
                 continue
             # Avoid creating door/light-specific sensors for dedicated fan hardware
             if (
-                is_pure_fan_device
+                capabilities.pure_fan
                 and (
                     key.startswith("door_")
                     or key.startswith("light_")
@@ -280,120 +322,11 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                         device_name=device_data["name"],
                     )
                 )
+        return sensors
 
-    async_add_entities(sensors)
-
-
-def extract_sensor_value(sensor_key, device_data):
-    """Extract the value for a given sensor key from device data."""
-    state = device_data.get("state", {})
-    config = device_data.get("configuration", {})
-
-    # Log state and config only for debugging when needed
-    #    if _LOGGER.isEnabledFor(logging.DEBUG):
-    #        if sensor_key in [
-    #            "door_close_time",
-    #            "door_open_time",
-    #            "last_close_time",
-    #           "last_open_time",
-    #           "overnight_sleep_start",
-    #           "overnight_sleep_end",
-    #       ]:
-    #            _LOGGER.debug(
-    #                "Processing %s: state=%s, config=%s", sensor_key, state, config
-    #            )
-
-    # General/shared sensors
-    if sensor_key == "battery_level":
-        return state.get("general", {}).get("batteryLevel")
-    if sensor_key == "power_source":
-        return state.get("general", {}).get("powerSource")
-    if sensor_key == "uptime":
-        return state.get("general", {}).get("uptime")
-    if sensor_key == "wifi_ssid":
-        return state.get("connectivity", {}).get("ssid")
-    if sensor_key == "wifi_strength":
-        return state.get("connectivity", {}).get("wifiStrength")
-    if sensor_key == "wifi_connected":
-        return state.get("connectivity", {}).get("connected")
-    if sensor_key == "door_state":
-        return state.get("door", {}).get("state")
-    if sensor_key == "door_fault":
-        return state.get("door", {}).get("fault")
-    if sensor_key == "door_light_level":
-        return state.get("door", {}).get("lightLevel")
-    if sensor_key == "door_open_mode":
-        return config.get("door", {}).get("openMode")
-    if sensor_key == "door_close_mode":
-        return config.get("door", {}).get("closeMode")
-    if sensor_key == "feeder_state":
-        return state.get("feeder", {}).get("state")
-    if sensor_key == "feeder_fault":
-        return state.get("feeder", {}).get("fault")
-    if sensor_key == "feeder_feed_level":
-        return state.get("feeder", {}).get("feedLevel")
-    if sensor_key == "feeder_light_level":
-        return state.get("feeder", {}).get("lightLevel")
-    if sensor_key == "feeder_mode":
-        return state.get("feeder", {}).get("mode") or config.get("feeder", {}).get("mode")
-    if sensor_key == "light_state":
-        return state.get("light", {}).get("state")
-    if sensor_key == "light_mode":
-        return config.get("light", {}).get("mode")
-    if sensor_key == "light_minutes_before_close":
-        return config.get("light", {}).get("minutesBeforeClose")
-    if sensor_key == "light_max_on_time":
-        return config.get("light", {}).get("maxOnTime")
-    if sensor_key == "light_equipped":
-        return config.get("light", {}).get("equipped")
-    if sensor_key == "fan_state":
-        return state.get("fan", {}).get("state")
-    if sensor_key == "fan_temperature":
-        return state.get("fan", {}).get("temperature")
-    if sensor_key == "fan_humidity":
-        return state.get("fan", {}).get("humidity")
-    if sensor_key == "fan_mode":
-        mode = config.get("fan", {}).get("mode")
-        # Omlet uses "temperature" internally; present as "thermostatic" for UI consistency.
-        if isinstance(mode, str) and mode.lower() == "temperature":
-            return "thermostatic"
-        return mode
-    if sensor_key == "fan_manual_speed":
-        return config.get("fan", {}).get("manualSpeed")
-    if sensor_key == "fan_temp_on":
-        return config.get("fan", {}).get("tempOn")
-    if sensor_key == "fan_temp_off":
-        return config.get("fan", {}).get("tempOff")
-    if sensor_key == "fan_temp_speed":
-        return config.get("fan", {}).get("tempSpeed")
-
-    # Handle timestamps
-    if sensor_key == "last_open_time":
-        timestamp_str = state.get("door", {}).get("lastOpenTime")
-        return parse_timestamp(timestamp_str)
-    if sensor_key == "last_close_time":
-        timestamp_str = state.get("door", {}).get("lastCloseTime")
-        return parse_timestamp(timestamp_str)
-    if sensor_key == "feeder_last_open_time":
-        timestamp_str = state.get("feeder", {}).get("lastOpenTime")
-        return parse_timestamp(timestamp_str)
-    if sensor_key == "feeder_last_close_time":
-        timestamp_str = state.get("feeder", {}).get("lastCloseTime")
-        return parse_timestamp(timestamp_str)
-
-    # Handle door configuration times
-    if sensor_key == "door_open_time":
-        return config.get("door", {}).get("openTime")
-    if sensor_key == "door_close_time":
-        return config.get("door", {}).get("closeTime")
-
-    # Handle overnight sleep times
-    if sensor_key == "overnight_sleep_start":
-        return config.get("general", {}).get("overnightSleepStart")
-    if sensor_key == "overnight_sleep_end":
-        return config.get("general", {}).get("overnightSleepEnd")
-
-    return None
+    async_setup_device_entities(
+        hass, config_entry, coordinator, async_add_entities, _build_entities
+    )
 
 
 class OmletSensor(OmletEntity, SensorEntity):
@@ -425,3 +358,40 @@ class OmletSensor(OmletEntity, SensorEntity):
         """Return the current value of the sensor."""
         device_data = self._device_data
         return extract_sensor_value(self.entity_description.key, device_data)
+
+
+class OmletCoordinatorSensor(CoordinatorEntity, SensorEntity):
+    """Webhook and polling diagnostics kept by the coordinator for one entry."""
+
+    def __init__(
+        self, coordinator, config_entry, description: SensorEntityDescription
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_translation_key = description.key
+        self._attr_unique_id = f"{config_entry.entry_id}_{description.key}"
+        self._attr_has_entity_name = True
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=config_entry.title,
+            manufacturer="Omlet",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the current value of the sensor."""
+        key = self.entity_description.key
+        metrics = self.coordinator.webhook_metrics
+        if key == "polling_interval":
+            interval = self.coordinator.update_interval
+            return None if interval is None else int(interval.total_seconds())
+        if key == "webhooks_received":
+            return metrics.received
+        if key == "webhook_handler_latency":
+            return metrics.handler.percentile(0.95)
+        if key == "webhook_update_latency":
+            return metrics.update.percentile(0.95)
+        rate = self.coordinator.poll_drift.miss_rate()
+        return None if rate is None else round(rate * 100, 1)
@@ -4,38 +4,88 @@ from __future__ import annotations
 import asyncio
 import logging
 import inspect
+import time
+from collections.abc import Awaitable, Callable, Sequence
 from typing import Any
-from aiohttp import ClientError
-
-from homeassistant.core import HomeAssistant, ServiceCall
+from aiohttp import ClientError, ClientResponseError
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTemperature
-from homeassistant.components import persistent_notification as pn
-from homeassistant.helpers.device_registry import async_get as async_get_device_registry
+from homeassistant.helpers import device_registry as dr
 from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.service import async_extract_entity_ids
-from homeassistant.util.unit_conversion import TemperatureConverter
-
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .command_queue import KIND_ACTION, KIND_PATCH, SuppressedAction
+from .config_helpers import (
+    PROFILE_SECTIONS,
+    SnapshotLibrary,
+    configuration_drift,
+    configuration_patch,
+    validate_profile,
+)
 from .coordinator import OmletDataCoordinator
-from .fan_helpers import FAN_SPEED_MAP, schedule_followup_refresh
+from .core.devices import (
+    configuration_diff,
+    configuration_section,
+    device_state,
+)
+from .fan_helpers import (
+    FAN_SPEED_MAP,
+    cycle_fan_off_on,
+    fan_is_running,
+)
+from .target_index import DeviceTargetIndex
 from .webhook_helpers import (
+    WebhookMetrics,
     build_webhook_url_info,
+    create_omlet_webhook_handler,
     format_webhook_url_message,
+    get_expected_webhook_token,
     register_omlet_webhook,
+    replay_webhook_events,
     rotate_omlet_webhook_id,
 )
 from .const import (
     DOMAIN,
+    CONFIG_CACHE_MAX_AGE,
+    MAX_CONCURRENT_COMMANDS,
     SERVICE_OPEN_DOOR,
     SERVICE_CLOSE_DOOR,
     SERVICE_RESTART_DEVICE,
     SERVICE_UPDATE_OVERNIGHT_SLEEP,
     SERVICE_UPDATE_DOOR_SCHEDULE,
     SERVICE_SHOW_WEBHOOK_URL,
+    SERVICE_SAVE_PROFILE,
+    SERVICE_APPLY_PROFILE,
+    PROFILE_STORAGE_KEY,
+    PROFILE_STORAGE_VERSION,
+    SERVICE_SNAPSHOT_CONFIGURATION,
+    SERVICE_RESTORE_CONFIGURATION,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+    SNAPSHOT_RETENTION,
+    SERVICE_REPLAY_WEBHOOK_EVENTS,
+    SERVICE_CAPTURE_TRACE,
+    TRACE_DIR,
+    TRACE_DEFAULT_DURATION,
     CONF_WEBHOOK_ID,
     CONF_ENABLE_WEBHOOKS,
     CONF_WEBHOOK_NOTIFIED_ID,
     ATTR_ENABLED,
+    ATTR_LIMIT,
+    ATTR_REALTIME,
+    ATTR_DURATION,
+    ATTR_STOP,
     ATTR_START_TIME,
     ATTR_END_TIME,
     ATTR_OPEN_TIME,
@@ -43,6 +93,9 @@ from .const import (
     VALID_DOOR_MODES,
     ATTR_DOOR_MODE,
     ATTR_POLL_MODE,
+    ATTR_PROFILE,
+    ATTR_CHECK_MODE,
+    ATTR_SNAPSHOT,
     POLL_MODE_RESPONSIVE,
     POLL_MODE_POWER_SAVINGS,
     POLL_MODE_NOTIFICATIONS_ONLY,
@@ -53,6 +106,28 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# hass.data[DOMAIN] key for the DeviceTargetIndex shared by all service calls.
+_TARGET_INDEX_KEY = "_target_index"
+
+# Returned by a device command that had nothing to send.
+_NO_REQUEST = object()
+
+# Sent ahead of fan on/off when force_manual is set.
+_MANUAL_FAN_PATCH = {"fan": {"mode": "manual"}}
+
+# hass.data[DOMAIN] keys for stored profiles and snapshots, loaded on first use.
+_PROFILES_KEY = "_profiles"
+_SNAPSHOTS_KEY = "_snapshots"
+
+# Service call keys that select targets; without any, fleet services use all devices.
+_TARGET_KEYS = ("device_id", "entity_id", "area_id", "floor_id", "label_id")
+
+def _door_section(coord: OmletDataCoordinator, device_id: str) -> str | None:
+    """Return the section (door, else feeder) that open/close drives on a device."""
+    capabilities = coord.get_capabilities(device_id)
+    return next((name for name in ("door", "feeder") if getattr(capabilities, name)), None)
+
+
 def _bool_with_default(value: Any, default: bool) -> bool:
     """Return bool(value) but treat None as 'use default'."""
     if value is None:
@@ -88,13 +163,139 @@ def _iter_coordinators(hass: HomeAssistant) -> list[OmletDataCoordinator]:
     return out
 
 
+@callback
+def async_invalidate_target_index(hass: HomeAssistant) -> None:
+    """Drop the target index so the next service call rebuilds it."""
+    index = (hass.data.get(DOMAIN) or {}).get(_TARGET_INDEX_KEY)
+    if index is not None:
+        index.invalidate()
+
+
+@callback
+def async_track_target_index(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: OmletDataCoordinator
+) -> None:
+    """Invalidate the target index on changes that affect entry's targets.
+
+    Registry updates and device identity changes invalidate it until entry
+    is unloaded; deviceId changes are caught by the index itself.
+    """
+
+    @callback
+    def _invalidate(*_args: Any) -> None:
+        async_invalidate_target_index(hass)
+
+    entry.async_on_unload(
+        hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, _invalidate)
+    )
+    entry.async_on_unload(
+        hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, _invalidate)
+    )
+    entry.async_on_unload(coordinator.async_add_device_listener(_invalidate))
+
+
+@callback
+def _async_get_target_index(
+    hass: HomeAssistant, coordinators: list[OmletDataCoordinator]
+) -> DeviceTargetIndex:
+    """Return the domain-wide target index, rebuilding it if it is stale."""
+    domain_bucket = hass.data.setdefault(DOMAIN, {})
+    index = domain_bucket.get(_TARGET_INDEX_KEY)
+    if index is None:
+        index = domain_bucket[_TARGET_INDEX_KEY] = DeviceTargetIndex(
+            lambda coord: coord.devices
+        )
+
+    if index.needs_rebuild(coordinators):
+        device_registry = dr.async_get(hass)
+        ent_reg = er.async_get(hass)
+        ha_devices: list[tuple[str, list[str]]] = []
+        entities: list[tuple[str, str | None]] = []
+        for coord in coordinators:
+            entry_id = coord.config_entry.entry_id
+            for ha_device in dr.async_entries_for_config_entry(device_registry, entry_id):
+                ha_devices.append(
+                    (
+                        ha_device.id,
+                        [value for domain, value in ha_device.identifiers if domain == DOMAIN],
+                    )
+                )
+            for ent_entry in er.async_entries_for_config_entry(ent_reg, entry_id):
+                entities.append((ent_entry.entity_id, ent_entry.device_id))
+        index.rebuild(coordinators, ha_devices, entities)
+        _LOGGER.debug(
+            "Rebuilt service target index: %d coordinators, %d devices, %d entities",
+            len(coordinators),
+            len(ha_devices),
+            len(entities),
+        )
+    return index
+
+
+async def _async_extract_target_entity_ids(hass: HomeAssistant, call: ServiceCall) -> list[str]:
+    """Resolve entity_ids from targets (supports device/area/label selection)."""
+    # HA 2026.10 removes the hass argument; keep compatibility with older cores.
+    try:
+        try:
+            resolved = async_extract_entity_ids(call)
+        except TypeError:
+            resolved = async_extract_entity_ids(hass, call)
+        if inspect.isawaitable(resolved):
+            resolved = await resolved
+        return list(resolved)
+    except Exception as err:
+        _LOGGER.debug("Failed to resolve entity_ids from service target: %s", err)
+        return []
+
+
+async def _async_resolve_call(
+    hass: HomeAssistant,
+    call: ServiceCall,
+    coordinators: list[OmletDataCoordinator],
+) -> list[tuple[OmletDataCoordinator, list[str]]]:
+    """Resolve a call's targets against all coordinators in one pass."""
+    call_data = call.data
+    device_ids = call_data.get("device_id", [])
+    _LOGGER.debug("Full service call data: %s", call_data)
+
+    # Ensure device_ids is a list
+    if not isinstance(device_ids, list):
+        device_ids = [device_ids] if device_ids else []
+
+    entity_ids = await _async_extract_target_entity_ids(hass, call)
+    _LOGGER.debug("Processing device IDs: %s", device_ids)
+
+    device_registry = dr.async_get(hass)
+    ent_reg = er.async_get(hass)
+
+    # Only targets outside this integration's registry entries reach these.
+    def _device_identifiers(ha_device_id: str) -> list[str]:
+        ha_device = device_registry.async_get(ha_device_id)
+        if not ha_device:
+            return []
+        return [value for domain, value in ha_device.identifiers if domain == DOMAIN]
+
+    def _entity_device_id(entity_id: str) -> str | None:
+        ent_entry = ent_reg.async_get(entity_id)
+        return ent_entry.device_id if ent_entry else None
+
+    index = _async_get_target_index(hass, coordinators)
+    return index.resolve(
+        device_ids,
+        entity_ids,
+        call_data.get("name"),
+        device_identifiers=_device_identifiers,
+        entity_device_id=_entity_device_id,
+    )
+
+
 async def _resolve_targets(
     hass: HomeAssistant, call: ServiceCall
 ) -> list[tuple[OmletDataCoordinator, list[str]]]:
     """Resolve the service call target into (coordinator, [device_ids]) pairs."""
     results: list[tuple[OmletDataCoordinator, list[str]]] = []
-    for coord in _iter_coordinators(hass):
-        ids = await get_integration_device_ids(hass, coord, call, log_errors=False)
+    for coord, ids in await _async_resolve_call(hass, call, _iter_coordinators(hass)):
+        ids = [device_id for device_id in ids if device_id in coord.devices]
         if ids:
             results.append((coord, ids))
     if not results:
@@ -102,30 +303,81 @@ async def _resolve_targets(
     return results
 
 
-async def _fan_patch_and_refresh(
-    hass: HomeAssistant,
+async def _fan_patch(
     coordinator: OmletDataCoordinator,
     device_id: str,
     fan_patch: dict[str, Any],
     *,
     apply_immediately: bool = False,
-) -> None:
-    """Patch fan configuration and refresh. Optionally cycle off/on to apply immediately."""
-    await coordinator.api_client.patch_device_configuration(device_id, {"fan": fan_patch})
+) -> dict[str, Any] | None:
+    """Patch fan configuration. Optionally cycle off/on to apply immediately."""
+    response = await coordinator.async_patch_configuration(device_id, {"fan": fan_patch})
 
     if apply_immediately:
         device_data = coordinator.data.get(device_id, {}) or {}
-        state = ((device_data.get("state") or {}).get("fan") or {}).get("state") or ""
-        if str(state).lower() in {"on", "onpending", "boost", "boostpending", "offpending"}:
+        if fan_is_running(device_data):
             try:
-                await coordinator.api_client.execute_action(f"device/{device_id}/action/off")
-                await asyncio.sleep(0.5)
-                await coordinator.api_client.execute_action(f"device/{device_id}/action/on")
+                await cycle_fan_off_on(coordinator, device_id)
             except Exception as err:
                 _LOGGER.debug("Fan apply_immediately cycle failed for %s: %r", device_id, err)
 
-    await coordinator.async_request_refresh()
-    schedule_followup_refresh(hass, coordinator, (1.5, 5.0))
+    return response
+
+
+async def _async_device_configuration(
+    coordinator: OmletDataCoordinator, device_id: str, sections: Sequence[str]
+) -> dict[str, Any]:
+    """Return a device's configuration, preferring the coordinator's copy.
+
+    The API is only read when the copy is older than CONFIG_CACHE_MAX_AGE or is
+    missing one of the requested sections.
+    """
+    data_age = coordinator.data_age()
+    if data_age is not None and data_age <= CONFIG_CACHE_MAX_AGE:
+        device_data = (coordinator.data or {}).get(device_id)
+        if device_data and all(
+            configuration_section(device_data, section) for section in sections
+        ):
+            return device_data.get("configuration") or {}
+    return await coordinator.api_client.get_device_configuration(device_id) or {}
+
+
+async def _async_get_profiles(hass: HomeAssistant) -> tuple[Store, dict[str, Any]]:
+    """Return the profile store and the stored {name: profile} mapping."""
+    domain_bucket = hass.data.setdefault(DOMAIN, {})
+    loaded = domain_bucket.get(_PROFILES_KEY)
+    if loaded is None:
+        store: Store = Store(hass, PROFILE_STORAGE_VERSION, PROFILE_STORAGE_KEY)
+        stored = await store.async_load() or {}
+        loaded = domain_bucket[_PROFILES_KEY] = (store, dict(stored.get("profiles") or {}))
+    return loaded
+
+
+async def _async_get_snapshots(hass: HomeAssistant) -> tuple[Store, SnapshotLibrary]:
+    """Return the snapshot store and the loaded SnapshotLibrary."""
+    domain_bucket = hass.data.setdefault(DOMAIN, {})
+    loaded = domain_bucket.get(_SNAPSHOTS_KEY)
+    if loaded is None:
+        store: Store = Store(hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY)
+        library = SnapshotLibrary(await store.async_load(), SNAPSHOT_RETENTION)
+        loaded = domain_bucket[_SNAPSHOTS_KEY] = (store, library)
+    return loaded
+
+
+def _all_device_targets(hass: HomeAssistant) -> list[tuple[OmletDataCoordinator, list[str]]]:
+    """Return every loaded device as (coordinator, [device_ids]) pairs."""
+    return [
+        (coord, list(coord.devices)) for coord in _iter_coordinators(hass) if coord.devices
+    ]
+
+
+def _service_response(
+    call: ServiceCall, results: list[dict[str, Any]], **extra: Any
+) -> ServiceResponse:
+    """Return per-device results if the caller asked for a response."""
+    if not call.return_response:
+        return None
+    return {**extra, "devices": results}
 
 
 async def get_integration_device_ids(
@@ -136,89 +388,20 @@ async def get_integration_device_ids(
     log_errors: bool = True,
 ) -> list[str]:
     """Map Home Assistant device identifiers to integration device IDs."""
-    # Read from call data (HA injects target refs into device_id/entity_id)
-    call_data = call.data
-    device_ids = call_data.get("device_id", [])
-    device_name = call_data.get("name")
-
-    _LOGGER.debug("Full service call data: %s", call_data)
-
-    # Ensure device_ids is a list
-    if not isinstance(device_ids, list):
-        device_ids = [device_ids] if device_ids else []
-
-    # Resolve entity_ids from targets (supports device/area/label selection).
-    # HA 2026.10 removes the hass argument; keep compatibility with older cores.
-    try:
-        try:
-            resolved = async_extract_entity_ids(call)
-        except TypeError:
-            resolved = async_extract_entity_ids(hass, call)
-        if inspect.isawaitable(resolved):
-            resolved = await resolved
-        entity_ids = list(resolved)
-    except Exception as err:
-        _LOGGER.debug("Failed to resolve entity_ids from service target: %s", err)
-        entity_ids = []
-
-    _LOGGER.debug("Processing device IDs: %s", device_ids)
+    coordinators = _iter_coordinators(hass)
+    if coordinator not in coordinators:
+        coordinators.append(coordinator)
 
-    # Map Home Assistant device_ids to integration-specific device_ids
-    integration_device_ids = []  # Changed to list
-    device_registry = async_get_device_registry(hass)
-
-    # Process all device IDs
-    for device_id in device_ids:
-        ha_device = device_registry.async_get(device_id)
-        if ha_device:
-            identifiers = [value for domain, value in ha_device.identifiers if domain == DOMAIN]
-            _LOGGER.debug("Found Omlet identifiers: %s", identifiers)
-
-            # Look up the device ID using serial or deviceId identifiers
-            for identifier in identifiers:
-                for dev_id, dev_data in coordinator.devices.items():
-                    if dev_data.get("deviceSerial") == identifier or dev_data.get("deviceId") == identifier:
-                        if dev_id not in integration_device_ids:
-                            integration_device_ids.append(dev_id)
-                            _LOGGER.debug(
-                                "Mapped identifier %s to device ID: %s",
-                                identifier,
-                                dev_id,
-                            )
-                        break
-
-    # If no IDs found yet, try entity_id(s)
-    if not integration_device_ids and entity_ids:
-        ent_reg = er.async_get(hass)
-        for ent_id in entity_ids:
-            try:
-                ent_entry = ent_reg.async_get(ent_id)
-                if ent_entry and ent_entry.device_id:
-                    ha_device = device_registry.async_get(ent_entry.device_id)
-                    if ha_device:
-                        identifiers = [
-                            value for domain, value in ha_device.identifiers if domain == DOMAIN
-                        ]
-                        for identifier in identifiers:
-                            for dev_id, dev_data in coordinator.devices.items():
-                                if dev_data.get("deviceSerial") == identifier or dev_data.get("deviceId") == identifier:
-                                    if dev_id not in integration_device_ids:
-                                        integration_device_ids.append(dev_id)
-                                    break
-            except Exception as e:
-                _LOGGER.debug("Failed entity_id resolution via registry for %s: %s", ent_id, e)
-
-    # If still no IDs, try device name
-    if not integration_device_ids and device_name:
-        for dev_id, dev_data in coordinator.devices.items():
-            if dev_data.get("name") == device_name:
-                integration_device_ids.append(dev_id)
-                break
+    integration_device_ids: list[str] = []
+    for coord, ids in await _async_resolve_call(hass, call, coordinators):
+        if coord is coordinator:
+            integration_device_ids = ids
+            break
 
     # Validate the resolved device_ids
     if not integration_device_ids:
         if log_errors:
-            _LOGGER.error("No valid device IDs found. Service call data: %s", call_data)
+            _LOGGER.error("No valid device IDs found. Service call data: %s", call.data)
         else:
             _LOGGER.debug("No valid device IDs found for this coordinator")
         return []
@@ -284,10 +467,14 @@ async def async_register_services(
     # services added in dev prereleases (e.g. turn_fan_on/off) still get registered
     # even if HA didn't fully restart.
 
-    def _register(service: str, handler) -> None:
+    def _register(
+        service: str, handler, supports_response: SupportsResponse = SupportsResponse.NONE
+    ) -> None:
         if hass.services.has_service(DOMAIN, service):
             return
-        hass.services.async_register(DOMAIN, service, handler)
+        hass.services.async_register(
+            DOMAIN, service, handler, supports_response=supports_response
+        )
 
     async def _targets(call: ServiceCall) -> list[tuple[OmletDataCoordinator, list[str]]]:
         """Return (coordinator, [device_ids]) for this call."""
@@ -296,6 +483,92 @@ async def async_register_services(
             return [(coordinator, ids)] if ids else []
         return await _resolve_targets(hass, call)
 
+    # Shared by every handler so concurrent service calls cannot exceed it either.
+    command_semaphore = asyncio.Semaphore(MAX_CONCURRENT_COMMANDS)
+
+    async def _run_on_devices(
+        targets: Sequence[tuple[OmletDataCoordinator, list[str]]],
+        command: Callable[[OmletDataCoordinator, str], Awaitable[Any]],
+        failure_message: str,
+        *,
+        converged: Callable[[dict[str, Any] | None], bool] | None = None,
+        followup_delays: Sequence[float] | None = None,
+        track: tuple[str, set[str], tuple[str, ...]] | None = None,
+        refresh: bool = True,
+    ) -> list[dict[str, Any]]:
+        """Run command for every target device concurrently, then refresh once.
+
+        A failing device is logged with failure_message (device_id, error) and
+        does not affect the others. An action the coordinator did not send
+        because it was redundant reports suppressed and no status. Unless
+        refresh is False, each coordinator is refreshed once after all of its
+        commands have completed; handlers that only PATCH configuration pass
+        False, since the coordinator writes accepted PATCHes through to its
+        data. Returns one result per device; converged is checked against the
+        refreshed data for devices whose command succeeded. Without a refresh
+        it stays None: the data would only echo the write-through, and the
+        coordinator reads the configuration back CONFIG_VERIFY_DELAY seconds
+        later. track is (optimistic, target states, candidate sections):
+        devices that have not converged yet show the optimistic state in the
+        first section they support until they do.
+        """
+
+        async def _run(coord: OmletDataCoordinator, device_id: str) -> dict[str, Any]:
+            result: dict[str, Any] = {
+                "device_id": device_id,
+                "name": (coord.devices.get(device_id) or {}).get("name"),
+                "success": False,
+                "status": None,
+                "latency_ms": None,
+                "converged": None,
+                "suppressed": False,
+                "error": None,
+            }
+            async with command_semaphore:
+                started = time.monotonic()
+                try:
+                    response = await command(coord, device_id)
+                except Exception as err:
+                    _LOGGER.error(failure_message, device_id, err)
+                    if isinstance(err, ClientResponseError):
+                        result["status"] = err.status
+                    result["error"] = str(err) or type(err).__name__
+                else:
+                    result["success"] = True
+                    # The API client returns None only for 204 No Content.
+                    if isinstance(response, SuppressedAction):
+                        result["suppressed"] = True
+                    elif response is not _NO_REQUEST:
+                        result["status"] = 204 if response is None else 200
+                result["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+            return result
+
+        device_runs = [(coord, device_id) for coord, ids in targets for device_id in ids]
+        results = await asyncio.gather(
+            *(_run(coord, device_id) for coord, device_id in device_runs)
+        )
+        if refresh:
+            await asyncio.gather(
+                *(coord.async_request_refresh() for coord, _ids in targets)
+            )
+        if followup_delays:
+            for coord, _ids in targets:
+                coord.async_schedule_followup_refresh(followup_delays)
+        if converged is not None and refresh:
+            for (coord, device_id), result in zip(device_runs, results):
+                if result["success"]:
+                    result["converged"] = bool(converged((coord.data or {}).get(device_id)))
+        if track is not None:
+            optimistic, target_states, sections = track
+            for (coord, device_id), result in zip(device_runs, results):
+                if not result["success"] or result["converged"]:
+                    continue
+                capabilities = coord.get_capabilities(device_id)
+                section = next((name for name in sections if getattr(capabilities, name)), None)
+                if section is not None:
+                    coord.async_track_convergence(device_id, section, optimistic, target_states)
+        return list(results)
+
     async def handle_show_webhook_url(call: ServiceCall) -> None:
         """Show the webhook URL and status via notification and log."""
         try:
@@ -317,6 +590,8 @@ async def async_register_services(
 
             _LOGGER.info(msg)
             try:
+                from homeassistant.components import persistent_notification as pn
+
                 pn.async_create(hass, msg, title="Omlet Smart Coop Webhook")
             except Exception:  # ignore notification failures
                 pass
@@ -368,6 +643,8 @@ async def async_register_services(
             )
             _LOGGER.info(msg)
             try:
+                from homeassistant.components import persistent_notification as pn
+
                 pn.async_create(hass, msg, title="Omlet Smart Coop Webhook")
             except Exception:
                 pass
@@ -382,160 +659,174 @@ async def async_register_services(
         except Exception as err:
             _LOGGER.error("Failed to regenerate webhook ID: %s", err)
 
-    async def handle_open_door(call: ServiceCall) -> None:
+    async def handle_open_door(call: ServiceCall) -> ServiceResponse:
         """Handle the open door service call."""
+        results: list[dict[str, Any]] = []
         try:
             targets = await _targets(call)
             if not targets:
-                return
-
-            for coord, integration_device_ids in targets:
-                for device_id in integration_device_ids:
-                    try:
-                        await coord.api_client.execute_action(
-                            f"device/{device_id}/action/open"
-                        )
-                        _LOGGER.info(
-                            "Successfully opened door for device: %s",
-                            coord.devices[device_id]["name"],
-                        )
-                    except Exception as err:
-                        _LOGGER.error(
-                            "Failed to open door for device %s: %s", device_id, err
-                        )
+                return _service_response(call, results)
 
-                await coord.async_request_refresh()
+            async def _open(
+                coord: OmletDataCoordinator, device_id: str
+            ) -> dict[str, Any] | None:
+                response = await coord.async_execute_action(
+                    device_id, "open", _door_section(coord, device_id)
+                )
+                _LOGGER.info(
+                    "Successfully opened door for device: %s",
+                    coord.devices[device_id]["name"],
+                )
+                return response
+
+            results = await _run_on_devices(
+                targets,
+                _open,
+                "Failed to open door for device %s: %s",
+                converged=lambda data: "open" in (device_state(data, "door"), device_state(data, "feeder")),
+                track=("openpending", {"open"}, ("door", "feeder")),
+            )
 
         except ClientError as err:
             _LOGGER.error("API error while opening door: %s", err)
         except Exception as err:
             _LOGGER.error("Failed to process open door command: %s", err)
 
-    async def handle_close_door(call: ServiceCall) -> None:
+        return _service_response(call, results)
+
+    async def handle_close_door(call: ServiceCall) -> ServiceResponse:
         """Handle the close door service call."""
+        results: list[dict[str, Any]] = []
         try:
             targets = await _targets(call)
             if not targets:
-                return
+                return _service_response(call, results)
 
-            for coord, integration_device_ids in targets:
-                for device_id in integration_device_ids:
-                    try:
-                        await coord.api_client.execute_action(
-                            f"device/{device_id}/action/close"
-                        )
-                        _LOGGER.info(
-                            "Successfully closed door for device: %s",
-                            coord.devices[device_id]["name"],
-                        )
-                    except Exception as err:
-                        _LOGGER.error(
-                            "Failed to close door for device %s: %s", device_id, err
-                        )
-
-                await coord.async_request_refresh()
+            async def _close(
+                coord: OmletDataCoordinator, device_id: str
+            ) -> dict[str, Any] | None:
+                response = await coord.async_execute_action(
+                    device_id, "close", _door_section(coord, device_id)
+                )
+                _LOGGER.info(
+                    "Successfully closed door for device: %s",
+                    coord.devices[device_id]["name"],
+                )
+                return response
+
+            results = await _run_on_devices(
+                targets,
+                _close,
+                "Failed to close door for device %s: %s",
+                converged=lambda data: "closed" in (device_state(data, "door"), device_state(data, "feeder")),
+                track=("closepending", {"closed"}, ("door", "feeder")),
+            )
 
         except ClientError as err:
             _LOGGER.error("API error while closing door: %s", err)
         except Exception as err:
             _LOGGER.error("Failed to process close door command: %s", err)
 
-    async def handle_restart_device(call: ServiceCall) -> None:
+        return _service_response(call, results)
+
+    async def handle_restart_device(call: ServiceCall) -> ServiceResponse:
         """Handle the restart device service call."""
+        results: list[dict[str, Any]] = []
         try:
             targets = await _targets(call)
             if not targets:
-                return
-
-            for coord, integration_device_ids in targets:
-                for device_id in integration_device_ids:
-                    try:
-                        device_data = coord.data.get(device_id, {}) or {}
-                        actions = device_data.get("actions", []) or []
-                        action_url = next(
-                            (
-                                action.get("url")
-                                for action in actions
-                                if (action.get("actionValue") or "").lower() == "restart"
-                            ),
-                            None,
-                        )
-                        await coord.api_client.execute_action(
-                            action_url or f"device/{device_id}/action/restart"
-                        )
-                        _LOGGER.info(
-                            "Successfully restarted device: %s",
-                            coord.devices[device_id]["name"],
-                        )
-                    except Exception as err:
-                        _LOGGER.error(
-                            "Failed to restart device %s: %s", device_id, err
-                        )
+                return _service_response(call, results)
+
+            async def _restart(
+                coord: OmletDataCoordinator, device_id: str
+            ) -> dict[str, Any] | None:
+                response = await coord.async_execute_action(device_id, "restart")
+                _LOGGER.info(
+                    "Successfully restarted device: %s",
+                    coord.devices[device_id]["name"],
+                )
+                return response
 
-                await coord.async_request_refresh()
+            results = await _run_on_devices(
+                targets, _restart, "Failed to restart device %s: %s"
+            )
 
         except ClientError as err:
             _LOGGER.error("API error while restarting device: %s", err)
         except Exception as err:
             _LOGGER.error("Failed to process restart device command: %s", err)
 
-    async def _fan_action_and_refresh(
-        coord: OmletDataCoordinator, device_id: str, action: str
-    ) -> None:
-        """Execute a fan action (on/off) and refresh state."""
-        await coord.api_client.execute_action(f"device/{device_id}/action/{action}")
-        await coord.async_request_refresh()
-        schedule_followup_refresh(hass, coord, (1.5, 5.0))
+        return _service_response(call, results)
 
-    async def handle_turn_fan_on(call: ServiceCall) -> None:
+    async def handle_turn_fan_on(call: ServiceCall) -> ServiceResponse:
         """Turn fan on immediately."""
+        results: list[dict[str, Any]] = []
         try:
             targets = await _targets(call)
             if not targets:
-                return
+                return _service_response(call, results)
             force_manual = _bool_with_default(call.data.get("force_manual"), True)
-            for coord, ids in targets:
-                for device_id in ids:
-                    if force_manual:
-                        try:
-                            await coord.api_client.patch_device_configuration(
-                                device_id, {"fan": {"mode": "manual"}}
-                            )
-                        except Exception:
-                            # Still attempt turn on even if mode patch fails
-                            pass
-                    await _fan_action_and_refresh(coord, device_id, "on")
+
+            async def _turn_on(
+                coord: OmletDataCoordinator, device_id: str
+            ) -> dict[str, Any] | None:
+                if force_manual:
+                    # "on" is still sent if the mode PATCH fails.
+                    return await coord.async_execute_sequence(
+                        device_id, [(KIND_PATCH, _MANUAL_FAN_PATCH), (KIND_ACTION, "on")]
+                    )
+                return await coord.async_execute_action(device_id, "on", "fan")
+
+            results = await _run_on_devices(
+                targets,
+                _turn_on,
+                "Failed to turn fan on for device %s: %s",
+                converged=lambda data: device_state(data, "fan") in {"on", "boost"},
+                track=("on", {"on", "boost"}, ("fan",)),
+            )
         except Exception as err:
             _LOGGER.error("Failed to turn fan on: %s", err)
 
-    async def handle_turn_fan_off(call: ServiceCall) -> None:
+        return _service_response(call, results)
+
+    async def handle_turn_fan_off(call: ServiceCall) -> ServiceResponse:
         """Turn fan off immediately; optionally force manual mode first."""
+        results: list[dict[str, Any]] = []
         try:
             targets = await _targets(call)
             if not targets:
-                return
+                return _service_response(call, results)
             force_manual = _bool_with_default(call.data.get("force_manual"), True)
-            for coord, ids in targets:
-                for device_id in ids:
-                    if force_manual:
-                        try:
-                            await coord.api_client.patch_device_configuration(
-                                device_id, {"fan": {"mode": "manual"}}
-                            )
-                            # Give Omlet a moment to apply mode changes before turning off.
-                            await asyncio.sleep(0.5)
-                        except Exception:
-                            pass
-                    await _fan_action_and_refresh(coord, device_id, "off")
+
+            async def _turn_off(
+                coord: OmletDataCoordinator, device_id: str
+            ) -> dict[str, Any] | None:
+                if force_manual:
+                    # "off" follows as soon as the mode PATCH has been accepted.
+                    return await coord.async_execute_sequence(
+                        device_id, [(KIND_PATCH, _MANUAL_FAN_PATCH), (KIND_ACTION, "off")]
+                    )
+                return await coord.async_execute_action(device_id, "off", "fan")
+
+            results = await _run_on_devices(
+                targets,
+                _turn_off,
+                "Failed to turn fan off for device %s: %s",
+                converged=lambda data: device_state(data, "fan") == "off",
+                track=("off", {"off"}, ("fan",)),
+            )
         except Exception as err:
             _LOGGER.error("Failed to turn fan off: %s", err)
 
-    async def handle_update_overnight_sleep(call: ServiceCall) -> None:
+        return _service_response(call, results)
+
+    async def handle_update_overnight_sleep(call: ServiceCall) -> ServiceResponse:
         """Handle updating overnight sleep schedule."""
+        results: list[dict[str, Any]] = []
         try:
             targets = await _targets(call)
             if not targets:
-                return
+                return _service_response(call, results)
 
             # Get configuration parameters
             poll_mode = (
@@ -590,36 +881,40 @@ async def async_register_services(
                 }
             }
 
-            for coord, integration_device_ids in targets:
-                for device_id in integration_device_ids:
-                    try:
-                        await coord.api_client.patch_device_configuration(
-                            device_id, updated_config
-                        )
-                        _LOGGER.info(
-                            "Successfully updated overnight sleep for device %s with start: %s, end: %s",
-                            coord.devices[device_id]["name"],
-                            start_time,
-                            end_time,
-                        )
-                    except Exception as err:
-                        _LOGGER.error(
-                            "Failed to update overnight sleep for device %s: %s",
-                            device_id,
-                            err,
-                        )
-
-                await coord.async_request_refresh()
+            async def _update_sleep(
+                coord: OmletDataCoordinator, device_id: str
+            ) -> dict[str, Any] | None:
+                response = await coord.async_patch_configuration(
+                    device_id, updated_config
+                )
+                _LOGGER.info(
+                    "Successfully updated overnight sleep for device %s with start: %s, end: %s",
+                    coord.devices[device_id]["name"],
+                    start_time,
+                    end_time,
+                )
+                return response
+
+            results = await _run_on_devices(
+                targets,
+                _update_sleep,
+                "Failed to update overnight sleep for device %s: %s",
+                # Accepted PATCHes are written through to coordinator data.
+                refresh=False,
+            )
 
         except Exception as err:
             _LOGGER.error("Failed to update overnight sleep: %s", err)
 
-    async def handle_update_door_schedule(call: ServiceCall) -> None:
+        return _service_response(call, results)
+
+    async def handle_update_door_schedule(call: ServiceCall) -> ServiceResponse:
         """Handle updating door schedule."""
+        results: list[dict[str, Any]] = []
         try:
             targets = await _targets(call)
             if not targets:
-                return
+                return _service_response(call, results)
 
             # Validate door mode
             door_mode = call.data[ATTR_DOOR_MODE]
@@ -629,104 +924,114 @@ async def async_register_services(
                     door_mode,
                     ", ".join(VALID_DOOR_MODES),
                 )
-                return
+                return _service_response(call, results)
 
-            for coord, integration_device_ids in targets:
-                for device_id in integration_device_ids:
-                    try:
-                        # Get current configuration for this device
-                        current_config = await coord.api_client.get_device_configuration(device_id)
-                        door_config = current_config.get("door", {})
-
-                        # Apply door mode settings
-                        door_config["openMode"] = door_mode
-                        door_config["closeMode"] = door_mode
-
-                        # Handle time settings if mode is "time"
-                        if door_mode == "time":
-                            if ATTR_OPEN_TIME in call.data:
-                                open_time = call.data[ATTR_OPEN_TIME]
-                                if not isinstance(open_time, str):
-                                    open_time = open_time.strftime("%H:%M")
-                                else:
-                                    open_time_parts = open_time.split(":")
-                                    open_time = (
-                                        f"{open_time_parts[0]:0>2}:{open_time_parts[1]:0>2}"
-                                        if len(open_time_parts) >= 2
-                                        else "00:00"
-                                    )
-                                door_config["openTime"] = open_time
-
-                            if ATTR_CLOSE_TIME in call.data:
-                                close_time = call.data[ATTR_CLOSE_TIME]
-                                if not isinstance(close_time, str):
-                                    close_time = close_time.strftime("%H:%M")
-                                else:
-                                    close_time_parts = close_time.split(":")
-                                    close_time = (
-                                        f"{close_time_parts[0]:0>2}:{close_time_parts[1]:0>2}"
-                                        if len(close_time_parts) >= 2
-                                        else "00:00"
-                                    )
-                                door_config["closeTime"] = close_time
-
-                        # Handle light settings if mode is "light"
-                        elif door_mode == "light":
-                            field_mapping = {
-                                "open_light_level": "openLightLevel",
-                                "close_light_level": "closeLightLevel",
-                                "open_delay": "openDelay",
-                                "close_delay": "closeDelay",
-                            }
-
-                            for service_field, api_field in field_mapping.items():
-                                if service_field in call.data:
-                                    door_config[api_field] = call.data[service_field]
-
-                        # Update configuration for this device
-                        response_data = await coord.api_client.patch_device_configuration(
-                            device_id, {"door": door_config}
-                        )
+            # Door settings to apply; the same for every targeted device.
+            door_updates: dict[str, Any] = {"openMode": door_mode, "closeMode": door_mode}
 
-                        if response_data:
-                            _LOGGER.debug(
-                                "Door schedule update response for device %s: %s",
-                                coord.devices[device_id]["name"],
-                                response_data,
-                            )
-
-                        _LOGGER.info(
-                            "Successfully updated door schedule for device: %s",
-                            coord.devices[device_id]["name"],
+            # Handle time settings if mode is "time"
+            if door_mode == "time":
+                if ATTR_OPEN_TIME in call.data:
+                    open_time = call.data[ATTR_OPEN_TIME]
+                    if not isinstance(open_time, str):
+                        open_time = open_time.strftime("%H:%M")
+                    else:
+                        open_time_parts = open_time.split(":")
+                        open_time = (
+                            f"{open_time_parts[0]:0>2}:{open_time_parts[1]:0>2}"
+                            if len(open_time_parts) >= 2
+                            else "00:00"
                         )
+                    door_updates["openTime"] = open_time
 
-                    except Exception as err:
-                        _LOGGER.error(
-                            "Failed to update door schedule for device %s: %s",
-                            device_id,
-                            err,
+                if ATTR_CLOSE_TIME in call.data:
+                    close_time = call.data[ATTR_CLOSE_TIME]
+                    if not isinstance(close_time, str):
+                        close_time = close_time.strftime("%H:%M")
+                    else:
+                        close_time_parts = close_time.split(":")
+                        close_time = (
+                            f"{close_time_parts[0]:0>2}:{close_time_parts[1]:0>2}"
+                            if len(close_time_parts) >= 2
+                            else "00:00"
                         )
+                    door_updates["closeTime"] = close_time
+
+            # Handle light settings if mode is "light"
+            elif door_mode == "light":
+                field_mapping = {
+                    "open_light_level": "openLightLevel",
+                    "close_light_level": "closeLightLevel",
+                    "open_delay": "openDelay",
+                    "close_delay": "closeDelay",
+                }
+
+                for service_field, api_field in field_mapping.items():
+                    if service_field in call.data:
+                        door_updates[api_field] = call.data[service_field]
+
+            async def _update_door(
+                coord: OmletDataCoordinator, device_id: str
+            ) -> Any:
+                # Diff against the coordinator's copy of the door configuration;
+                # only read it from the API when that copy is stale or missing.
+                current_config = await _async_device_configuration(coord, device_id, ("door",))
+                door_config = current_config.get("door") or {}
+
+                door_patch = configuration_diff(door_config, door_updates)
+                if not door_patch:
+                    _LOGGER.debug(
+                        "Door schedule already up to date for device: %s",
+                        coord.devices[device_id]["name"],
+                    )
+                    return _NO_REQUEST
+
+                # Update only the changed door settings for this device
+                response_data = await coord.async_patch_configuration(
+                    device_id, {"door": door_patch}
+                )
+
+                if response_data:
+                    _LOGGER.debug(
+                        "Door schedule update response for device %s: %s",
+                        coord.devices[device_id]["name"],
+                        response_data,
+                    )
 
-                await coord.async_request_refresh()
+                _LOGGER.info(
+                    "Successfully updated door schedule for device: %s",
+                    coord.devices[device_id]["name"],
+                )
+                return response_data
+
+            results = await _run_on_devices(
+                targets,
+                _update_door,
+                "Failed to update door schedule for device %s: %s",
+                refresh=False,
+            )
 
         except ClientError as err:
             _LOGGER.error("API error while updating door schedule: %s", err)
         except Exception as err:
             _LOGGER.error("Failed to update door schedule: %s", err)
 
-    async def handle_set_fan_mode(call: ServiceCall) -> None:
+        return _service_response(call, results)
+
+    async def handle_set_fan_mode(call: ServiceCall) -> ServiceResponse:
         """Set fan mode (manual/time/thermostatic) and optionally apply mode-specific settings."""
+        results: list[dict[str, Any]] = []
         try:
             targets = await _targets(call)
             if not targets:
-                return
+                return _service_response(call, results)
             mode = (call.data.get("mode") or "").lower()
             # Omlet uses "temperature" for thermostatic mode; accept legacy "thermostatic" too.
             if mode == "thermostatic":
                 mode = "temperature"
             if mode not in {"manual", "time", "temperature"}:
                 _LOGGER.error("Invalid fan mode: %s", mode)
-                return
+                return _service_response(call, results)
             patch: dict[str, Any] = {"mode": mode}
 
             # Manual mode: optional manual speed (Low/Medium/High).
@@ -735,7 +1040,7 @@ async def async_register_services(
                 manual_speed = str(manual_speed).lower()
                 if manual_speed not in FAN_SPEED_MAP:
                     _LOGGER.error("Invalid manual_speed: %s", manual_speed)
-                    return
+                    return _service_response(call, results)
                 patch["manualSpeed"] = FAN_SPEED_MAP[manual_speed]
 
             # Time mode: optional slot config and/or clear.
@@ -769,10 +1074,10 @@ async def async_register_services(
                         slot_i = int(time_slot)
                     except (TypeError, ValueError):
                         _LOGGER.error("Invalid time_slot value: %s", time_slot)
-                        return
+                        return _service_response(call, results)
                     if slot_i not in (1, 2, 3, 4):
                         _LOGGER.error("Invalid time_slot (must be 1-4): %s", time_slot)
-                        return
+                        return _service_response(call, results)
                 else:
                     slot_i = 1
 
@@ -789,7 +1094,7 @@ async def async_register_services(
                     time_speed = str(time_speed).lower()
                     if time_speed not in FAN_SPEED_MAP:
                         _LOGGER.error("Invalid time_speed: %s", time_speed)
-                        return
+                        return _service_response(call, results)
                     patch[f"timeSpeed{slot_i}"] = FAN_SPEED_MAP[time_speed]
 
                 # If the user asked to clear the slot, make sure that wins even if
@@ -800,7 +1105,7 @@ async def async_register_services(
                             clear_i = int(clear_slot_sel)
                         except (TypeError, ValueError):
                             _LOGGER.error("Invalid clear_slot value: %s", clear_slot_sel)
-                            return
+                            return _service_response(call, results)
                         # Accept:
                         # - New behavior: 2-4 are direct API slots
                         # - Legacy behavior: 1-3 map to API slots 2-4
@@ -810,7 +1115,7 @@ async def async_register_services(
                             clear_slot_i = clear_i + 1
                         else:
                             _LOGGER.error("Invalid clear_slot (must be 2-4; legacy 1-3 accepted): %s", clear_slot_sel)
-                            return
+                            return _service_response(call, results)
                     else:
                         clear_slot_i = 2
 
@@ -822,6 +1127,9 @@ async def async_register_services(
 
             # Thermostatic mode (API mode="temperature"): optional temp on/off + speed.
             if mode == "temperature":
+                # Deferred: only thermostatic fan updates convert temperatures.
+                from homeassistant.util.unit_conversion import TemperatureConverter
+
                 if call.data.get("temp_on") is not None:
                     api_val = TemperatureConverter.convert(
                         float(call.data["temp_on"]),
@@ -841,33 +1149,287 @@ async def async_register_services(
                     thermo_speed = str(thermo_speed).lower()
                     if thermo_speed not in FAN_SPEED_MAP:
                         _LOGGER.error("Invalid thermostatic_speed: %s", thermo_speed)
-                        return
+                        return _service_response(call, results)
                     patch["tempSpeed"] = FAN_SPEED_MAP[thermo_speed]
 
             apply_immediately = _bool_with_default(call.data.get("apply_immediately"), True)
-            for coord, ids in targets:
-                for device_id in ids:
-                    await _fan_patch_and_refresh(
-                        hass,
-                        coord,
-                        device_id,
-                        patch,
-                        apply_immediately=apply_immediately,
-                    )
+
+            async def _set_mode(
+                coord: OmletDataCoordinator, device_id: str
+            ) -> dict[str, Any] | None:
+                return await _fan_patch(
+                    coord, device_id, patch, apply_immediately=apply_immediately
+                )
+
+            results = await _run_on_devices(
+                targets,
+                _set_mode,
+                "Failed to set fan mode for device %s: %s",
+                # Fan state after an apply_immediately cycle still needs polling.
+                followup_delays=(1.5, 5.0) if apply_immediately else None,
+                refresh=False,
+            )
         except Exception as err:
             _LOGGER.error("Failed to set fan mode: %s", err)
 
+        return _service_response(call, results)
+
+    async def handle_save_profile(call: ServiceCall) -> None:
+        """Store (or replace) a named fleet configuration profile."""
+        name = str(call.data[ATTR_PROFILE]).strip()
+        if not name:
+            raise ServiceValidationError("Profile name must not be empty")
+        try:
+            profile = validate_profile(
+                {section: call.data.get(section) for section in PROFILE_SECTIONS}
+            )
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+
+        store, profiles = await _async_get_profiles(hass)
+        profiles[name] = profile
+        await store.async_save({"profiles": profiles})
+        _LOGGER.info(
+            "Saved Omlet profile %s with sections: %s", name, ", ".join(profile)
+        )
+
+    async def handle_apply_profile(call: ServiceCall) -> ServiceResponse:
+        """Apply a stored profile to the targeted devices, or report drift only."""
+        results: list[dict[str, Any]] = []
+        name = str(call.data[ATTR_PROFILE]).strip()
+        check_mode = _bool_with_default(call.data.get(ATTR_CHECK_MODE), False)
+        _store, profiles = await _async_get_profiles(hass)
+        profile = profiles.get(name)
+        if profile is None:
+            raise ServiceValidationError(f"Unknown Omlet profile: {name}")
+
+        try:
+            targets = await _targets(call)
+            if not targets:
+                return _service_response(call, results)
+
+            drift: dict[str, dict[str, Any]] = {}
+
+            async def _apply(coord: OmletDataCoordinator, device_id: str) -> Any:
+                configuration = await _async_device_configuration(
+                    coord, device_id, tuple(profile)
+                )
+                device_drift = drift[device_id] = configuration_drift(configuration, profile)
+                if not device_drift:
+                    return _NO_REQUEST
+                if check_mode:
+                    _LOGGER.info(
+                        "Device %s drifts from profile %s in: %s",
+                        coord.devices[device_id]["name"],
+                        name,
+                        ", ".join(device_drift),
+                    )
+                    return _NO_REQUEST
+                # Send only the changed keys of the changed sections.
+                patch = {
+                    section: {key: change["desired"] for key, change in changes.items()}
+                    for section, changes in device_drift.items()
+                }
+                response = await coord.async_patch_configuration(device_id, patch)
+                _LOGGER.info(
+                    "Applied profile %s to device %s (sections: %s)",
+                    name,
+                    coord.devices[device_id]["name"],
+                    ", ".join(patch),
+                )
+                return response
+
+            results = await _run_on_devices(
+                targets,
+                _apply,
+                f"Failed to apply profile {name} to device %s: %s",
+                refresh=False,
+            )
+            for result in results:
+                result["drift"] = drift.get(result["device_id"])
+
+        except Exception as err:
+            _LOGGER.error("Failed to apply profile %s: %s", name, err)
+
+        return _service_response(call, results)
+
+    async def _fleet_targets(call: ServiceCall) -> list[tuple[OmletDataCoordinator, list[str]]]:
+        """Return the call's targets, or every device if none were given."""
+        if any(call.data.get(key) for key in _TARGET_KEYS):
+            return await _targets(call)
+        return _all_device_targets(hass)
+
+    async def handle_snapshot_configuration(call: ServiceCall) -> ServiceResponse:
+        """Capture the configuration of the targeted (or all) devices."""
+        results: list[dict[str, Any]] = []
+        label = str(call.data.get(ATTR_SNAPSHOT) or "").strip() or None
+        try:
+            targets = await _fleet_targets(call)
+            if not targets:
+                return _service_response(call, results)
+
+            configurations: dict[str, Any] = {}
+
+            async def _read(coord: OmletDataCoordinator, device_id: str) -> Any:
+                configurations[device_id] = await _async_device_configuration(
+                    coord, device_id, ()
+                )
+                return _NO_REQUEST
+
+            results = await _run_on_devices(
+                targets,
+                _read,
+                "Failed to read configuration of device %s: %s",
+                refresh=False,
+            )
+            store, library = await _async_get_snapshots(hass)
+            snapshot_id, added = library.capture(
+                configurations, name=label, created=dt_util.utcnow().isoformat()
+            )
+            await store.async_save(library.as_dict())
+            _LOGGER.info(
+                "%s configuration snapshot %s (%s) of %d devices",
+                "Saved" if added else "Unchanged since",
+                snapshot_id,
+                label or "unnamed",
+                len(configurations),
+            )
+            return _service_response(call, results, snapshot_id=snapshot_id, added=added)
+        except Exception as err:
+            _LOGGER.error("Failed to snapshot configuration: %s", err)
+
+        return _service_response(call, results)
+
+    async def handle_restore_configuration(call: ServiceCall) -> ServiceResponse:
+        """Restore the targeted (or all) devices from a configuration snapshot."""
+        results: list[dict[str, Any]] = []
+        key = str(call.data.get(ATTR_SNAPSHOT) or "").strip() or None
+        _store, library = await _async_get_snapshots(hass)
+        snapshot = library.get(key)
+        if snapshot is None:
+            raise ServiceValidationError(
+                f"Unknown Omlet configuration snapshot: {key}" if key
+                else "No Omlet configuration snapshots have been taken"
+            )
+
+        try:
+            targets = [
+                (coord, [device_id for device_id in ids if device_id in snapshot])
+                for coord, ids in await _fleet_targets(call)
+            ]
+            targets = [(coord, ids) for coord, ids in targets if ids]
+            if not targets:
+                _LOGGER.warning("None of the targeted devices are in snapshot %s", key)
+                return _service_response(call, results)
+
+            async def _restore(coord: OmletDataCoordinator, device_id: str) -> Any:
+                desired = snapshot[device_id]
+                configuration = await _async_device_configuration(
+                    coord, device_id, tuple(desired)
+                )
+                patch = configuration_patch(configuration, desired)
+                if not patch:
+                    return _NO_REQUEST
+                response = await coord.async_patch_configuration(device_id, patch)
+                _LOGGER.info(
+                    "Restored configuration of device %s (sections: %s)",
+                    coord.devices[device_id]["name"],
+                    ", ".join(patch),
+                )
+                return response
+
+            results = await _run_on_devices(
+                targets,
+                _restore,
+                "Failed to restore configuration of device %s: %s",
+                refresh=False,
+            )
+        except Exception as err:
+            _LOGGER.error("Failed to restore configuration: %s", err)
+
+        return _service_response(call, results)
+
+    async def handle_replay_webhook_events(call: ServiceCall) -> ServiceResponse:
+        """Feed journaled webhook events back through the webhook handler."""
+        limit = call.data.get(ATTR_LIMIT)
+        limit = None if limit is None else int(limit)
+        realtime = _bool_with_default(call.data.get(ATTR_REALTIME), False)
+        results: list[dict[str, Any]] = []
+        for coord in _iter_coordinators(hass):
+            entry = coord.config_entry
+            # Replays are measured separately so live webhook metrics stay clean.
+            metrics = WebhookMetrics()
+            handler = create_omlet_webhook_handler(
+                entry, coord, metrics=metrics, replay=True
+            )
+            try:
+                counts = await replay_webhook_events(
+                    hass,
+                    handler,
+                    entry.data.get(CONF_WEBHOOK_ID) or "replay",
+                    coord.webhook_journal.events(limit),
+                    token=get_expected_webhook_token(entry),
+                    realtime=realtime,
+                )
+            except Exception as err:
+                _LOGGER.error("Failed to replay Omlet webhook events: %s", err)
+                continue
+            _LOGGER.info(
+                "Replayed %d journaled Omlet webhook events for %s (%d accepted)",
+                counts["replayed"],
+                entry.title,
+                counts["accepted"],
+            )
+            results.append(
+                {
+                    "entry_id": entry.entry_id,
+                    "title": entry.title,
+                    **counts,
+                    "metrics": metrics.as_dict(),
+                }
+            )
+        if not call.return_response:
+            return None
+        return {"entries": results}
+
+    async def handle_capture_trace(call: ServiceCall) -> ServiceResponse:
+        """Start (or stop) capturing /device responses and webhook payloads."""
+        stop = _bool_with_default(call.data.get(ATTR_STOP), False)
+        duration = float(call.data.get(ATTR_DURATION) or TRACE_DEFAULT_DURATION)
+        stamp = dt_util.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        results: list[dict[str, Any]] = []
+        for coord in _iter_coordinators(hass):
+            entry = coord.config_entry
+            if stop:
+                summary = await coord.async_stop_trace()
+                results.append({"entry_id": entry.entry_id, "stopped": summary})
+                continue
+            path = hass.config.path(TRACE_DIR, f"{entry.entry_id}-{stamp}.jsonl")
+            coord.async_start_trace(path, duration)
+            results.append({"entry_id": entry.entry_id, "path": path, "duration": duration})
+        if not call.return_response:
+            return None
+        return {"entries": results}
+
     # Register all services (idempotent)
-    _register(SERVICE_OPEN_DOOR, handle_open_door)
-    _register(SERVICE_CLOSE_DOOR, handle_close_door)
-    _register(SERVICE_RESTART_DEVICE, handle_restart_device)
-    _register(SERVICE_UPDATE_OVERNIGHT_SLEEP, handle_update_overnight_sleep)
-    _register(SERVICE_UPDATE_DOOR_SCHEDULE, handle_update_door_schedule)
+    # Device commands can return per-device results (status, latency, converged).
+    optional = SupportsResponse.OPTIONAL
+    _register(SERVICE_OPEN_DOOR, handle_open_door, optional)
+    _register(SERVICE_CLOSE_DOOR, handle_close_door, optional)
+    _register(SERVICE_RESTART_DEVICE, handle_restart_device, optional)
+    _register(SERVICE_UPDATE_OVERNIGHT_SLEEP, handle_update_overnight_sleep, optional)
+    _register(SERVICE_UPDATE_DOOR_SCHEDULE, handle_update_door_schedule, optional)
     _register(SERVICE_SHOW_WEBHOOK_URL, handle_show_webhook_url)
     _register("regenerate_webhook_id", handle_regenerate_webhook_id)
-    _register("turn_fan_on", handle_turn_fan_on)
-    _register("turn_fan_off", handle_turn_fan_off)
-    _register("set_fan_mode", handle_set_fan_mode)
+    _register("turn_fan_on", handle_turn_fan_on, optional)
+    _register("turn_fan_off", handle_turn_fan_off, optional)
+    _register("set_fan_mode", handle_set_fan_mode, optional)
+    _register(SERVICE_SAVE_PROFILE, handle_save_profile)
+    _register(SERVICE_APPLY_PROFILE, handle_apply_profile, optional)
+    _register(SERVICE_SNAPSHOT_CONFIGURATION, handle_snapshot_configuration, optional)
+    _register(SERVICE_RESTORE_CONFIGURATION, handle_restore_configuration, optional)
+    _register(SERVICE_REPLAY_WEBHOOK_EVENTS, handle_replay_webhook_events, optional)
+    _register(SERVICE_CAPTURE_TRACE, handle_capture_trace, optional)
     domain_bucket["_services_registered"] = True
 
 
@@ -883,6 +1445,12 @@ def async_remove_services(hass: HomeAssistant) -> None:
         "turn_fan_on",
         "turn_fan_off",
         "set_fan_mode",
+        SERVICE_SAVE_PROFILE,
+        SERVICE_APPLY_PROFILE,
+        SERVICE_SNAPSHOT_CONFIGURATION,
+        SERVICE_RESTORE_CONFIGURATION,
+        SERVICE_REPLAY_WEBHOOK_EVENTS,
+        SERVICE_CAPTURE_TRACE,
     ]:
         hass.services.async_remove(DOMAIN, service)
     try:
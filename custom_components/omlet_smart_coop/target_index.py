@@ -0,0 +1,164 @@
+"""Domain-wide index used to resolve service call targets to Omlet devices.
+
+This module intentionally avoids Home Assistant imports so it can be loaded
+directly by tests and benchmarks. services.py owns the single instance, feeds it
+from the device/entity registries and the coordinators, and invalidates it on
+registry update events; it also rebuilds when a coordinator's deviceIds change.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any
+
+
+class DeviceTargetIndex:
+    """Map HA device ids and entity ids to (owner, Omlet deviceId) pairs.
+
+    The owner is whatever holds the devices (a coordinator); devices_of(owner)
+    returns its current {deviceId: device_data} and is read at use, since
+    owners replace that mapping on every refresh. Resolving a call is one
+    lookup per target instead of scanning every device of every owner for
+    every target.
+    """
+
+    def __init__(
+        self, devices_of: Callable[[Any], Mapping[str, Mapping[str, Any]]]
+    ) -> None:
+        self._devices_of = devices_of
+        self._dirty = True
+        self._owners: tuple[Any, ...] = ()
+        # deviceIds of each owner at the last rebuild.
+        self._device_ids: tuple[frozenset[str], ...] = ()
+        # Omlet deviceSerial/deviceId -> one (owner, deviceId) per owner.
+        self._by_identifier: dict[str, list[tuple[Any, str]]] = {}
+        # HA device id -> matched (owner, deviceId) pairs; [] caches a miss.
+        self._by_ha_device: dict[str, list[tuple[Any, str]]] = {}
+        # entity_id -> HA device id; None caches an entity without a device.
+        self._ha_device_by_entity: dict[str, str | None] = {}
+
+    def invalidate(self) -> None:
+        """Force a rebuild before the next resolve."""
+        self._dirty = True
+
+    def needs_rebuild(self, owners: Sequence[Any]) -> bool:
+        """Return True if invalidated or the owners or their deviceIds changed."""
+        if self._dirty or len(owners) != len(self._owners):
+            return True
+        return any(
+            new is not old or self._devices_of(new).keys() != device_ids
+            for new, old, device_ids in zip(owners, self._owners, self._device_ids)
+        )
+
+    def rebuild(
+        self,
+        owners: Sequence[Any],
+        ha_devices: Iterable[tuple[str, Iterable[str]]],
+        entities: Iterable[tuple[str, str | None]],
+    ) -> None:
+        """Rebuild from coordinators and the registries.
+
+        ha_devices is (HA device id, Omlet identifiers) and entities is
+        (entity_id, HA device id) for the integration's registry entries.
+        """
+        self._owners = tuple(owners)
+        owner_devices = [(owner, self._devices_of(owner)) for owner in self._owners]
+        self._device_ids = tuple(frozenset(devices) for _owner, devices in owner_devices)
+        self._by_identifier = {}
+        for owner, devices in owner_devices:
+            for dev_id, dev_data in devices.items():
+                for identifier in (dev_data.get("deviceSerial"), dev_data.get("deviceId")):
+                    if not identifier:
+                        continue
+                    matches = self._by_identifier.setdefault(identifier, [])
+                    # First device of an owner wins, as in the registry lookup.
+                    if all(match_owner is not owner for match_owner, _ in matches):
+                        matches.append((owner, dev_id))
+        self._by_ha_device = {
+            ha_device_id: self._match_identifiers(identifiers)
+            for ha_device_id, identifiers in ha_devices
+        }
+        self._ha_device_by_entity = dict(entities)
+        self._dirty = False
+
+    def _match_identifiers(self, identifiers: Iterable[str]) -> list[tuple[Any, str]]:
+        """Return the distinct (owner, deviceId) pairs for Omlet identifiers."""
+        matches: list[tuple[Any, str]] = []
+        for identifier in identifiers:
+            for match in self._by_identifier.get(identifier, ()):
+                if match not in matches:
+                    matches.append(match)
+        return matches
+
+    def _collect(
+        self,
+        ha_device_ids: Iterable[str],
+        out: dict[Any, list[str]],
+        device_identifiers: Callable[[str], Iterable[str]] | None,
+    ) -> None:
+        for ha_device_id in ha_device_ids:
+            matches = self._by_ha_device.get(ha_device_id)
+            if matches is None:
+                matches = []
+                if device_identifiers is not None:
+                    matches = self._match_identifiers(device_identifiers(ha_device_id))
+                self._by_ha_device[ha_device_id] = matches
+            for owner, dev_id in matches:
+                ids = out.setdefault(owner, [])
+                if dev_id not in ids:
+                    ids.append(dev_id)
+
+    def _entity_device_id(
+        self,
+        entity_id: str,
+        entity_device_id: Callable[[str], str | None] | None,
+    ) -> str | None:
+        if entity_id in self._ha_device_by_entity:
+            return self._ha_device_by_entity[entity_id]
+        ha_device_id = entity_device_id(entity_id) if entity_device_id else None
+        self._ha_device_by_entity[entity_id] = ha_device_id
+        return ha_device_id
+
+    def resolve(
+        self,
+        ha_device_ids: Iterable[str],
+        entity_ids: Iterable[str],
+        device_name: str | None = None,
+        *,
+        device_identifiers: Callable[[str], Iterable[str]] | None = None,
+        entity_device_id: Callable[[str], str | None] | None = None,
+    ) -> list[tuple[Any, list[str]]]:
+        """Resolve call targets to [(owner, [deviceId, ...])] in owner order.
+
+        For each owner, explicit device targets win; entity targets are used only
+        if they matched none of its devices, then the device name. Targets not
+        in the index are looked up once through device_identifiers /
+        entity_device_id and the result is cached until the next rebuild.
+        """
+        by_owner: dict[Any, list[str]] = {}
+        self._collect(ha_device_ids, by_owner, device_identifiers)
+
+        if entity_ids and len(by_owner) < len(self._owners):
+            entity_hits: dict[Any, list[str]] = {}
+            self._collect(
+                (
+                    ha_device_id
+                    for entity_id in entity_ids
+                    if (ha_device_id := self._entity_device_id(entity_id, entity_device_id))
+                ),
+                entity_hits,
+                device_identifiers,
+            )
+            for owner, ids in entity_hits.items():
+                by_owner.setdefault(owner, ids)
+
+        if device_name and len(by_owner) < len(self._owners):
+            for owner in self._owners:
+                if owner in by_owner:
+                    continue
+                for dev_id, dev_data in self._devices_of(owner).items():
+                    if dev_data.get("name") == device_name:
+                        by_owner[owner] = [dev_id]
+                        break
+
+        return [(owner, by_owner[owner]) for owner in self._owners if owner in by_owner]
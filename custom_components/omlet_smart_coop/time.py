@@ -8,8 +8,13 @@ from homeassistant.helpers.entity_registry import async_get as async_get_entity_
 from homeassistant.helpers.entity import EntityCategory
 
 from .const import DOMAIN
-from .entity import OmletEntity, build_entity_unique_id, should_add_entity
-from .fan_helpers import iter_fan_devices, parse_hhmm, format_hhmm
+from .entity import (
+    OmletEntity,
+    async_setup_device_entities,
+    build_entity_unique_id,
+    should_add_entity,
+)
+from .fan_helpers import parse_hhmm, format_hhmm
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,8 +22,10 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass, config_entry, async_add_entities):
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
 
-    entities: list[TimeEntity] = []
-    for device_id, device_data in iter_fan_devices(coordinator):
+    def _build_entities(device_id, device_data):
+        if not coordinator.get_capabilities(device_id).fan:
+            return []
+        entities: list[TimeEntity] = []
         name = device_data.get("name") or device_id
         if should_add_entity(
             hass,
@@ -47,8 +54,11 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                 build_entity_unique_id(device_data, device_id, cfg_key),
             ):
                 entities.append(cls(coordinator, device_id, name))
+        return entities
 
-    async_add_entities(entities)
+    async_setup_device_entities(
+        hass, config_entry, coordinator, async_add_entities, _build_entities
+    )
 
 
 class _OmletFanTimeBase(OmletEntity, TimeEntity):
@@ -74,11 +84,10 @@ class _OmletFanTimeBase(OmletEntity, TimeEntity):
         return parse_hhmm(self._fan_cfg().get(self._CFG_KEY))
 
     async def async_set_value(self, value: dt_time) -> None:
-        await self.coordinator.api_client.patch_device_configuration(
+        await self.coordinator.async_patch_configuration(
             self.current_device_id,
             {"fan": {self._CFG_KEY: format_hhmm(value)}},
         )
-        await self.coordinator.async_request_refresh()
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
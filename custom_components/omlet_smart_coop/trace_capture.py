@@ -0,0 +1,99 @@
+"""Capture of Omlet API traffic into a JSON Lines trace for offline replay.
+
+This module intentionally avoids Home Assistant imports so it can be loaded
+directly by tests and by scripts/replay_trace.py. While a capture runs, the
+coordinator records every /device response and the raw body of every
+accepted webhook (with the source of its token), redacted and timestamped;
+batches are written by an executor job like the webhook journal.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Collection, Iterator
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+TRACE_KIND_DEVICES = "devices"
+TRACE_KIND_WEBHOOK = "webhook"
+DEFAULT_MAX_RECORDS = 5000
+# Same marker as homeassistant.components.diagnostics.async_redact_data.
+REDACTED = "**REDACTED**"
+
+
+def redact(data: Any, keys: Collection[str]) -> Any:
+    """Return a copy of data with the values of keys redacted, at any depth."""
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if key in keys and value is not None else redact(value, keys)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [redact(item, keys) for item in data]
+    return data
+
+
+class TraceRecorder:
+    """Collect redacted trace records and append them to a file in batches."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        redact_keys: Collection[str],
+        *,
+        max_records: int = DEFAULT_MAX_RECORDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self._redact_keys = frozenset(redact_keys)
+        self._max_records = max_records
+        self._clock = clock
+        self._pending: list[str] = []
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+
+    def record(self, kind: str, data: Any) -> bool:
+        """Queue one record; False once the record cap is reached."""
+        if self.recorded >= self._max_records:
+            self.dropped += 1
+            return False
+        record = {"t": self._clock(), "kind": kind, "data": redact(data, self._redact_keys)}
+        self._pending.append(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+        self.recorded += 1
+        return True
+
+    def take_batch(self) -> list[str]:
+        """Hand the pending (serialized) records to the writer."""
+        batch, self._pending = self._pending, []
+        return batch
+
+    def write(self, batch: list[str]) -> None:
+        """Append serialized records to the trace file (blocking I/O)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as file:
+            file.writelines(batch)
+        self.written += len(batch)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace path and counters."""
+        return {
+            "path": str(self.path),
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+
+def read_trace(path: str | os.PathLike[str]) -> Iterator[dict[str, Any]]:
+    """Yield the records of a trace file in order, skipping unreadable lines."""
+    with Path(path).open(encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "kind" in record:
+                yield record
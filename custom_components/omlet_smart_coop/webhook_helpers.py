@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import asyncio
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable, Iterable, Mapping
 from dataclasses import dataclass
+import hmac
 from ipaddress import ip_address
 import logging
 import secrets
+import time
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
@@ -31,7 +35,23 @@ _TOKEN_HEADER_KEYS = (
     "X-Auth-Token",
 )
 _TOKEN_QUERY_KEYS = ("token", "secret", "webhook_token")
+_TOKEN_PAYLOAD_KEYS = ("token", "secret", "webhook_token", "webhookToken")
 _AUTH_SCHEMES = ("bearer", "token", "apikey", "api-key")
+# Every token source, in the order get_provided_webhook_token_details tries them.
+_TOKEN_SOURCES = (
+    "header:Authorization",
+    *(f"header:{key}" for key in _TOKEN_HEADER_KEYS),
+    *(f"payload:{key}" for key in _TOKEN_PAYLOAD_KEYS),
+    *(f"payload.payload:{key}" for key in _TOKEN_PAYLOAD_KEYS),
+    *(f"query:{key}" for key in _TOKEN_QUERY_KEYS),
+)
+_TOKEN_SOURCE_RANK = {source: rank for rank, source in enumerate(_TOKEN_SOURCES)}
+
+# Upper bounds (ms) of the latency histogram buckets; one more bucket is open.
+_HANDLER_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+_UPDATE_BUCKETS_MS = (250, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+# Event fields sent back to the handler when replaying journaled webhooks.
+_REPLAY_FIELDS = ("deviceId", "parameterName", "oldValue", "newValue")
 
 
 @dataclass(frozen=True)
@@ -55,6 +75,107 @@ class WebhookUrlInfo:
         return self.warning is None
 
 
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; recording a sample allocates nothing."""
+
+    __slots__ = ("bounds", "counts", "count", "total_ms", "max_ms")
+
+    def __init__(self, bounds_ms: Iterable[float]) -> None:
+        self.bounds = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float) -> None:
+        """Add one sample."""
+        self.counts[bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket holding the given fraction of samples."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if index < len(self.bounds):
+                    return float(min(self.bounds[index], self.max_ms))
+                break
+        return self.max_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary and bucket counts for diagnostics."""
+        buckets = {f"<={bound}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets[f">{self.bounds[-1]}"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "max_ms": round(self.max_ms, 1),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": buckets,
+        }
+
+
+class WebhookMetrics:
+    """Counters and latency histograms for one entry's webhook handler."""
+
+    __slots__ = (
+        "clock",
+        "received",
+        "accepted",
+        "rejected",
+        "non_json",
+        "errors",
+        "handler",
+        "update",
+        "_pending_since",
+    )
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.received = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.non_json = 0
+        self.errors = 0
+        # Request in -> response out.
+        self.handler = LatencyHistogram(_HANDLER_BUCKETS_MS)
+        # Webhook accepted -> coordinator listeners notified with fresh data.
+        self.update = LatencyHistogram(_UPDATE_BUCKETS_MS)
+        self._pending_since: float | None = None
+
+    def update_pending(self) -> None:
+        """Mark that a webhook refresh was requested; the earliest one is timed."""
+        if self._pending_since is None:
+            self._pending_since = self.clock()
+
+    def entities_updated(self) -> None:
+        """Record webhook-to-update latency if a webhook refresh was pending."""
+        if self._pending_since is not None:
+            self.update.record((self.clock() - self._pending_since) * 1000)
+            self._pending_since = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return counters and histograms for diagnostics."""
+        return {
+            "received": self.received,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "non_json": self.non_json,
+            "errors": self.errors,
+            "handler_latency": self.handler.as_dict(),
+            "update_latency": self.update.as_dict(),
+        }
+
+
 def _normalize_token(value: Any) -> str | None:
     """Normalize a token value by trimming whitespace and coercing to str."""
     if value is None:
@@ -81,6 +202,92 @@ def get_expected_webhook_token(entry: ConfigEntry) -> str | None:
     return None
 
 
+def _authorization_token(auth_header: Any) -> str | None:
+    """Return the token from an Authorization header, without its scheme."""
+    if not auth_header:
+        return None
+    auth_value = str(auth_header).strip()
+    if " " in auth_value:
+        scheme, value = auth_value.split(" ", 1)
+        if scheme.lower() in _AUTH_SCHEMES:
+            auth_value = value.strip()
+    return _normalize_token(auth_value)
+
+
+def _token_from_source(source: str, request: Request, payload: Any) -> str | None:
+    """Read the token from one source as named in WebhookTokenDetails.source."""
+    kind, _, key = source.partition(":")
+    if kind == "header":
+        headers = getattr(request, "headers", {}) or {}
+        if key == "Authorization":
+            return _authorization_token(_get_mapping_value(headers, key))
+        return _normalize_token(_get_mapping_value(headers, key))
+    if kind == "query":
+        return _normalize_token(_get_mapping_value(getattr(request, "query", {}) or {}, key))
+    if not isinstance(payload, dict):
+        return None
+    if kind == "payload.payload":
+        payload = payload.get("payload")
+        if not isinstance(payload, dict):
+            return None
+    return _normalize_token(payload.get(key))
+
+
+class WebhookTokenVerifier:
+    """Check webhook tokens against the entry's configured token.
+
+    The expected token is resolved once and kept until invalidate() (the
+    options update listener calls it). The source the last accepted token
+    came from is tried first and accepted only if no higher-priority source
+    carries a token, so the result is always that of the full scan in the
+    usual order, which runs otherwise.
+    """
+
+    def __init__(self, entry: ConfigEntry) -> None:
+        self._entry = entry
+        self._resolved = False
+        self._expected: bytes | None = None
+        self._last_source: str | None = None
+        self.fast_hits = 0
+
+    @property
+    def expected(self) -> bytes | None:
+        """Return the configured token (encoded), resolving it on first use."""
+        if not self._resolved:
+            token = get_expected_webhook_token(self._entry)
+            self._expected = None if token is None else token.encode()
+            self._resolved = True
+        return self._expected
+
+    def invalidate(self) -> None:
+        """Forget the cached token and learned source after an options change."""
+        self._resolved = False
+        self._expected = None
+        self._last_source = None
+
+    def _matches(self, token: str | None) -> bool:
+        return token is not None and hmac.compare_digest(token.encode(), self._expected)
+
+    def verify(self, request: Request, payload: Any) -> tuple[bool, WebhookTokenDetails]:
+        """Return whether the request carries the expected token, and where from."""
+        if self.expected is None:
+            return True, WebhookTokenDetails(token=None, source=None)
+        source = self._last_source
+        if source is not None:
+            token = _token_from_source(source, request, payload)
+            if self._matches(token) and not any(
+                _token_from_source(higher, request, payload)
+                for higher in _TOKEN_SOURCES[: _TOKEN_SOURCE_RANK[source]]
+            ):
+                self.fast_hits += 1
+                return True, WebhookTokenDetails(token=token, source=source)
+        details = get_provided_webhook_token_details(request, payload)
+        if not self._matches(details.token):
+            return False, details
+        self._last_source = details.source
+        return True, details
+
+
 def get_provided_webhook_token(request: Request, payload: dict[str, Any] | None) -> str | None:
     """Extract a webhook token from headers, payload, or query params."""
     return get_provided_webhook_token_details(request, payload).token
@@ -93,16 +300,9 @@ def get_provided_webhook_token_details(
     headers = getattr(request, "headers", {}) or {}
     query = getattr(request, "query", {}) or {}
 
-    auth_header = _get_mapping_value(headers, "Authorization")
-    if auth_header:
-        auth_value = str(auth_header).strip()
-        if " " in auth_value:
-            scheme, value = auth_value.split(" ", 1)
-            if scheme.lower() in _AUTH_SCHEMES:
-                auth_value = value.strip()
-        token = _normalize_token(auth_value)
-        if token:
-            return WebhookTokenDetails(token=token, source="header:Authorization")
+    token = _authorization_token(_get_mapping_value(headers, "Authorization"))
+    if token:
+        return WebhookTokenDetails(token=token, source="header:Authorization")
     for header in _TOKEN_HEADER_KEYS:
         token = _normalize_token(_get_mapping_value(headers, header))
         if token:
@@ -114,7 +314,7 @@ def get_provided_webhook_token_details(
             payload_candidates.append(nested_payload)
         for index, candidate in enumerate(payload_candidates):
             source_prefix = "payload" if index == 0 else "payload.payload"
-            for key in ("token", "secret", "webhook_token", "webhookToken"):
+            for key in _TOKEN_PAYLOAD_KEYS:
                 token = _normalize_token(candidate.get(key))
                 if token:
                     return WebhookTokenDetails(
@@ -177,11 +377,37 @@ def create_omlet_webhook_handler(
     *,
     response_factory: Callable[..., Any] | None = None,
     logger: logging.Logger | None = None,
+    metrics: WebhookMetrics | None = None,
+    replay: bool = False,
 ) -> Callable[[HomeAssistant, str, Request], Any]:
-    """Create the shared Omlet webhook handler."""
+    """Create the shared Omlet webhook handler.
+
+    Counters and latencies go to metrics, by default the coordinator's
+    webhook_metrics. Tokens are checked by the coordinator's webhook_tokens
+    verifier, when it has one. A replay handler feeds journaled events back
+    without journaling or tracing them again or counting them as webhook
+    deliveries; it checks tokens with a verifier of its own, so replays do not
+    change which source live webhooks are checked at first. Accepted live
+    requests are passed, body unparsed, to the coordinator's
+    async_trace_webhook before the event is extracted.
+    """
     log = logger or _LOGGER
+    if metrics is None:
+        metrics = getattr(coordinator, "webhook_metrics", None) or WebhookMetrics()
+    tokens = (
+        None if replay else getattr(coordinator, "webhook_tokens", None)
+    ) or WebhookTokenVerifier(entry)
+    trace_webhook = None if replay else getattr(coordinator, "async_trace_webhook", None)
 
     async def _handle_webhook(hass: HomeAssistant, webhook_id_recv: str, request: Request):
+        started = metrics.clock()
+        metrics.received += 1
+        try:
+            return await _process_webhook(hass, webhook_id_recv, request)
+        finally:
+            metrics.handler.record((metrics.clock() - started) * 1000)
+
+    async def _process_webhook(hass: HomeAssistant, webhook_id_recv: str, request: Request):
         payload: Any = None
         token_details = WebhookTokenDetails(token=None, source=None)
         hook_suffix = webhook_id_suffix(webhook_id_recv)
@@ -190,6 +416,7 @@ def create_omlet_webhook_handler(
             try:
                 payload = await request.json()
             except Exception as err:
+                metrics.non_json += 1
                 log.debug(
                     "Omlet webhook %s received non-JSON payload; accepting for refresh: %s",
                     hook_suffix,
@@ -197,36 +424,42 @@ def create_omlet_webhook_handler(
                 )
 
             payload_shape = get_webhook_payload_shape(payload)
-            expected = get_expected_webhook_token(entry)
-            if expected:
-                token_details = get_provided_webhook_token_details(request, payload)
-                if token_details.token != expected:
-                    log.warning(
-                        "Rejected Omlet webhook %s: invalid token "
-                        "(payload_shape=%s, token_source=%s)",
-                        hook_suffix,
-                        payload_shape,
-                        token_details.source or "missing",
-                    )
-                    return _make_response(
-                        response_factory,
-                        status=401,
-                        text="invalid token",
-                    )
+            accepted, token_details = tokens.verify(request, payload)
+            if not accepted:
+                metrics.rejected += 1
+                log.warning(
+                    "Rejected Omlet webhook %s: invalid token "
+                    "(payload_shape=%s, token_source=%s)",
+                    hook_suffix,
+                    payload_shape,
+                    token_details.source or "missing",
+                )
+                return _make_response(
+                    response_factory,
+                    status=401,
+                    text="invalid token",
+                )
 
+            metrics.accepted += 1
+            if trace_webhook is not None:
+                try:
+                    trace_webhook(payload, token_details.source)
+                except Exception as err:
+                    log.debug("Failed to trace Omlet webhook %s: %r", hook_suffix, err)
             event = extract_webhook_event(payload)
             log.debug(
                 "Accepted Omlet webhook %s: payload_shape=%s token_source=%s "
                 "device=%s param=%s old=%s new=%s",
                 hook_suffix,
                 payload_shape,
-                token_details.source if expected else "not-required",
+                token_details.source if tokens.expected else "not-required",
                 event.get("deviceId"),
                 event.get("parameterName"),
                 event.get("oldValue"),
                 event.get("newValue"),
             )
         except Exception:
+            metrics.errors += 1
             log.exception(
                 "Error validating Omlet webhook %s; accepting request to avoid retries",
                 hook_suffix,
@@ -240,10 +473,18 @@ def create_omlet_webhook_handler(
             )
             return _make_response(response_factory, text="ok")
 
+        record_webhook = None if replay else getattr(coordinator, "async_webhook_received", None)
+        if record_webhook is not None:
+            try:
+                record_webhook(event, token_details.source)
+            except Exception as err:
+                log.debug("Failed to record Omlet webhook %s: %r", hook_suffix, err)
+
         refresh_task = None
         try:
             refresh_task = coordinator.async_request_refresh()
             hass.async_create_task(refresh_task)
+            metrics.update_pending()
             log.debug("Scheduled Omlet webhook refresh for webhook %s", hook_suffix)
         except Exception as err:
             if hasattr(refresh_task, "close"):
@@ -258,6 +499,53 @@ def create_omlet_webhook_handler(
     return _handle_webhook
 
 
+class ReplayRequest:
+    """Minimal stand-in request carrying a journaled event back into the handler."""
+
+    def __init__(self, payload: dict[str, Any], token: str | None = None) -> None:
+        self._payload = payload
+        self.headers = {"X-Omlet-Token": token} if token else {}
+        self.query: dict[str, str] = {}
+
+    async def json(self) -> dict[str, Any]:
+        return self._payload
+
+
+async def replay_webhook_events(
+    hass: HomeAssistant,
+    handler: Callable[[HomeAssistant, str, Any], Awaitable[Any]],
+    webhook_id: str,
+    records: Iterable[Mapping[str, Any]],
+    *,
+    token: str | None = None,
+    realtime: bool = False,
+    max_gap: float = 60.0,
+    sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+) -> dict[str, int]:
+    """Feed journaled events through a webhook handler, oldest first.
+
+    With realtime, the original gaps between events are kept (each capped at
+    max_gap seconds); otherwise events are replayed back to back. Returns how
+    many events were replayed and how many the handler accepted.
+    """
+    replayed = accepted = 0
+    previous: float | None = None
+    for record in records:
+        received = record.get("received")
+        if realtime and isinstance(received, (int, float)):
+            if previous is not None:
+                await sleep(min(max_gap, max(0.0, received - previous)))
+            previous = received
+        payload = {
+            field: record[field] for field in _REPLAY_FIELDS if record.get(field) is not None
+        }
+        response = await handler(hass, webhook_id, ReplayRequest(payload, token))
+        replayed += 1
+        if getattr(response, "status", 200) == 200:
+            accepted += 1
+    return {"replayed": replayed, "accepted": accepted}
+
+
 def unregister_omlet_webhook(hass: HomeAssistant, webhook_id: str | None) -> None:
     """Unregister an Omlet webhook ID if present."""
     if not webhook_id:
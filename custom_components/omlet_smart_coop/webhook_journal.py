@@ -0,0 +1,153 @@
+"""Append-only journal of accepted Omlet webhook events.
+
+This module intentionally avoids Home Assistant imports so it can be loaded
+directly by tests. Events are kept in memory (capped) and appended to a JSON
+Lines file in batches; the coordinator hands batches to an executor so file
+I/O never runs on the event loop. Only the event fields and the token's
+source are stored, never the token itself.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+import json
+import logging
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_EVENTS = 500
+JOURNAL_FIELDS = ("deviceId", "parameterName", "oldValue", "newValue")
+
+
+def journal_record(
+    event: Mapping[str, Any] | None,
+    token_source: str | None = None,
+    received: float | None = None,
+) -> dict[str, Any]:
+    """Return the redacted journal entry for one accepted webhook event."""
+    event = event or {}
+    record: dict[str, Any] = {
+        "received": time.time() if received is None else received,
+    }
+    for field in JOURNAL_FIELDS:
+        record[field] = event.get(field)
+    record["token_source"] = token_source
+    return record
+
+
+class WebhookJournal:
+    """The latest webhook events of one entry, in memory and on disk.
+
+    The file is only ever appended to until it holds twice max_events
+    lines; the next write then replaces it with the events kept in memory.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], max_events: int = DEFAULT_MAX_EVENTS) -> None:
+        self.path = Path(path)
+        self.max_events = max_events
+        self._events: deque[dict[str, Any]] = deque(maxlen=max_events)
+        self._pending: list[dict[str, Any]] = []
+        self._lines_on_disk = 0
+        self.written = 0
+        self.compactions = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def record(
+        self,
+        event: Mapping[str, Any] | None,
+        token_source: str | None = None,
+        received: float | None = None,
+    ) -> dict[str, Any]:
+        """Add an accepted event; it is written with the next batch."""
+        record = journal_record(event, token_source, received)
+        self._events.append(record)
+        self._pending.append(record)
+        return record
+
+    def has_pending(self) -> bool:
+        """Return whether events are waiting to be written."""
+        return bool(self._pending)
+
+    def events(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Return the journaled events, oldest first (the last limit of them)."""
+        events = list(self._events)
+        if limit is not None:
+            events = events[-limit:] if limit > 0 else []
+        return events
+
+    def take_batch(self) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
+        """Hand the pending events to the writer.
+
+        Returns the batch to append and, once the file has grown past twice
+        the cap, the events to rewrite it with instead.
+        """
+        batch, self._pending = self._pending, []
+        rewrite = None
+        if batch and self._lines_on_disk + len(batch) > 2 * self.max_events:
+            rewrite = list(self._events)
+        return batch, rewrite
+
+    def write(
+        self, batch: list[dict[str, Any]], rewrite: list[dict[str, Any]] | None = None
+    ) -> None:
+        """Append a batch to the file, or replace it with rewrite (blocking I/O)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if rewrite is not None:
+            tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as file:
+                file.writelines(_dump(record) for record in rewrite)
+            os.replace(tmp_path, self.path)
+            self._lines_on_disk = len(rewrite)
+            self.compactions += 1
+        else:
+            with self.path.open("a", encoding="utf-8") as file:
+                file.writelines(_dump(record) for record in batch)
+            self._lines_on_disk += len(batch)
+        self.written += len(batch)
+
+    def load(self) -> None:
+        """Read the events kept on disk by a previous run (blocking I/O)."""
+        try:
+            with self.path.open(encoding="utf-8") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return
+        self._lines_on_disk = len(lines)
+        tail = lines[-self.max_events :]
+        loaded = []
+        for line in tail:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                loaded.append(record)
+        if len(loaded) < len(tail):
+            _LOGGER.debug("Skipped %d unreadable webhook journal lines", len(tail) - len(loaded))
+        # Events recorded before loading are newer than anything on disk.
+        self._events = deque([*loaded, *self._events], maxlen=self.max_events)
+
+    def remove(self) -> None:
+        """Delete the journal file (blocking I/O)."""
+        self.path.unlink(missing_ok=True)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return journal counters for diagnostics."""
+        return {
+            "events": len(self._events),
+            "pending": len(self._pending),
+            "written": self.written,
+            "lines_on_disk": self._lines_on_disk,
+            "compactions": self.compactions,
+        }
+
+
+def _dump(record: Mapping[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":"), default=str) + "\n"
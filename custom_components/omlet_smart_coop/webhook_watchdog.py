@@ -0,0 +1,102 @@
+"""Webhook delivery watchdog for webhook-only (or rarely polled) installs.
+
+This module intentionally avoids Home Assistant imports so it can be loaded
+directly by tests. The coordinator reports accepted webhooks and completed
+fetches; the watchdog says when a heartbeat poll is due and decides whether
+webhook delivery looks broken: heartbeat polls keep finding device changes
+that no webhook announced.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import time
+from typing import Any
+
+DEFAULT_MISSED_THRESHOLD = 2
+
+
+class WebhookWatchdog:
+    """Track webhook and fetch activity and flag silent webhook failures."""
+
+    def __init__(
+        self,
+        heartbeat_after: float,
+        *,
+        missed_threshold: int = DEFAULT_MISSED_THRESHOLD,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.heartbeat_after = heartbeat_after
+        self._missed_threshold = missed_threshold
+        self._clock = clock
+        self._started = clock()
+        self.last_webhook: float | None = None
+        self.last_fetch: float | None = None
+        self._fingerprint: str | None = None
+        self.heartbeats = 0
+        # Consecutive heartbeat polls that found changes without a webhook.
+        self.missed = 0
+        self.delivery_broken = False
+
+    def webhook_received(self) -> bool:
+        """Record an accepted webhook; True if this ends a broken period."""
+        self.last_webhook = self._clock()
+        self.missed = 0
+        recovered = self.delivery_broken
+        self.delivery_broken = False
+        return recovered
+
+    def fetch_completed(self, fingerprint: str, *, heartbeat: bool = False) -> bool:
+        """Record a successful fetch of device state; True if delivery just broke.
+
+        fingerprint identifies the fetched device state. Only heartbeat polls
+        count against webhooks: other fetches follow our own commands and may
+        race the webhook announcing their result.
+        """
+        previous_fetch = self.last_fetch
+        changed = self._fingerprint is not None and fingerprint != self._fingerprint
+        self._fingerprint = fingerprint
+        self.last_fetch = self._clock()
+        if not heartbeat:
+            return False
+        self.heartbeats += 1
+        webhook_since = (
+            self.last_webhook is not None
+            and previous_fetch is not None
+            and self.last_webhook >= previous_fetch
+        )
+        if not changed or webhook_since:
+            return False
+        self.missed += 1
+        if self.missed >= self._missed_threshold and not self.delivery_broken:
+            self.delivery_broken = True
+            return True
+        return False
+
+    def last_activity(self) -> float:
+        """Monotonic time of the last webhook or fetch (or of startup)."""
+        return max(
+            value
+            for value in (self._started, self.last_webhook, self.last_fetch)
+            if value is not None
+        )
+
+    def heartbeat_due_in(self) -> float:
+        """Seconds until a heartbeat poll is due; 0 if it is due now."""
+        return max(0.0, self.last_activity() + self.heartbeat_after - self._clock())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return ages (seconds) and counters for diagnostics."""
+        now = self._clock()
+        return {
+            "heartbeat_after": self.heartbeat_after,
+            "seconds_since_webhook": (
+                None if self.last_webhook is None else round(now - self.last_webhook)
+            ),
+            "seconds_since_fetch": (
+                None if self.last_fetch is None else round(now - self.last_fetch)
+            ),
+            "heartbeats": self.heartbeats,
+            "missed": self.missed,
+            "delivery_broken": self.delivery_broken,
+        }
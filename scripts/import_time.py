@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Report how long importing the integration (or one of its modules) takes.
+
+Each run imports the module in a fresh interpreter with ``python -X importtime``
+from the repository root, so nothing is cached between runs; the report keeps
+the median of --runs runs per module. Compare two checkouts with --json.
+
+    python scripts/import_time.py [MODULE] [--runs 5] [--top 15] [--json]
+
+MODULE defaults to the integration package, which needs the homeassistant
+package installed. Per-entry setup phases (first refresh, migrations, platform
+forwarding, ...) are timed at runtime instead: they are logged at debug level
+and listed under "setup_phases" in the integration's diagnostics.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = "custom_components.omlet_smart_coop"
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _import_once(module: str) -> dict[str, tuple[int, int]]:
+    """Return {module: (self_us, cumulative_us)} for one fresh import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        tail = result.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise SystemExit(f"importing {module} failed: {tail[0]}")
+    timings: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            timings[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return timings
+
+
+def measure(module: str, runs: int) -> dict[str, dict[str, float]]:
+    """Return the median self/cumulative milliseconds of every imported module."""
+    samples: dict[str, list[tuple[int, int]]] = {}
+    for _ in range(runs):
+        for name, timing in _import_once(module).items():
+            samples.setdefault(name, []).append(timing)
+    return {
+        name: {
+            "self_ms": round(statistics.median(t[0] for t in values) / 1000, 2),
+            "cumulative_ms": round(statistics.median(t[1] for t in values) / 1000, 2),
+        }
+        for name, values in samples.items()
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("module", nargs="?", default=PACKAGE, help="module to import")
+    parser.add_argument("--runs", type=int, default=5, help="fresh imports to take the median of")
+    parser.add_argument("--top", type=int, default=15, help="heaviest other modules to list")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    timings = measure(args.module, max(1, args.runs))
+    own = {
+        name: timing for name, timing in timings.items() if name.startswith(PACKAGE)
+    }
+    others = sorted(
+        ((name, timing) for name, timing in timings.items() if name not in own),
+        key=lambda item: item[1]["self_ms"],
+        reverse=True,
+    )[: args.top]
+    report = {
+        "module": args.module,
+        "runs": max(1, args.runs),
+        "total_ms": timings.get(args.module, {}).get("cumulative_ms"),
+        "modules_imported": len(timings),
+        "integration_modules": dict(
+            sorted(own.items(), key=lambda item: item[1]["cumulative_ms"], reverse=True)
+        ),
+        "heaviest_other_modules": dict(others),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(
+        f"import {report['module']}: {report['total_ms']} ms cumulative, "
+        f"{report['modules_imported']} modules (median of {report['runs']} runs)"
+    )
+    for title, rows in (
+        ("integration modules", report["integration_modules"]),
+        ("heaviest other modules (self time)", report["heaviest_other_modules"]),
+    ):
+        if not rows:
+            continue
+        print(f"\n{title}:\n{'self ms':>10}{'cumul ms':>10}  module")
+        for name, timing in rows.items():
+            print(f"{timing['self_ms']:>10}{timing['cumulative_ms']:>10}  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Replay a captured Omlet traffic trace through the integration, headless.
+
+Traces come from the omlet_smart_coop.capture_trace service. Each /device
+response goes through the coordinator's parsing and capability indexing
+("parse") and sensor value extraction ("entities"); each raw webhook body goes
+through the webhook handler ("webhook"): token checks and event extraction
+run on the captured shapes, with redacted tokens standing in for real ones. Only the integration's Home
+Assistant-independent modules (core, webhook_helpers, trace_capture) are
+loaded, so neither Home Assistant nor network access is needed.
+
+    python scripts/replay_trace.py TRACE.jsonl [--realtime] [--repeat N] [--json]
+
+The first pass times each stage; a second pass at maximum speed measures
+allocations with tracemalloc (skip it with --no-alloc).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import json
+import logging
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any
+
+INTEGRATION_PATH = (
+    Path(__file__).resolve().parents[1] / "custom_components" / "omlet_smart_coop"
+)
+
+
+def _load(name: str, path: Path, *, package: bool = False):
+    """Load an HA-free integration module (or the core package) by path.
+
+    Importing custom_components.omlet_smart_coop would run the integration's
+    __init__, which needs Home Assistant.
+    """
+    spec = importlib.util.spec_from_file_location(
+        name, path, submodule_search_locations=[str(path.parent)] if package else None
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+_load("omlet_core", INTEGRATION_PATH / "core" / "__init__.py", package=True)
+parsing = importlib.import_module("omlet_core.parsing")
+devices = importlib.import_module("omlet_core.devices")
+sensor_values = importlib.import_module("omlet_core.sensor_values")
+trace_capture = _load("omlet_trace_capture", INTEGRATION_PATH / "trace_capture.py")
+webhook_helpers = _load("omlet_webhook_helpers", INTEGRATION_PATH / "webhook_helpers.py")
+
+STAGES = ("parse", "entities", "webhook")
+
+
+class StageStats:
+    """Per-stage samples: durations and, on the allocation pass, bytes."""
+
+    def __init__(self) -> None:
+        self.durations: list[float] = []
+        self.peak_bytes = 0
+        self.net_bytes = 0
+        self.alloc_samples = 0
+
+    def summary(self) -> dict[str, Any]:
+        samples = sorted(self.durations)
+        count = len(samples)
+        if not count:
+            return {"count": 0}
+
+        def _ms(value: float) -> float:
+            return round(value * 1000, 3)
+
+        return {
+            "count": count,
+            "total_ms": _ms(sum(samples)),
+            "mean_ms": _ms(sum(samples) / count),
+            "p50_ms": _ms(samples[count // 2]),
+            "p95_ms": _ms(samples[min(count - 1, int(count * 0.95))]),
+            "max_ms": _ms(samples[-1]),
+            "alloc_peak_kib": round(self.peak_bytes / 1024, 1) if self.alloc_samples else None,
+            "alloc_net_kib": round(self.net_bytes / 1024, 1) if self.alloc_samples else None,
+        }
+
+
+class _ReplayCoordinator:
+    """What the webhook handler needs from a coordinator, without side effects."""
+
+    def __init__(self) -> None:
+        self.webhook_metrics = webhook_helpers.WebhookMetrics()
+
+    def async_webhook_received(self, event=None, token_source=None) -> None:
+        pass
+
+    async def async_request_refresh(self) -> None:
+        pass
+
+
+class _TraceRequest:
+    """A captured webhook rebuilt as a request for the handler.
+
+    Captured tokens are redacted, so the token is put back, redacted, where
+    it originally came from; replay() configures the redacted value as the
+    entry's token.
+    """
+
+    def __init__(self, data: Any) -> None:
+        data = data if isinstance(data, dict) else {}
+        self._body = data.get("body")
+        self.headers: dict[str, str] = {}
+        self.query: dict[str, str] = {}
+        kind, _, key = (data.get("token_source") or "").partition(":")
+        if kind == "header":
+            token = trace_capture.REDACTED
+            self.headers[key] = f"Bearer {token}" if key == "Authorization" else token
+        elif kind == "query":
+            self.query[key] = trace_capture.REDACTED
+
+    async def json(self) -> Any:
+        return self._body
+
+
+class _Response(SimpleNamespace):
+    def __init__(self, *, status: int = 200, text: str = "ok") -> None:
+        super().__init__(status=status, text=text)
+
+
+def _parse(devices_data: Any) -> dict[str, Any]:
+    """Do what OmletDataCoordinator._process_devices does on a refresh."""
+    parsed = parsing.parse_devices(devices_data)
+    for device_data in parsed.values():
+        devices.build_device_capabilities(device_data)
+        devices.build_action_index(device_data.get("actions"))
+    return parsed
+
+
+def _extract_entities(parsed: dict[str, Any]) -> int:
+    values = 0
+    for device_data in parsed.values():
+        for key in sensor_values.SENSOR_VALUE_KEYS:
+            if sensor_values.extract_sensor_value(key, device_data) is not None:
+                values += 1
+    return values
+
+
+async def replay(
+    records: list[dict[str, Any]],
+    *,
+    realtime: bool = False,
+    max_gap: float = 60.0,
+    measure_alloc: bool = False,
+) -> dict[str, StageStats]:
+    """Replay records once; return per-stage statistics."""
+    stats = {stage: StageStats() for stage in STAGES}
+    coordinator = _ReplayCoordinator()
+    # Check tokens whenever the trace shows they were sent.
+    options = (
+        {"webhook_token": trace_capture.REDACTED}
+        if any(
+            record["kind"] == trace_capture.TRACE_KIND_WEBHOOK
+            and isinstance(record.get("data"), dict)
+            and record["data"].get("token_source")
+            for record in records
+        )
+        else {}
+    )
+    handler = webhook_helpers.create_omlet_webhook_handler(
+        SimpleNamespace(options=options),
+        coordinator,
+        response_factory=_Response,
+        logger=logging.getLogger("replay_trace"),
+        metrics=coordinator.webhook_metrics,
+    )
+
+    async def _measure(stage: str, func, *args) -> Any:
+        if measure_alloc:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        result = func(*args)
+        if asyncio.iscoroutine(result):
+            result = await result
+        elapsed = time.perf_counter() - started
+        stage_stats = stats[stage]
+        if measure_alloc:
+            current, peak = tracemalloc.get_traced_memory()
+            stage_stats.peak_bytes = max(stage_stats.peak_bytes, peak - before)
+            stage_stats.net_bytes += current - before
+            stage_stats.alloc_samples += 1
+        else:
+            stage_stats.durations.append(elapsed)
+        return result
+
+    previous: float | None = None
+    for record in records:
+        timestamp = record.get("t")
+        if realtime and isinstance(timestamp, (int, float)):
+            if previous is not None:
+                await asyncio.sleep(min(max_gap, max(0.0, timestamp - previous)))
+            previous = timestamp
+        data = record.get("data")
+        if record["kind"] == trace_capture.TRACE_KIND_DEVICES:
+            try:
+                parsed = await _measure("parse", _parse, data)
+            except parsing.DeviceDataError as err:  # a captured failure response
+                print(f"skipping unparsable /device record: {err}", file=sys.stderr)
+                continue
+            await _measure("entities", _extract_entities, parsed)
+        elif record["kind"] == trace_capture.TRACE_KIND_WEBHOOK:
+            await _measure("webhook", handler, None, "replay", _TraceRequest(data))
+    return stats
+
+
+def _print_table(report: dict[str, Any]) -> None:
+    print(f"records: {report['records']}  repeat: {report['repeat']}  realtime: {report['realtime']}")
+    header = f"{'stage':<9}{'count':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"
+    print(header + f"{'peak KiB':>10}{'net KiB':>10}")
+    for stage, summary in report["stages"].items():
+        if not summary.get("count"):
+            print(f"{stage:<9}{0:>7}")
+            continue
+        print(
+            f"{stage:<9}{summary['count']:>7}{summary['mean_ms']:>10}{summary['p50_ms']:>10}"
+            f"{summary['p95_ms']:>10}{summary['max_ms']:>10}"
+            f"{str(summary['alloc_peak_kib']):>10}{str(summary['alloc_net_kib']):>10}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("trace", type=Path, help="JSON Lines trace from capture_trace")
+    parser.add_argument("--realtime", action="store_true", help="keep the captured timing")
+    parser.add_argument("--max-gap", type=float, default=60.0, help="cap on realtime gaps (s)")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the trace N times")
+    parser.add_argument("--no-alloc", action="store_true", help="skip the allocation pass")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    records = list(trace_capture.read_trace(args.trace))
+    if not records:
+        print(f"no trace records in {args.trace}", file=sys.stderr)
+        return 1
+
+    stats = {stage: StageStats() for stage in STAGES}
+    for _ in range(max(1, args.repeat)):
+        run = asyncio.run(replay(records, realtime=args.realtime, max_gap=args.max_gap))
+        for stage in STAGES:
+            stats[stage].durations.extend(run[stage].durations)
+    if not args.no_alloc:
+        tracemalloc.start()
+        try:
+            run = asyncio.run(replay(records, measure_alloc=True))
+        finally:
+            tracemalloc.stop()
+        for stage in STAGES:
+            stats[stage].peak_bytes = run[stage].peak_bytes
+            stats[stage].net_bytes = run[stage].net_bytes
+            stats[stage].alloc_samples = run[stage].alloc_samples
+
+    report = {
+        "trace": str(args.trace),
+        "records": len(records),
+        "repeat": max(1, args.repeat),
+        "realtime": args.realtime,
+        "stages": {stage: stats[stage].summary() for stage in STAGES},
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_table(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
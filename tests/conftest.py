@@ -0,0 +1,32 @@
+"""Shared test setup.
+
+The integration package cannot be imported without Home Assistant, so its
+Home Assistant-independent core package is registered here as "omlet_core";
+test modules import its submodules with importlib.import_module("omlet_core.<name>").
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import sys
+
+INTEGRATION_PATH = Path(__file__).resolve().parents[1] / "custom_components" / "omlet_smart_coop"
+CORE_PATH = INTEGRATION_PATH / "core"
+
+
+def _load_core() -> None:
+    """Register the core package as omlet_core, once."""
+    if "omlet_core" in sys.modules:
+        return
+    spec = importlib.util.spec_from_file_location(
+        "omlet_core",
+        CORE_PATH / "__init__.py",
+        submodule_search_locations=[str(CORE_PATH)],
+    )
+    assert spec.loader is not None
+    sys.modules[spec.name] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sys.modules[spec.name])
+
+
+_load_core()
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from pathlib import Path
+import sys
+import unittest
+
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "omlet_smart_coop"
+    / "command_queue.py"
+)
+SPEC = importlib.util.spec_from_file_location("omlet_command_queue", MODULE_PATH)
+command_queue = importlib.util.module_from_spec(SPEC)
+assert SPEC.loader is not None
+sys.modules[SPEC.name] = command_queue
+SPEC.loader.exec_module(command_queue)
+
+ACTION = command_queue.KIND_ACTION
+PATCH = command_queue.KIND_PATCH
+
+
+class FakeApi:
+    """Records sent commands; each call yields so other callers can queue up."""
+
+    def __init__(self, fail=()):
+        self.sent = []
+        self.fail = set(fail)
+
+    async def execute(self, device_id, kind, payload):
+        await asyncio.sleep(0)
+        key = payload if kind == ACTION else repr(payload)
+        self.sent.append((device_id, kind, payload))
+        if key in self.fail:
+            raise RuntimeError(f"{key} failed")
+        return {"sent": payload}
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class CommandQueueTests(unittest.TestCase):
+    def test_pending_actions_collapse_to_latest(self):
+        api = FakeApi()
+        queue = command_queue.CommandQueue(api.execute)
+
+        async def scenario():
+            return await asyncio.gather(
+                queue.async_action("d1", "open"),
+                queue.async_action("d1", "on"),
+                queue.async_action("d1", "off"),
+                queue.async_action("d1", "on"),
+            )
+
+        results = _run(scenario())
+
+        # "open" was already running; off/on/on collapsed into one "on".
+        self.assertEqual(api.sent, [("d1", ACTION, "open"), ("d1", ACTION, "on")])
+        self.assertEqual(results[1:], [{"sent": "on"}] * 3)
+        self.assertEqual(queue.stats.merged, 2)
+        self.assertEqual(queue.depth(), 0)
+
+    def test_actions_for_different_parts_are_not_merged(self):
+        api = FakeApi()
+        queue = command_queue.CommandQueue(api.execute)
+
+        async def scenario():
+            return await asyncio.gather(
+                queue.async_action("d1", "restart"),
+                queue.async_action("d1", "open"),
+                queue.async_action("d1", "on"),
+            )
+
+        results = _run(scenario())
+
+        # The door open and the light on are both sent, in order.
+        self.assertEqual([payload for _, _, payload in api.sent], ["restart", "open", "on"])
+        self.assertEqual(results[1:], [{"sent": "open"}, {"sent": "on"}])
+        self.assertEqual(queue.stats.merged, 0)
+
+    def test_pending_patches_merge_per_section(self):
+        api = FakeApi()
+        queue = command_queue.CommandQueue(api.execute)
+
+        async def scenario():
+            await asyncio.gather(
+                queue.async_action("d1", "on"),
+                queue.async_patch("d1", {"fan": {"mode": "manual"}}),
+                queue.async_patch("d1", {"fan": {"manualSpeed": "high"}, "light": {"mode": "auto"}}),
+            )
+
+        _run(scenario())
+
+        self.assertEqual(
+            api.sent[1],
+            ("d1", PATCH, {"fan": {"mode": "manual", "manualSpeed": "high"}, "light": {"mode": "auto"}}),
+        )
+
+    def test_devices_are_independent_and_ordered(self):
+        api = FakeApi()
+        queue = command_queue.CommandQueue(api.execute)
+
+        async def scenario():
+            await asyncio.gather(
+                queue.async_action("d1", "open"),
+                queue.async_action("d2", "close"),
+                queue.async_patch("d1", {"door": {"openMode": "light"}}),
+            )
+
+        _run(scenario())
+
+        self.assertEqual(
+            [payload for device_id, _kind, payload in api.sent if device_id == "d1"],
+            ["open", {"door": {"openMode": "light"}}],
+        )
+        self.assertIn(("d2", ACTION, "close"), api.sent)
+
+    def test_sequence_runs_in_full_and_skips_failed_preparation(self):
+        patch = {"fan": {"mode": "manual"}}
+        api = FakeApi(fail={repr(patch)})
+        queue = command_queue.CommandQueue(api.execute)
+
+        result = _run(queue.async_sequence("d1", [(PATCH, patch), (ACTION, "off"), (ACTION, "on")]))
+
+        self.assertEqual(result, {"sent": "on"})
+        self.assertEqual([payload for _, _, payload in api.sent], [patch, "off", "on"])
+
+    def test_failure_reaches_every_merged_caller(self):
+        api = FakeApi(fail={"on"})
+        queue = command_queue.CommandQueue(api.execute)
+
+        async def scenario():
+            return await asyncio.gather(
+                queue.async_action("d1", "off"),
+                queue.async_action("d1", "on"),
+                queue.async_action("d1", "on"),
+                return_exceptions=True,
+            )
+
+        results = _run(scenario())
+
+        self.assertEqual(results[0], {"sent": "off"})
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results[1:]))
+        self.assertEqual(queue.stats.failed, 1)
+
+    def test_stats_report_queue_wait(self):
+        now = [0.0]
+        api = FakeApi()
+        queue = command_queue.CommandQueue(api.execute, clock=lambda: now[0])
+
+        async def execute(device_id, kind, payload):
+            result = await api.execute(device_id, kind, payload)
+            now[0] += 0.25
+            return result
+
+        queue._execute = execute
+
+        async def scenario():
+            await asyncio.gather(
+                queue.async_action("d1", "open"),
+                queue.async_patch("d1", {"door": {"openMode": "light"}}),
+            )
+
+        _run(scenario())
+
+        stats = queue.stats.as_dict()
+        self.assertEqual(stats["executed"], 2)
+        self.assertEqual(stats["max_wait_ms"], 250.0)
+        self.assertEqual(stats["mean_wait_ms"], 125.0)
+        self.assertEqual(stats["max_depth"], 1)
+
+
+class IdempotencyTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.api = FakeApi()
+        self.pending = set()
+        self.queue = command_queue.CommandQueue(
+            self.api.execute,
+            clock=lambda: self.now,
+            idempotency_window=5.0,
+            in_progress=lambda device_id, action, section: (device_id, action, section)
+            in self.pending,
+        )
+
+    def test_repeated_action_inside_window_is_not_resent(self):
+        async def scenario():
+            await self.queue.async_action("d1", "open", "door")
+            self.now += 1.0
+            repeated = await self.queue.async_action("d1", "open", "door")
+            self.now += 5.0
+            await self.queue.async_action("d1", "open", "door")
+            return repeated
+
+        self.assertEqual(
+            _run(scenario()),
+            command_queue.SuppressedAction("open", "door", command_queue.SUPPRESSED_RECENT),
+        )
+        self.assertEqual(len(self.api.sent), 2)
+        self.assertEqual(self.queue.stats.suppressed_recent, 1)
+
+    def test_window_is_per_section(self):
+        async def scenario():
+            await self.queue.async_action("d1", "on", "fan")
+            self.now += 1.0
+            await self.queue.async_action("d1", "on", "light")
+            await self.queue.async_action("d1", "on", "fan")
+
+        _run(scenario())
+
+        self.assertEqual(
+            [payload for _, _, payload in self.api.sent], ["on", "on"]
+        )
+        self.assertEqual(self.queue.stats.suppressed_recent, 1)
+
+    def test_pending_actions_for_other_sections_are_not_merged(self):
+        async def scenario():
+            return await asyncio.gather(
+                self.queue.async_action("d1", "restart"),
+                self.queue.async_action("d1", "off", "fan"),
+                self.queue.async_action("d1", "on", "light"),
+            )
+
+        _run(scenario())
+
+        self.assertEqual(
+            [payload for _, _, payload in self.api.sent], ["restart", "off", "on"]
+        )
+        self.assertEqual(self.queue.stats.merged, 0)
+
+    def test_other_commands_reset_the_window(self):
+        async def scenario():
+            await self.queue.async_action("d1", "open")
+            await self.queue.async_action("d1", "close")
+            await self.queue.async_action("d1", "open")
+            await self.queue.async_patch("d1", {"door": {"openMode": "manual"}})
+            await self.queue.async_action("d1", "open")
+            await self.queue.async_action("d2", "open")
+
+        _run(scenario())
+
+        self.assertEqual(len(self.api.sent), 6)
+        self.assertEqual(self.queue.stats.suppressed_recent, 0)
+
+    def test_concurrent_identical_actions_share_one_request(self):
+        async def scenario():
+            return await asyncio.gather(
+                self.queue.async_action("d1", "on"), self.queue.async_action("d1", "on")
+            )
+
+        self.assertEqual(_run(scenario()), [{"sent": "on"}, {"sent": "on"}])
+        self.assertEqual(self.api.sent, [("d1", ACTION, "on")])
+
+    def test_action_already_pending_on_device_is_not_sent(self):
+        self.pending.add(("d1", "open", "feeder"))
+
+        suppressed = _run(self.queue.async_action("d1", "open", "feeder"))
+        _run(self.queue.async_action("d1", "open", "door"))
+        _run(self.queue.async_action("d1", "close", "feeder"))
+
+        self.assertEqual(suppressed.reason, command_queue.SUPPRESSED_IN_PROGRESS)
+        self.assertEqual(
+            self.api.sent, [("d1", ACTION, "open"), ("d1", ACTION, "close")]
+        )
+        self.assertEqual(self.queue.stats.suppressed_pending, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
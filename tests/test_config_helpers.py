@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import sys
+import unittest
+
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "omlet_smart_coop"
+    / "config_helpers.py"
+)
+SPEC = importlib.util.spec_from_file_location("omlet_config_helpers", MODULE_PATH)
+config_helpers = importlib.util.module_from_spec(SPEC)
+assert SPEC.loader is not None
+sys.modules[SPEC.name] = config_helpers
+SPEC.loader.exec_module(config_helpers)
+
+
+CONFIGURATION = {
+    "door": {"openMode": "time", "openTime": "06:30", "closeMode": "light"},
+    "light": {"mode": "manual"},
+    "fan": {},
+    "general": {"overnightSleepEnable": False},
+}
+
+
+class ValidateProfileTests(unittest.TestCase):
+    def test_drops_empty_sections(self):
+        self.assertEqual(
+            config_helpers.validate_profile(
+                {"door": {"openMode": "light"}, "light": {}, "fan": None}
+            ),
+            {"door": {"openMode": "light"}},
+        )
+
+    def test_rejects_unknown_or_malformed_sections(self):
+        with self.assertRaises(ValueError):
+            config_helpers.validate_profile({"feeder": {"openMode": "time"}})
+        with self.assertRaises(ValueError):
+            config_helpers.validate_profile({"door": "time"})
+        with self.assertRaises(ValueError):
+            config_helpers.validate_profile({"door": {}})
+
+
+class ConfigurationPatchTests(unittest.TestCase):
+    def test_only_changed_keys_of_changed_sections(self):
+        profile = {
+            "door": {"openMode": "time", "openTime": "07:00"},
+            "light": {"mode": "manual"},
+            "fan": {"mode": "temperature"},
+        }
+
+        self.assertEqual(
+            config_helpers.configuration_patch(CONFIGURATION, profile),
+            {"door": {"openTime": "07:00"}, "fan": {"mode": "temperature"}},
+        )
+
+    def test_matching_device_needs_no_patch(self):
+        profile = {"door": {"openMode": "time"}, "general": {"overnightSleepEnable": False}}
+
+        self.assertEqual(config_helpers.configuration_patch(CONFIGURATION, profile), {})
+        self.assertEqual(config_helpers.configuration_drift(CONFIGURATION, profile), {})
+
+    def test_drift_reports_current_and_desired(self):
+        self.assertEqual(
+            config_helpers.configuration_drift(
+                CONFIGURATION, {"general": {"overnightSleepEnable": True}}
+            ),
+            {"general": {"overnightSleepEnable": {"current": False, "desired": True}}},
+        )
+        self.assertEqual(
+            config_helpers.configuration_drift(None, {"light": {"mode": "auto"}}),
+            {"light": {"mode": {"current": None, "desired": "auto"}}},
+        )
+
+
+class SnapshotLibraryTests(unittest.TestCase):
+    def test_identical_configurations_share_one_blob(self):
+        library = config_helpers.SnapshotLibrary()
+
+        snapshot_id, added = library.capture(
+            {"dev1": CONFIGURATION, "dev2": dict(CONFIGURATION)}, name="spring"
+        )
+
+        self.assertTrue(added)
+        self.assertEqual(len(library.as_dict()["blobs"]), 1)
+        # Empty sections are not stored.
+        self.assertNotIn("fan", library.get(snapshot_id)["dev1"])
+        self.assertEqual(library.get("spring"), library.get())
+
+    def test_recapturing_unchanged_fleet_adds_nothing(self):
+        library = config_helpers.SnapshotLibrary()
+        first_id, _ = library.capture({"dev1": CONFIGURATION}, name="first")
+        library.capture({"dev1": {"door": {"openMode": "light"}}}, name="second")
+
+        again_id, added = library.capture({"dev1": CONFIGURATION})
+
+        self.assertEqual(again_id, first_id)
+        self.assertFalse(added)
+        self.assertEqual(len(library), 2)
+        # The repeated capture becomes the latest snapshot.
+        self.assertEqual(library.summaries()[0]["name"], "first")
+
+    def test_round_trips_through_storage_payload(self):
+        library = config_helpers.SnapshotLibrary()
+        snapshot_id, _ = library.capture({"dev1": CONFIGURATION}, created="2026-10-18T20:00:00")
+
+        restored = config_helpers.SnapshotLibrary(library.as_dict())
+
+        self.assertEqual(restored.get(snapshot_id), library.get(snapshot_id))
+        self.assertEqual(restored.summaries()[0]["created"], "2026-10-18T20:00:00")
+
+    def test_prunes_oldest_snapshots_and_unused_blobs(self):
+        library = config_helpers.SnapshotLibrary(max_snapshots=2)
+        for hour in range(4):
+            library.capture({"dev1": {"door": {"openTime": f"0{hour}:00"}}})
+
+        self.assertEqual(len(library), 2)
+        self.assertEqual(len(library.as_dict()["blobs"]), 2)
+        self.assertEqual(library.get()["dev1"]["door"]["openTime"], "03:00")
+
+    def test_restore_patch_against_current(self):
+        library = config_helpers.SnapshotLibrary()
+        library.capture({"dev1": CONFIGURATION})
+        current = {"door": {"openMode": "time", "openTime": "08:00", "closeMode": "light"}}
+
+        self.assertEqual(
+            config_helpers.configuration_patch(current, library.get()["dev1"]),
+            {
+                "door": {"openTime": "06:30"},
+                "light": {"mode": "manual"},
+                "general": {"overnightSleepEnable": False},
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
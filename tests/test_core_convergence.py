@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import importlib
+import unittest
+
+
+convergence = importlib.import_module("omlet_core.convergence")
+
+
+def _data(**sections):
+    return {"d1": {"state": {name: {"state": state} for name, state in sections.items()}}}
+
+
+class ConvergenceTrackerTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        self.tracker = convergence.ConvergenceTracker(
+            clock=lambda: self.now, backoff=(1.0, 2.0, 4.0), timeout=30.0
+        )
+
+    def test_optimistic_until_target_reported(self):
+        self.tracker.start("d1", "door", "openpending", {"open"})
+
+        self.assertEqual(self.tracker.optimistic_state("d1", "door"), "openpending")
+        self.assertEqual(self.tracker.observe(_data(door="closed")), [])
+
+        self.now += 3.5
+        self.assertEqual(self.tracker.observe(_data(door="open")), [("d1", "door")])
+        self.assertIsNone(self.tracker.optimistic_state("d1", "door"))
+        self.assertIsNone(self.tracker.next_delay())
+        stats = self.tracker.as_dict()
+        self.assertEqual(stats["converged"], 1)
+        self.assertEqual(stats["last_converge_ms"], 3500.0)
+
+    def test_polls_back_off_until_timeout(self):
+        self.tracker.start("d1", "fan", "on", {"on", "boost"})
+        delays = []
+        while (delay := self.tracker.next_delay()) is not None and len(delays) < 20:
+            delays.append(delay)
+            self.now += delay
+            self.tracker.mark_polled()
+            self.tracker.observe(_data(fan="off"))
+
+        self.assertEqual(delays[:4], [1.0, 2.0, 4.0, 4.0])
+        self.assertAlmostEqual(sum(delays), 30.0)
+        self.assertEqual(self.tracker.as_dict()["timed_out"], 1)
+        self.assertIsNone(self.tracker.optimistic_state("d1", "fan"))
+
+    def test_newer_command_replaces_pending_one(self):
+        self.tracker.start("d1", "fan", "on", {"on"})
+        self.tracker.start("d1", "fan", "off", {"off"})
+
+        self.assertEqual(self.tracker.optimistic_state("d1", "fan"), "off")
+        self.assertEqual(self.tracker.observe(_data(fan="on")), [])
+        self.assertEqual(len(self.tracker), 1)
+
+    def test_repeated_command_keeps_original_timing(self):
+        self.tracker.start("d1", "door", "openpending", {"open"})
+        self.now += 2.0
+        self.tracker.start("d1", "door", "openpending", {"open"})
+        self.now += 1.0
+        self.tracker.observe(_data(door="open"))
+
+        self.assertEqual(self.tracker.as_dict()["last_converge_ms"], 3000.0)
+
+    def test_sections_tracked_independently(self):
+        self.tracker.start("d1", "door", "closepending", {"closed"})
+        self.tracker.start("d1", "light", "on", {"on"})
+
+        self.assertEqual(
+            self.tracker.observe(_data(door="closepending", light="on")), [("d1", "light")]
+        )
+        self.assertEqual(self.tracker.optimistic_state("d1", "door"), "closepending")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import importlib
+import unittest
+
+
+devices = importlib.import_module("omlet_core.devices")
+
+
+def _action(value):
+    return {
+        "actionName": value,
+        "description": value.title(),
+        "actionValue": value,
+        "url": f"/device/dev1/action/{value}",
+    }
+
+
+class DeviceCapabilitiesTests(unittest.TestCase):
+    def test_door_controller_with_light(self):
+        capabilities = devices.build_device_capabilities(
+            {
+                "deviceType": "Autodoor",
+                "state": {"door": {"state": "closed"}, "light": {"state": "off"}},
+                "configuration": {"door": {}, "light": {}},
+                "actions": [_action("open"), _action("Close"), _action("restart")],
+            }
+        )
+
+        self.assertTrue(capabilities.door)
+        self.assertTrue(capabilities.light)
+        self.assertTrue(capabilities.restart)
+        self.assertFalse(capabilities.feeder)
+        self.assertFalse(capabilities.fan)
+        self.assertFalse(capabilities.pure_fan)
+        self.assertTrue(capabilities.has_action("CLOSE"))
+
+    def test_door_state_without_actions_is_not_controllable(self):
+        capabilities = devices.build_device_capabilities(
+            {"state": {"door": {"state": "open"}}, "actions": []}
+        )
+
+        self.assertFalse(capabilities.door)
+
+    def test_pure_fan_device_from_config_only(self):
+        capabilities = devices.build_device_capabilities(
+            {
+                "deviceType": "Smart Fan",
+                "state": {"general": {}},
+                "configuration": {"fan": {"mode": "manual"}},
+                "actions": [_action("on"), _action("off"), _action("boost")],
+            }
+        )
+
+        self.assertTrue(capabilities.fan)
+        self.assertTrue(capabilities.pure_fan)
+        self.assertTrue(capabilities.boost)
+        self.assertTrue(capabilities.fan_on)
+        self.assertTrue(capabilities.fan_off)
+
+    def test_feeder(self):
+        capabilities = devices.build_device_capabilities(
+            {
+                "state": {"feeder": {"state": "closed"}},
+                "actions": [_action("open"), _action("close")],
+            }
+        )
+
+        self.assertTrue(capabilities.feeder)
+        self.assertFalse(capabilities.door)
+
+    def test_tolerates_missing_or_malformed_sections(self):
+        self.assertIs(
+            devices.build_device_capabilities(None),
+            devices.EMPTY_CAPABILITIES,
+        )
+        capabilities = devices.build_device_capabilities(
+            {"state": None, "configuration": [], "actions": "bogus"}
+        )
+
+        self.assertEqual(capabilities.actions, frozenset())
+        self.assertFalse(capabilities.fan)
+
+
+class DevicePlatformsTests(unittest.TestCase):
+    def test_platforms_follow_capabilities(self):
+        door = devices.DeviceCapabilities(door=True)
+        feeder = devices.DeviceCapabilities(feeder=True, light=True)
+        fan = devices.DeviceCapabilities(fan=True, pure_fan=True)
+
+        self.assertEqual(devices.device_platforms([]), {"sensor"})
+        self.assertEqual(devices.device_platforms([door]), {"sensor", "cover"})
+        self.assertEqual(
+            devices.device_platforms([feeder, devices.EMPTY_CAPABILITIES]),
+            {"sensor", "cover", "light"},
+        )
+        self.assertEqual(
+            devices.device_platforms([door, fan]),
+            {"sensor", "cover", "fan", "select", "time", "number"},
+        )
+
+
+class DeviceStateTests(unittest.TestCase):
+    def test_device_state(self):
+        device = {"state": {"door": {"state": "Open"}, "fan": None}}
+
+        self.assertEqual(devices.device_state(device, "door"), "open")
+        self.assertEqual(devices.device_state(device, "fan"), "")
+        self.assertEqual(devices.device_state(None, "door"), "")
+
+    def test_action_in_progress(self):
+        device = {"state": {"door": {"state": "OpenPending"}, "light": {"state": "off"}}}
+
+        self.assertTrue(devices.action_in_progress(device, "open"))
+        self.assertFalse(devices.action_in_progress(device, "close"))
+        self.assertFalse(devices.action_in_progress(device, "off"))
+        self.assertFalse(devices.action_in_progress(device, "restart"))
+        self.assertFalse(devices.action_in_progress(None, "open"))
+        self.assertTrue(devices.action_in_progress(device, "open", "door"))
+        self.assertFalse(devices.action_in_progress(device, "open", "feeder"))
+
+    def test_configuration_matches(self):
+        device = {"configuration": {"door": {"openMode": "time", "openTime": "06:30"}}}
+
+        self.assertTrue(
+            devices.configuration_matches(device, "door", {"openMode": "time"})
+        )
+        self.assertFalse(
+            devices.configuration_matches(device, "door", {"openTime": "07:00"})
+        )
+        self.assertFalse(
+            devices.configuration_matches(device, "light", {"mode": "manual"})
+        )
+
+    def test_configuration_section_treats_empty_as_missing(self):
+        device = {"configuration": {"door": {}, "fan": {"mode": "manual"}}}
+
+        self.assertIsNone(devices.configuration_section(device, "door"))
+        self.assertEqual(
+            devices.configuration_section(device, "fan"), {"mode": "manual"}
+        )
+
+    def test_configuration_diff_keeps_only_changed_keys(self):
+        current = {"openMode": "time", "openTime": "06:30", "closeTime": "20:00"}
+
+        self.assertEqual(
+            devices.configuration_diff(
+                current, {"openMode": "time", "openTime": "07:00", "openDelay": 0}
+            ),
+            {"openTime": "07:00", "openDelay": 0},
+        )
+        self.assertEqual(devices.configuration_diff(current, {"openMode": "time"}), {})
+
+    def test_apply_configuration_patch_merges_sent_values(self):
+        door = {"openMode": "time", "openTime": "06:30"}
+        device = {"deviceId": "d1", "configuration": {"door": door, "light": {"mode": "auto"}}}
+
+        updated = devices.apply_configuration_patch(device, {"door": {"openTime": "07:00"}})
+
+        self.assertEqual(updated["configuration"]["door"], {"openMode": "time", "openTime": "07:00"})
+        self.assertIs(updated["configuration"]["light"], device["configuration"]["light"])
+        # The cached copy is replaced, not mutated.
+        self.assertEqual(door["openTime"], "06:30")
+
+    def test_apply_configuration_patch_prefers_response_body(self):
+        device = {"configuration": {"fan": {"mode": "time"}}}
+        patch = {"fan": {"mode": "manual"}}
+
+        for response in (
+            {"fan": {"mode": "manual", "manualSpeed": 80}},
+            {"deviceId": "d1", "configuration": {"fan": {"mode": "manual", "manualSpeed": 80}}},
+        ):
+            self.assertEqual(
+                devices.apply_configuration_patch(device, patch, response)["configuration"],
+                {"fan": {"mode": "manual", "manualSpeed": 80}},
+            )
+        # An unrelated body falls back to the sent patch.
+        self.assertEqual(
+            devices.apply_configuration_patch(device, patch, {"ok": True})["configuration"],
+            {"fan": {"mode": "manual"}},
+        )
+
+
+class ActionIndexTests(unittest.TestCase):
+    def test_indexes_by_lower_case_action_value(self):
+        index = devices.build_action_index(
+            [_action("Open"), _action("close"), {"actionValue": "restart"}]
+        )
+
+        self.assertEqual(
+            index,
+            {
+                "open": "/device/dev1/action/Open",
+                "close": "/device/dev1/action/close",
+            },
+        )
+
+    def test_first_matching_action_wins(self):
+        first = {"actionValue": "on", "url": "/first"}
+        second = {"actionValue": "ON", "url": "/second"}
+
+        self.assertEqual(devices.build_action_index([first, second]), {"on": "/first"})
+
+    def test_fallback_action_url(self):
+        self.assertEqual(
+            devices.fallback_action_url("dev1", "Restart"),
+            "device/dev1/action/restart",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import ast
+import importlib
+from pathlib import Path
+import re
+import unittest
+
+
+INTEGRATION_PATH = (
+    Path(__file__).resolve().parents[1] / "custom_components" / "omlet_smart_coop"
+)
+
+entity_keys = importlib.import_module("omlet_core.entity_keys")
+phase_timer = importlib.import_module("omlet_core.phase_timer")
+sensor_values = importlib.import_module("omlet_core.sensor_values")
+
+# Literal suffixes passed to build_entity_unique_id or set as _CFG_KEY.
+_SUFFIX_RE = re.compile(
+    r'build_entity_unique_id\([^()]*?,\s*"(\w+)"\s*\)|_CFG_KEY\s*=\s*"(\w+)"'
+)
+
+
+def _dict_keys(path: Path, name: str) -> set[str]:
+    """Return the literal keys of a module-level dict assignment, without importing."""
+    tree = ast.parse(path.read_text())
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and isinstance(node.targets[0], ast.Name)
+            and node.targets[0].id == name
+        ):
+            return {key.value for key in node.value.keys}
+    raise AssertionError(f"{name} not found in {path.name}")
+
+
+class EntityKeyTests(unittest.TestCase):
+    """The tables must follow the platforms, which tests cannot import."""
+
+    def test_sensor_keys_match_sensor_platform(self):
+        sensor_path = INTEGRATION_PATH / "sensor.py"
+
+        self.assertEqual(
+            _dict_keys(sensor_path, "SENSOR_TYPES"), set(sensor_values.SENSOR_VALUE_KEYS)
+        )
+        self.assertEqual(
+            _dict_keys(sensor_path, "COORDINATOR_SENSOR_TYPES"),
+            set(entity_keys.COORDINATOR_SENSOR_KEYS),
+        )
+
+    def test_every_platform_suffix_is_known(self):
+        suffixes = set()
+        for platform in ("cover", "fan", "light", "number", "select", "time"):
+            source = (INTEGRATION_PATH / f"{platform}.py").read_text()
+            suffixes.update(
+                first or second for first, second in _SUFFIX_RE.findall(source)
+            )
+
+        self.assertIn("timeOff4", suffixes)
+        self.assertEqual(suffixes - entity_keys.SERIAL_UNIQUE_ID_SUFFIXES, set())
+
+    def test_entry_sensor_keys_are_not_migrated_to_serials(self):
+        self.assertFalse(
+            entity_keys.COORDINATOR_SENSOR_KEYS & entity_keys.SERIAL_UNIQUE_ID_SUFFIXES
+        )
+
+
+class PhaseTimerTests(unittest.TestCase):
+    def test_marks_time_consecutive_phases(self):
+        ticks = iter([10.0, 10.5, 12.0, 12.25])
+        timer = phase_timer.PhaseTimer(clock=lambda: next(ticks))
+
+        self.assertEqual(timer.mark("coordinator"), 0.5)
+        timer.mark("first_refresh")
+        timer.mark("coordinator")
+
+        self.assertEqual(
+            timer.as_dict(),
+            {"phases_ms": {"coordinator": 750.0, "first_refresh": 1500.0}, "total_ms": 2250.0},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
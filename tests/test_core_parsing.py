@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from datetime import datetime, time as dt_time, timezone
+import importlib
+import unittest
+
+
+fan = importlib.import_module("omlet_core.fan")
+identity = importlib.import_module("omlet_core.identity")
+parsing = importlib.import_module("omlet_core.parsing")
+sensor_values = importlib.import_module("omlet_core.sensor_values")
+
+
+def _device(**overrides):
+    device = {
+        "deviceId": "dev1",
+        "deviceSerial": "SN1",
+        "name": "Coop",
+        "deviceType": "Autodoor",
+        "state": {
+            "general": {"firmwareVersionCurrent": "1.2", "batteryLevel": 80, "extra": 1},
+            "connectivity": {"ssid": "home", "wifiStrength": None},
+            "door": {"state": "open", "lastOpenTime": "2026-04-18T06:30:00Z"},
+            "light": {},
+        },
+        "configuration": {"door": {"openMode": "time"}, "unknown": {"x": 1}},
+        "actions": [
+            {"actionName": "open", "description": "Open", "actionValue": "open"},
+            {"actionName": "broken"},
+        ],
+    }
+    device.update(overrides)
+    return device
+
+
+class ParseDevicesTests(unittest.TestCase):
+    def test_parses_known_fields_and_adds_restart_action(self):
+        parsed = parsing.parse_devices([_device(), {"name": "no id"}])
+
+        self.assertEqual(list(parsed), ["dev1"])
+        device = parsed["dev1"]
+        self.assertEqual(device["firmware"], "1.2")
+        self.assertEqual(
+            device["state"],
+            {
+                "general": {"firmwareVersionCurrent": "1.2", "batteryLevel": 80},
+                "connectivity": {"ssid": "home"},
+                "door": {"state": "open", "lastOpenTime": "2026-04-18T06:30:00Z"},
+            },
+        )
+        self.assertEqual(device["configuration"]["door"], {"openMode": "time"})
+        self.assertNotIn("unknown", device["configuration"])
+        self.assertEqual(
+            [action["actionValue"] for action in device["actions"]], ["open", "restart"]
+        )
+        self.assertEqual(device["actions"][1]["url"], "/device/dev1/action/restart")
+
+    def test_malformed_sections_are_replaced(self):
+        parsed = parsing.parse_device(_device(state="bad", configuration=None, actions={}))
+
+        self.assertEqual(parsed["state"], {"general": {}, "connectivity": {}})
+        self.assertEqual(parsed["firmware"], "Unknown")
+        self.assertEqual(parsed["configuration"]["door"], {})
+        self.assertFalse(any(parsed["configuration"].values()))
+        self.assertEqual([action["actionValue"] for action in parsed["actions"]], ["restart"])
+
+    def test_rejects_empty_or_non_list_responses(self):
+        for data in (None, [], {"deviceId": "dev1"}):
+            with self.subTest(data=data), self.assertRaises(parsing.DeviceDataError):
+                parsing.parse_devices(data)
+
+
+class SensorValueTests(unittest.TestCase):
+    def test_extracts_plain_timestamp_and_mapped_values(self):
+        device = parsing.parse_device(_device())
+        device["configuration"]["fan"] = {"mode": "Temperature"}
+
+        self.assertEqual(sensor_values.extract_sensor_value("battery_level", device), 80)
+        self.assertEqual(sensor_values.extract_sensor_value("door_open_mode", device), "time")
+        self.assertEqual(
+            sensor_values.extract_sensor_value("last_open_time", device),
+            datetime(2026, 4, 18, 6, 30, tzinfo=timezone.utc),
+        )
+        self.assertEqual(sensor_values.extract_sensor_value("fan_mode", device), "thermostatic")
+        self.assertIsNone(sensor_values.extract_sensor_value("feeder_state", device))
+        self.assertIsNone(sensor_values.extract_sensor_value("not_a_sensor", device))
+
+    def test_feeder_mode_falls_back_to_configuration(self):
+        device = {"state": {"feeder": {}}, "configuration": {"feeder": {"mode": "auto"}}}
+
+        self.assertEqual(sensor_values.extract_sensor_value("feeder_mode", device), "auto")
+
+
+class IdentityAndFanTests(unittest.TestCase):
+    def test_identity_prefers_serial(self):
+        self.assertEqual(identity.get_stable_device_identity({"deviceSerial": " SN1 "}, "d"), "SN1")
+        self.assertEqual(
+            identity.get_stable_device_identity({"deviceSerial": "unknown", "deviceId": "d2"}, "d"),
+            "d2",
+        )
+        self.assertEqual(identity.build_entity_unique_id(None, "d", "_door"), "d_door")
+        self.assertEqual(
+            identity.extract_known_suffix("SN1_fan_temp_on", ["temp_on", "fan_temp_on"]),
+            "fan_temp_on",
+        )
+
+    def test_fan_helpers(self):
+        device = {"state": {"fan": {"state": "onPending"}}, "configuration": {"fan": None}}
+
+        self.assertTrue(fan.fan_is_running(device))
+        self.assertEqual(fan.fan_config(device), {})
+        self.assertEqual(fan.parse_hhmm("7:05"), dt_time(7, 5))
+        self.assertIsNone(fan.parse_hhmm("later"))
+        self.assertEqual(fan.format_hhmm(dt_time(7, 5)), "07:05")
+
+
+if __name__ == "__main__":
+    unittest.main()
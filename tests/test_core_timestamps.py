@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import importlib
+import unittest
+
+
+timestamps = importlib.import_module("omlet_core.timestamps")
+
+
+class ParseTimestampTests(unittest.TestCase):
+    def setUp(self):
+        timestamps.reset_parse_failure_log()
+
+    def test_parses_iso_timestamp_with_timezone(self):
+        parsed = timestamps.parse_timestamp("2026-04-18T06:30:00+00:00")
+
+        self.assertEqual(parsed, datetime(2026, 4, 18, 6, 30, tzinfo=timezone.utc))
+
+    def test_empty_value_returns_none(self):
+        self.assertIsNone(timestamps.parse_timestamp(None))
+        self.assertIsNone(timestamps.parse_timestamp(""))
+
+    def test_parse_failure_warning_is_rate_limited(self):
+        with self.assertLogs(timestamps._LOGGER, "WARNING") as logs:
+            for index in range(5):
+                self.assertIsNone(timestamps.parse_timestamp(f"bogus-{index}"))
+            self.assertIsNone(timestamps.parse_timestamp(12345))
+
+        self.assertEqual(len(logs.records), 1)
+
+    def test_suppressed_failures_are_counted_in_next_warning(self):
+        with self.assertLogs(timestamps._LOGGER, "WARNING") as logs:
+            timestamps.parse_timestamp("bogus")
+            timestamps.parse_timestamp("bogus")
+            timestamps._failure_state["last_logged"] = None
+            timestamps.parse_timestamp("bogus")
+
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("1 similar failures suppressed", logs.records[1].getMessage())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import sys
+import unittest
+
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "omlet_smart_coop"
+    / "poll_drift.py"
+)
+SPEC = importlib.util.spec_from_file_location("omlet_poll_drift", MODULE_PATH)
+poll_drift = importlib.util.module_from_spec(SPEC)
+assert SPEC.loader is not None
+sys.modules[SPEC.name] = poll_drift
+SPEC.loader.exec_module(poll_drift)
+
+
+class PollDriftDetectorTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.detector = poll_drift.PollDriftDetector(
+            window=10, min_changes=3, grace=30.0, clock=lambda: self.now
+        )
+        self.detector.fetch_completed({"d1": "a", "d2": "a"})
+
+    def _poll(self, **fingerprints):
+        self.now += 300.0
+        return self.detector.fetch_completed(fingerprints)
+
+    def test_changes_without_webhook_are_missed(self):
+        self.assertEqual(self._poll(d1="b", d2="a"), 1)
+        self.detector.webhook_received("d2")
+        self.assertEqual(self._poll(d1="b", d2="b"), 0)
+
+        self.assertEqual(self.detector.miss_rate(), 0.5)
+        self.assertEqual(self.detector.miss_rate("d1"), 1.0)
+        self.assertEqual(self.detector.miss_rate("d2"), 0.0)
+
+    def test_commands_and_anonymous_webhooks_cover_changes(self):
+        self.detector.command_sent("d1")
+        self.detector.webhook_received(None)
+
+        self.assertEqual(self._poll(d1="b", d2="b"), 0)
+        self.assertEqual(self.detector.as_dict()["changes"], 2)
+
+    def test_late_webhook_retracts_miss(self):
+        self._poll(d1="b", d2="a")
+        self.now += 5.0
+        self.detector.webhook_received("d1")
+
+        self.assertEqual(self.detector.miss_rate(), 0.0)
+        self.assertEqual(self.detector.as_dict()["retracted"], 1)
+
+    def test_new_devices_are_not_changes(self):
+        self.assertEqual(self._poll(d1="a", d2="a", d3="x"), 0)
+        self.assertIsNone(self.detector.miss_rate())
+
+    def test_interval_grows_while_webhooks_keep_up(self):
+        for value in "bcd":
+            self.detector.webhook_received("d1")
+            self._poll(d1=value, d2="a")
+
+        self.assertEqual(self.detector.suggest_interval(300, 60, 86400), 450)
+        # The window starts over at the new interval.
+        self.assertEqual(self.detector.suggest_interval(450, 60, 86400), 450)
+
+    def test_interval_shrinks_when_webhooks_miss(self):
+        for value in "bcd":
+            self._poll(d1=value, d2="a")
+
+        self.assertEqual(self.detector.suggest_interval(100, 60, 86400), 60)
+        self.assertEqual(self.detector.as_dict()["adjustments"], 1)
+
+    def test_too_few_changes_keep_interval(self):
+        self._poll(d1="b", d2="a")
+
+        self.assertEqual(self.detector.suggest_interval(300, 60, 86400), 300)
+
+    def test_event_state_ignores_volatile_readings(self):
+        first = {"state": {"general": {"uptime": 1}, "door": {"state": "open", "lightLevel": 5}}}
+        second = {"state": {"general": {"uptime": 2}, "door": {"state": "open", "lightLevel": 9}}}
+
+        self.assertEqual(poll_drift.event_state(first), poll_drift.event_state(second))
+        self.assertEqual(poll_drift.event_state(first)["door"], {"state": "open"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import sys
+import unittest
+
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "omlet_smart_coop"
+    / "refresh_schedule.py"
+)
+SPEC = importlib.util.spec_from_file_location("omlet_refresh_schedule", MODULE_PATH)
+refresh_schedule = importlib.util.module_from_spec(SPEC)
+assert SPEC.loader is not None
+sys.modules[SPEC.name] = refresh_schedule
+SPEC.loader.exec_module(refresh_schedule)
+
+
+class RefreshScheduleTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.schedule = refresh_schedule.RefreshSchedule(
+            merge_window=1.0, clock=lambda: self.now
+        )
+
+    def _fire_all(self):
+        """Advance to each deadline like the coordinator timer; return refresh times."""
+        fired = []
+        while (delay := self.schedule.next_delay()) is not None:
+            self.now += delay
+            if self.schedule.pop_due():
+                fired.append(round(self.now, 2))
+        return fired
+
+    def test_quick_edits_collapse_to_few_refreshes(self):
+        # Five select edits 0.2 s apart, each asking for refreshes at 1.5 s and 5 s.
+        for _ in range(5):
+            self.schedule.add((1.5, 5.0))
+            self.now += 0.2
+
+        self.assertEqual(len(self.schedule), 2)
+        self.assertEqual(self.schedule.as_dict()["merged"], 8)
+        self.assertEqual(self._fire_all(), [1.5, 5.0])
+
+    def test_distant_deadlines_stay_separate(self):
+        self.schedule.add((1.5, 5.0, 15.0))
+
+        self.assertEqual(self._fire_all(), [1.5, 5.0, 15.0])
+
+    def test_regular_refresh_satisfies_nearby_followups(self):
+        self.schedule.add((0.5, 5.0))
+
+        # A refresh completes for another reason right away.
+        self.assertTrue(self.schedule.pop_due())
+        self.assertEqual(len(self.schedule), 1)
+        self.assertAlmostEqual(self.schedule.next_delay(), 5.0)
+
+    def test_clear_cancels_everything(self):
+        self.schedule.add((1.5, 5.0))
+        self.schedule.clear()
+
+        self.assertIsNone(self.schedule.next_delay())
+        self.assertFalse(self.schedule.pop_due())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""Cost of entity.should_add_entity registry checks on a synthetic fleet.
+
+should_add_entity asks the entity registry and the EntityComponent about every
+candidate entity during setup, through core.registry.loaded_entity_id. This
+runs that code against fakes shaped like Home Assistant's indexed registry and
+compares it with a per-setup snapshot (one pass over the entry's registry
+entries, shared by all platforms).
+"""
+
+from __future__ import annotations
+
+import importlib
+import time
+from types import SimpleNamespace
+import unittest
+
+
+registry = importlib.import_module("omlet_core.registry")
+
+DOMAIN = "omlet_smart_coop"
+BENCH_DEVICES = 50
+BENCH_ENTITIES_PER_DEVICE = 40
+BENCH_ROUNDS = 20
+# Generous per-setup bound for 2000 candidates; a few ms is typical.
+BENCH_MAX_SETUP_NS = 100_000_000
+_BENCH_DOMAINS = ("sensor",) * 28 + ("select",) * 7 + ("time",) * 3 + ("number", "fan")
+
+
+def _entry(domain, unique_id, entity_id, platform=DOMAIN):
+    return SimpleNamespace(
+        domain=domain,
+        platform=platform,
+        unique_id=unique_id,
+        entity_id=entity_id,
+    )
+
+
+class FakeEntityRegistry:
+    """Indexed like Home Assistant's registry: (domain, platform, unique_id)."""
+
+    def __init__(self, entries):
+        self.entries = list(entries)
+        self._index = {
+            (entry.domain, entry.platform, entry.unique_id): entry.entity_id
+            for entry in self.entries
+        }
+        self.lookups = 0
+        self.passes = 0
+
+    def async_get_entity_id(self, domain, platform, unique_id):
+        self.lookups += 1
+        return self._index.get((domain, platform, unique_id))
+
+    def entries_for_platform(self, platform):
+        """One pass over every entry, like er.async_entries_for_config_entry."""
+        self.passes += 1
+        return [entry for entry in self.entries if entry.platform == platform]
+
+
+class FakeEntityComponent:
+    def __init__(self, loaded_entity_ids=()):
+        self._entities = {entity_id: object() for entity_id in loaded_entity_ids}
+
+    def get_entity(self, entity_id):
+        return self._entities.get(entity_id)
+
+
+def _synthetic_fleet():
+    candidates = []
+    entries = []
+    for device in range(BENCH_DEVICES):
+        for index, domain in enumerate(_BENCH_DOMAINS):
+            unique_id = f"SERIAL{device:04d}_key{index}"
+            candidates.append((domain, unique_id))
+            entries.append(_entry(domain, unique_id, f"{domain}.coop_{device}_{index}"))
+    # Entities from other integrations share the registry and components.
+    other = [
+        _entry("sensor", f"other_{index}", f"sensor.other_{index}", platform="other")
+        for index in range(2000)
+    ]
+    # Every tenth entity of ours is already live, e.g. a device re-added by a
+    # second platform pass.
+    loaded = other + entries[::10]
+    components = {
+        domain: FakeEntityComponent(
+            entry.entity_id for entry in loaded if entry.domain == domain
+        )
+        for domain in set(_BENCH_DOMAINS)
+    }
+    return candidates, entries, FakeEntityRegistry(entries + other), components
+
+
+class _RegistrySnapshot:
+    """Per-setup alternative: index the entry's registry entries up front."""
+
+    def __init__(self, entity_registry, platform, entity_components):
+        self._entity_ids = {
+            (entry.domain, entry.unique_id): entry.entity_id
+            for entry in entity_registry.entries_for_platform(platform)
+        }
+        self._entity_components = entity_components
+
+    def loaded_entity_id(self, entity_domain, unique_id):
+        entity_id = self._entity_ids.get((entity_domain, unique_id))
+        if entity_id is None:
+            return None
+        entity_comp = self._entity_components.get(entity_domain)
+        if entity_comp is None or entity_comp.get_entity(entity_id) is None:
+            return None
+        return entity_id
+
+
+class RegistryLookupBenchmarks(unittest.TestCase):
+    def test_benchmark_synthetic_50_device_registry(self):
+        candidates, entries, entity_registry, components = _synthetic_fleet()
+
+        start = time.perf_counter_ns()
+        for _ in range(BENCH_ROUNDS):
+            current = [
+                registry.loaded_entity_id(
+                    entity_registry, components, domain, DOMAIN, unique_id
+                )
+                is None
+                for domain, unique_id in candidates
+            ]
+        current_ns = (time.perf_counter_ns() - start) / BENCH_ROUNDS
+
+        start = time.perf_counter_ns()
+        for _ in range(BENCH_ROUNDS):
+            # Building the snapshot is part of every setup, so it is timed too.
+            snapshot = _RegistrySnapshot(entity_registry, DOMAIN, components)
+            batched = [
+                snapshot.loaded_entity_id(domain, unique_id) is None
+                for domain, unique_id in candidates
+            ]
+        snapshot_ns = (time.perf_counter_ns() - start) / BENCH_ROUNDS
+
+        self.assertEqual(current, batched)
+        self.assertEqual(current.count(False), len(entries[::10]))
+        self.assertEqual(len(candidates), BENCH_DEVICES * BENCH_ENTITIES_PER_DEVICE)
+        # One indexed lookup per candidate, never a pass over the registry ...
+        self.assertEqual(entity_registry.lookups, len(candidates) * BENCH_ROUNDS)
+        # ... while the snapshot makes exactly one pass per setup.
+        self.assertEqual(entity_registry.passes, BENCH_ROUNDS)
+        self.assertLess(current_ns, BENCH_MAX_SETUP_NS)
+        self.assertLess(snapshot_ns, BENCH_MAX_SETUP_NS)
+
+
+if __name__ == "__main__":
+    unittest.main()
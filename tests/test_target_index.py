@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import sys
+import time
+import unittest
+
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "omlet_smart_coop"
+    / "target_index.py"
+)
+SPEC = importlib.util.spec_from_file_location("omlet_target_index", MODULE_PATH)
+target_index = importlib.util.module_from_spec(SPEC)
+assert SPEC.loader is not None
+sys.modules[SPEC.name] = target_index
+SPEC.loader.exec_module(target_index)
+
+BENCH_COOPS = 20
+BENCH_DEVICES_PER_COOP = 5
+BENCH_ENTITIES_PER_DEVICE = 40
+BENCH_ROUNDS = 20
+
+
+class Owner:
+    def __init__(self, name, devices):
+        self.name = name
+        self.devices = devices
+
+    def __repr__(self):
+        return self.name
+
+
+def _device(dev_id, serial=None, name=None):
+    return {"deviceId": dev_id, "deviceSerial": serial, "name": name or dev_id}
+
+
+def _index(owners, ha_devices=(), entities=()):
+    index = target_index.DeviceTargetIndex(lambda owner: owner.devices)
+    index.rebuild(owners, ha_devices, entities)
+    return index
+
+
+class DeviceTargetIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.first = Owner("first", {"d1": _device("d1", "S1"), "d2": _device("d2", "S2")})
+        self.second = Owner("second", {"d3": _device("d3", "S3", name="Barn")})
+        self.index = _index(
+            [self.first, self.second],
+            [("ha1", ["S1"]), ("ha2", ["d2"]), ("ha3", ["S3", "d3"])],
+            [("cover.d1_door", "ha1"), ("sensor.d3_battery", "ha3")],
+        )
+
+    def test_device_targets_grouped_by_owner(self):
+        self.assertEqual(
+            self.index.resolve(["ha3", "ha1", "ha2", "ha1"], []),
+            [(self.first, ["d1", "d2"]), (self.second, ["d3"])],
+        )
+
+    def test_entity_targets_only_for_owners_without_device_hits(self):
+        self.assertEqual(
+            self.index.resolve(["ha2"], ["cover.d1_door", "sensor.d3_battery"]),
+            [(self.first, ["d2"]), (self.second, ["d3"])],
+        )
+
+    def test_name_fallback(self):
+        self.assertEqual(self.index.resolve([], [], "Barn"), [(self.second, ["d3"])])
+
+    def test_name_fallback_reads_current_devices(self):
+        # Owners replace their device mapping on every refresh.
+        self.second.devices = {"d3": _device("d3", "S3", name="Hen house")}
+
+        self.assertEqual(self.index.resolve([], [], "Barn"), [])
+        self.assertEqual(
+            self.index.resolve([], [], "Hen house"), [(self.second, ["d3"])]
+        )
+
+    def test_unindexed_targets_use_lookups_once(self):
+        calls = []
+
+        def device_identifiers(ha_device_id):
+            calls.append(ha_device_id)
+            return ["S2"] if ha_device_id == "ha_new" else []
+
+        def entity_device_id(entity_id):
+            calls.append(entity_id)
+            return "ha_new" if entity_id == "light.new" else None
+
+        for _ in range(2):
+            result = self.index.resolve(
+                [],
+                ["light.new", "light.other_integration"],
+                device_identifiers=device_identifiers,
+                entity_device_id=entity_device_id,
+            )
+
+        self.assertEqual(result, [(self.first, ["d2"])])
+        self.assertEqual(calls, ["light.new", "ha_new", "light.other_integration"])
+
+    def test_needs_rebuild(self):
+        self.assertFalse(self.index.needs_rebuild([self.first, self.second]))
+        self.assertTrue(self.index.needs_rebuild([self.first]))
+        self.index.invalidate()
+        self.assertTrue(self.index.needs_rebuild([self.first, self.second]))
+
+    def test_needs_rebuild_when_device_ids_change(self):
+        self.first.devices = dict(self.first.devices)
+        self.assertFalse(self.index.needs_rebuild([self.first, self.second]))
+
+        self.first.devices["d4"] = _device("d4")
+        self.assertTrue(self.index.needs_rebuild([self.first, self.second]))
+
+
+def _legacy_resolve(owners, device_registry, entity_registry, device_ids, entity_ids):
+    """Nested identifier x device loops per owner, as before the index."""
+    results = []
+    for owner in owners:
+        ids = []
+        for device_id in device_ids:
+            for identifier in device_registry.get(device_id, ()):
+                for dev_id, dev_data in owner.devices.items():
+                    if identifier in (dev_data.get("deviceSerial"), dev_data.get("deviceId")):
+                        if dev_id not in ids:
+                            ids.append(dev_id)
+                        break
+        if not ids:
+            for entity_id in entity_ids:
+                ha_device_id = entity_registry.get(entity_id)
+                for identifier in device_registry.get(ha_device_id, ()):
+                    for dev_id, dev_data in owner.devices.items():
+                        if identifier in (dev_data.get("deviceSerial"), dev_data.get("deviceId")):
+                            if dev_id not in ids:
+                                ids.append(dev_id)
+                            break
+        if ids:
+            results.append((owner, ids))
+    return results
+
+
+class DeviceTargetIndexBenchmarks(unittest.TestCase):
+    def test_benchmark_area_target_across_coops(self):
+        owners = []
+        device_registry = {}
+        entity_registry = {}
+        for coop in range(BENCH_COOPS):
+            devices = {}
+            for number in range(BENCH_DEVICES_PER_COOP):
+                dev_id = f"dev{coop}_{number}"
+                devices[dev_id] = _device(dev_id, f"SERIAL{coop}_{number}")
+                device_registry[f"ha_{dev_id}"] = [f"SERIAL{coop}_{number}"]
+                for key in range(BENCH_ENTITIES_PER_DEVICE):
+                    entity_registry[f"sensor.{dev_id}_{key}"] = f"ha_{dev_id}"
+            owners.append(Owner(f"coop{coop}", devices))
+        # An area containing every coop entity plus as many unrelated ones.
+        entity_ids = list(entity_registry)
+        for number in range(len(entity_ids)):
+            entity_registry[f"light.other_{number}"] = None
+        entity_ids += [f"light.other_{number}" for number in range(len(entity_ids))]
+
+        start = time.perf_counter_ns()
+        for _ in range(BENCH_ROUNDS):
+            legacy = _legacy_resolve(owners, device_registry, entity_registry, [], entity_ids)
+        legacy_ns = (time.perf_counter_ns() - start) / BENCH_ROUNDS
+
+        index = _index(
+            owners,
+            device_registry.items(),
+            (
+                (entity_id, ha_device_id)
+                for entity_id, ha_device_id in entity_registry.items()
+                if ha_device_id
+            ),
+        )
+        start = time.perf_counter_ns()
+        for _ in range(BENCH_ROUNDS):
+            indexed = index.resolve(
+                [],
+                entity_ids,
+                device_identifiers=lambda ha_device_id: device_registry.get(ha_device_id, ()),
+                entity_device_id=entity_registry.get,
+            )
+        indexed_ns = (time.perf_counter_ns() - start) / BENCH_ROUNDS
+
+        self.assertEqual(legacy, indexed)
+        self.assertEqual(len(indexed), BENCH_COOPS)
+        # Typically ~40x apart; only the ordering is asserted.
+        self.assertLess(indexed_ns, legacy_ns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "omlet_smart_coop"
+    / "trace_capture.py"
+)
+SPEC = importlib.util.spec_from_file_location("omlet_trace_capture", MODULE_PATH)
+trace_capture = importlib.util.module_from_spec(SPEC)
+assert SPEC.loader is not None
+sys.modules[SPEC.name] = trace_capture
+SPEC.loader.exec_module(trace_capture)
+
+REDACT_KEYS = {"deviceSerial", "token"}
+
+
+class RedactTests(unittest.TestCase):
+    def test_redacts_nested_keys_and_keeps_none(self):
+        data = [
+            {
+                "deviceId": "d1",
+                "deviceSerial": "SN-1",
+                "state": {"general": {"token": "secret", "other": [{"token": None}]}},
+            }
+        ]
+
+        redacted = trace_capture.redact(data, REDACT_KEYS)
+
+        self.assertEqual(redacted[0]["deviceId"], "d1")
+        self.assertEqual(redacted[0]["deviceSerial"], trace_capture.REDACTED)
+        self.assertEqual(redacted[0]["state"]["general"]["token"], trace_capture.REDACTED)
+        self.assertIsNone(redacted[0]["state"]["general"]["other"][0]["token"])
+        self.assertEqual(data[0]["deviceSerial"], "SN-1")
+
+
+class TraceRecorderTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "traces" / "trace.jsonl"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_records_are_written_redacted_and_read_back_in_order(self):
+        clock = iter([1.0, 2.0, 3.0])
+        recorder = trace_capture.TraceRecorder(
+            self.path, REDACT_KEYS, clock=lambda: next(clock)
+        )
+        recorder.record(trace_capture.TRACE_KIND_DEVICES, [{"deviceSerial": "SN-1"}])
+        recorder.record(trace_capture.TRACE_KIND_WEBHOOK, {"deviceId": "d1", "token": "t"})
+        recorder.write(recorder.take_batch())
+        recorder.record(trace_capture.TRACE_KIND_DEVICES, [])
+        recorder.write(recorder.take_batch())
+
+        self.assertNotIn("SN-1", self.path.read_text())
+        with self.path.open("a") as file:
+            file.write("not json\n")
+        records = list(trace_capture.read_trace(self.path))
+        self.assertEqual([record["t"] for record in records], [1.0, 2.0, 3.0])
+        self.assertEqual(records[1]["kind"], trace_capture.TRACE_KIND_WEBHOOK)
+        self.assertEqual(records[1]["data"]["token"], trace_capture.REDACTED)
+        self.assertEqual(recorder.as_dict()["written"], 3)
+
+    def test_record_cap_drops_and_counts(self):
+        recorder = trace_capture.TraceRecorder(self.path, REDACT_KEYS, max_records=2)
+
+        results = [recorder.record("webhook", {"n": index}) for index in range(4)]
+
+        self.assertEqual(results, [True, True, False, False])
+        self.assertEqual(len(recorder.take_batch()), 2)
+        self.assertEqual(recorder.as_dict()["dropped"], 2)
+        self.assertEqual(recorder.take_batch(), [])
+
+    def test_unserializable_values_are_stringified(self):
+        recorder = trace_capture.TraceRecorder(self.path, REDACT_KEYS)
+
+        recorder.record("devices", {"when": object})
+
+        (line,) = recorder.take_batch()
+        self.assertIsInstance(json.loads(line)["data"]["when"], str)
+
+
+if __name__ == "__main__":
+    unittest.main()
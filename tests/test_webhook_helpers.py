@@ -4,6 +4,7 @@ import asyncio
 import importlib.util
 from pathlib import Path
 import sys
+import time
 from types import SimpleNamespace
 import unittest
 
@@ -53,6 +54,12 @@ class FakeHass:
 class FakeCoordinator:
     def __init__(self):
         self.refreshes = 0
+        self.webhooks = 0
+        self.webhook_devices = []
+
+    def async_webhook_received(self, event=None, token_source=None):
+        self.webhooks += 1
+        self.webhook_devices.append((event or {}).get("deviceId"))
 
     async def async_request_refresh(self):
         self.refreshes += 1
@@ -131,6 +138,154 @@ class WebhookTokenTests(unittest.TestCase):
         self.assertEqual(details.source, "query:token")
 
 
+# One request per token source the handler accepts.
+TOKEN_SOURCE_REQUESTS = {
+    "header:Authorization": lambda: (
+        FakeRequest(headers={"Authorization": "Bearer expected"}),
+        {},
+    ),
+    "header:X-Omlet-Token": lambda: (FakeRequest(headers={"X-Omlet-Token": "expected"}), {}),
+    "header:X-Auth-Token": lambda: (FakeRequest(headers={"X-Auth-Token": "expected"}), {}),
+    "payload:token": lambda: (FakeRequest(), {"token": "expected"}),
+    "payload.payload:webhookToken": lambda: (
+        FakeRequest(),
+        {"payload": {"webhookToken": "expected", "deviceId": "d1"}},
+    ),
+    "query:webhook_token": lambda: (FakeRequest(query={"webhook_token": "expected"}), {}),
+}
+
+
+def _request_with_tokens(tokens):
+    """Return (request, payload) carrying each {source: token}."""
+    headers, query, payload = {}, {}, {}
+    for source, token in tokens.items():
+        kind, _, key = source.partition(":")
+        if kind == "header":
+            headers[key] = token
+        elif kind == "query":
+            query[key] = token
+        elif kind == "payload":
+            payload[key] = token
+        else:
+            payload.setdefault("payload", {})[key] = token
+    return FakeRequest(headers=headers, query=query), payload
+
+
+class WebhookTokenVerifierTests(unittest.TestCase):
+    def test_expected_token_cached_until_invalidated(self):
+        entry = SimpleNamespace(options={"webhook_token": "expected"})
+        verifier = webhook_helpers.WebhookTokenVerifier(entry)
+        request, payload = TOKEN_SOURCE_REQUESTS["payload:token"]()
+
+        self.assertTrue(verifier.verify(request, payload)[0])
+        entry.options = {"webhook_token": "rotated"}
+        self.assertTrue(verifier.verify(request, payload)[0])
+
+        verifier.invalidate()
+        self.assertFalse(verifier.verify(request, payload)[0])
+
+    def test_last_source_is_tried_first(self):
+        verifier = webhook_helpers.WebhookTokenVerifier(
+            SimpleNamespace(options={"webhook_token": "expected"})
+        )
+        for _ in range(3):
+            accepted, details = verifier.verify(*TOKEN_SOURCE_REQUESTS["query:webhook_token"]())
+            self.assertTrue(accepted)
+            self.assertEqual(details.source, "query:webhook_token")
+        self.assertEqual(verifier.fast_hits, 2)
+
+        # A different source still works through the full scan.
+        accepted, details = verifier.verify(*TOKEN_SOURCE_REQUESTS["header:X-Omlet-Token"]())
+        self.assertTrue(accepted)
+        self.assertEqual(details.source, "header:X-Omlet-Token")
+        self.assertEqual(verifier.fast_hits, 2)
+
+    def test_learned_source_does_not_outrank_higher_priority_sources(self):
+        verifier = webhook_helpers.WebhookTokenVerifier(
+            SimpleNamespace(options={"webhook_token": "expected"})
+        )
+        verifier.verify(*TOKEN_SOURCE_REQUESTS["query:webhook_token"]())
+        request = FakeRequest(
+            headers={"X-Omlet-Token": "wrong"}, query={"webhook_token": "expected"}
+        )
+
+        accepted, details = verifier.verify(request, {})
+
+        self.assertEqual(
+            (accepted, details),
+            (False, webhook_helpers.get_provided_webhook_token_details(request, {})),
+        )
+        self.assertEqual(details.source, "header:X-Omlet-Token")
+        self.assertEqual(verifier.fast_hits, 0)
+
+    def test_source_order_matches_full_scan(self):
+        sources = webhook_helpers._TOKEN_SOURCES
+        for higher, lower in zip(sources, sources[1:]):
+            with self.subTest(higher=higher, lower=lower):
+                request, payload = _request_with_tokens({higher: "high", lower: "low"})
+                details = webhook_helpers.get_provided_webhook_token_details(
+                    request, payload
+                )
+                self.assertEqual((details.source, details.token), (higher, "high"))
+
+    def test_wrong_token_at_learned_source_is_rejected(self):
+        verifier = webhook_helpers.WebhookTokenVerifier(
+            SimpleNamespace(options={"webhook_token": "expected"})
+        )
+        verifier.verify(*TOKEN_SOURCE_REQUESTS["payload:token"]())
+
+        accepted, details = verifier.verify(FakeRequest(), {"token": "wrong"})
+
+        self.assertFalse(accepted)
+        self.assertEqual(details.source, "payload:token")
+
+    def test_no_configured_token_accepts_everything(self):
+        verifier = webhook_helpers.WebhookTokenVerifier(SimpleNamespace(options={}))
+
+        self.assertEqual(
+            verifier.verify(FakeRequest(), None),
+            (True, webhook_helpers.WebhookTokenDetails(token=None, source=None)),
+        )
+
+
+class WebhookTokenBenchmark(unittest.TestCase):
+    """Time token checks per source: per-request scan vs. the cached verifier.
+
+    A few microseconds per check is typical; only a loose bound is asserted.
+    """
+
+    ROUNDS = 2000
+    MAX_US_PER_CHECK = 500
+
+    def test_benchmark_each_token_source(self):
+        entry = SimpleNamespace(
+            options={"webhook_token": "expected", "secret": "unused", "token": "unused"}
+        )
+        verifier = webhook_helpers.WebhookTokenVerifier(entry)
+        for source, make_request in TOKEN_SOURCE_REQUESTS.items():
+            request, payload = make_request()
+            with self.subTest(source=source):
+                started = time.perf_counter()
+                for _ in range(self.ROUNDS):
+                    expected = webhook_helpers.get_expected_webhook_token(entry)
+                    details = webhook_helpers.get_provided_webhook_token_details(
+                        request, payload
+                    )
+                    self.assertEqual(details.token, expected)
+                scan_us = (time.perf_counter() - started) / self.ROUNDS * 1e6
+
+                verifier.invalidate()
+                started = time.perf_counter()
+                for _ in range(self.ROUNDS):
+                    accepted, details = verifier.verify(request, payload)
+                    self.assertTrue(accepted)
+                cached_us = (time.perf_counter() - started) / self.ROUNDS * 1e6
+
+                self.assertEqual(details.source, source)
+                self.assertLess(scan_us, self.MAX_US_PER_CHECK)
+                self.assertLess(cached_us, self.MAX_US_PER_CHECK)
+
+
 class WebhookHandlerTests(unittest.IsolatedAsyncioTestCase):
     async def test_official_payload_without_configured_token_refreshes(self):
         entry = SimpleNamespace(options={})
@@ -159,6 +314,8 @@ class WebhookHandlerTests(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(response.status, 200)
         self.assertEqual(coordinator.refreshes, 1)
+        self.assertEqual(coordinator.webhooks, 1)
+        self.assertEqual(coordinator.webhook_devices, ["1234567"])
 
     async def test_configured_token_mismatch_rejects_without_refresh(self):
         entry = SimpleNamespace(options={"webhook_token": "expected"})
@@ -179,6 +336,7 @@ class WebhookHandlerTests(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(response.status, 401)
         self.assertEqual(coordinator.refreshes, 0)
+        self.assertEqual(coordinator.webhooks, 0)
         self.assertEqual(hass.tasks, [])
 
     async def test_configured_token_match_refreshes(self):
@@ -224,6 +382,137 @@ class WebhookHandlerTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(coordinator.refreshes, 1)
 
 
+class WebhookMetricsTests(unittest.IsolatedAsyncioTestCase):
+    async def test_handler_counts_outcomes(self):
+        entry = SimpleNamespace(options={"webhook_token": "expected"})
+        coordinator = FakeCoordinator()
+        hass = FakeHass()
+        metrics = webhook_helpers.WebhookMetrics()
+        handler = webhook_helpers.create_omlet_webhook_handler(
+            entry,
+            coordinator,
+            response_factory=FakeResponse,
+            logger=NullLogger(),
+            metrics=metrics,
+        )
+        event = {"token": "expected", "deviceId": "d1", "newValue": "open"}
+
+        await handler(hass, "0123456789abcdef", FakeRequest(event))
+        await handler(hass, "0123456789abcdef", FakeRequest(event))
+        await handler(hass, "0123456789abcdef", FakeRequest({"token": "wrong"}))
+        await handler(
+            hass, "0123456789abcdef", FakeRequest(json_error=ValueError("not json"))
+        )
+        await asyncio.gather(*hass.tasks)
+
+        stats = metrics.as_dict()
+        self.assertEqual(stats["received"], 4)
+        self.assertEqual(stats["accepted"], 2)
+        self.assertEqual(stats["rejected"], 2)
+        self.assertEqual(stats["non_json"], 1)
+        self.assertEqual(stats["handler_latency"]["count"], 4)
+        # Counting never drops events: a repeated event is still recorded and
+        # refreshes again.
+        self.assertEqual(coordinator.refreshes, 2)
+        self.assertEqual(coordinator.webhooks, 2)
+
+    async def test_handler_traces_raw_payload_before_extraction(self):
+        entry = SimpleNamespace(options={"webhook_token": "expected"})
+        coordinator = FakeCoordinator()
+        traced = []
+        coordinator.async_trace_webhook = lambda payload, source: traced.append(
+            (payload, source)
+        )
+        hass = FakeHass()
+        payload = {
+            "payload": {"token": "expected", "deviceId": "d1", "newValue": "open"},
+            "event": "state",
+        }
+        live, replay = (
+            webhook_helpers.create_omlet_webhook_handler(
+                entry,
+                coordinator,
+                response_factory=FakeResponse,
+                logger=NullLogger(),
+                replay=is_replay,
+            )
+            for is_replay in (False, True)
+        )
+
+        await live(hass, "0123456789abcdef", FakeRequest(payload))
+        await live(hass, "0123456789abcdef", FakeRequest({"token": "wrong"}))
+        await replay(hass, "0123456789abcdef", FakeRequest(payload))
+        await asyncio.gather(*hass.tasks)
+
+        # Only the accepted live request is traced, as received, not as the
+        # extracted event; replays are not traced again.
+        self.assertEqual(traced, [(payload, "payload.payload:token")])
+        self.assertEqual(coordinator.webhook_devices, ["d1"])
+
+    async def test_replay_feeds_journaled_events_through_handler(self):
+        entry = SimpleNamespace(options={"webhook_token": "expected"})
+        coordinator = FakeCoordinator()
+        coordinator.webhook_tokens = webhook_helpers.WebhookTokenVerifier(entry)
+        hass = FakeHass()
+        metrics = webhook_helpers.WebhookMetrics()
+        handler = webhook_helpers.create_omlet_webhook_handler(
+            entry,
+            coordinator,
+            response_factory=FakeResponse,
+            logger=NullLogger(),
+            metrics=metrics,
+            replay=True,
+        )
+        records = [
+            {"received": 10.0, "deviceId": "d1", "newValue": "open", "token_source": "query:token"},
+            {"received": 12.5, "deviceId": "d1", "newValue": "closed"},
+            {"received": 200.0, "deviceId": "d2", "newValue": "on"},
+        ]
+        sleeps = []
+
+        async def _sleep(seconds):
+            sleeps.append(seconds)
+
+        counts = await webhook_helpers.replay_webhook_events(
+            hass, handler, "hook", records, token="expected", realtime=True, sleep=_sleep
+        )
+        await asyncio.gather(*hass.tasks)
+
+        self.assertEqual(counts, {"replayed": 3, "accepted": 3})
+        self.assertEqual(sleeps, [2.5, 60.0])
+        self.assertEqual(metrics.accepted, 3)
+        self.assertEqual(coordinator.refreshes, 3)
+        # Replays are not recorded as deliveries (nor journaled again).
+        self.assertEqual(coordinator.webhooks, 0)
+        # Nor do they teach the live verifier their token source.
+        self.assertIsNone(coordinator.webhook_tokens._last_source)
+
+    def test_update_latency_times_earliest_pending_webhook(self):
+        now = [10.0]
+        metrics = webhook_helpers.WebhookMetrics(clock=lambda: now[0])
+
+        metrics.entities_updated()
+        metrics.update_pending()
+        now[0] += 0.4
+        metrics.update_pending()
+        now[0] += 0.8
+        metrics.entities_updated()
+        metrics.entities_updated()
+
+        self.assertEqual(metrics.update.count, 1)
+        self.assertAlmostEqual(metrics.update.max_ms, 1200.0)
+
+    def test_histogram_percentiles_use_bucket_bounds(self):
+        histogram = webhook_helpers.LatencyHistogram((1, 10, 100))
+        for value in (0.5, 0.7, 3, 4, 5, 6, 7, 8, 50, 400):
+            histogram.record(value)
+
+        self.assertEqual(histogram.percentile(0.5), 10.0)
+        self.assertEqual(histogram.percentile(0.9), 100.0)
+        self.assertEqual(histogram.percentile(0.99), 400.0)
+        self.assertEqual(histogram.as_dict()["buckets"], {"<=1": 2, "<=10": 6, "<=100": 1, ">100": 1})
+
+
 class WebhookIdAndUrlTests(unittest.TestCase):
     def test_generates_stable_random_webhook_id(self):
         hass = FakeHassWithConfig()
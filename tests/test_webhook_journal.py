@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "omlet_smart_coop"
+    / "webhook_journal.py"
+)
+SPEC = importlib.util.spec_from_file_location("omlet_webhook_journal", MODULE_PATH)
+webhook_journal = importlib.util.module_from_spec(SPEC)
+assert SPEC.loader is not None
+sys.modules[SPEC.name] = webhook_journal
+SPEC.loader.exec_module(webhook_journal)
+
+
+def _event(value):
+    return {
+        "deviceId": "d1",
+        "parameterName": "Door Open State",
+        "oldValue": "closed",
+        "newValue": value,
+        "token": "secret-token",
+    }
+
+
+class WebhookJournalTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / ".storage" / "journal.jsonl"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _flush(self, journal):
+        batch, rewrite = journal.take_batch()
+        journal.write(batch, rewrite)
+
+    def test_records_only_event_fields_and_token_source(self):
+        journal = webhook_journal.WebhookJournal(self.path)
+
+        record = journal.record(_event("open"), "header:X-Omlet-Token", received=12.5)
+
+        self.assertEqual(
+            record,
+            {
+                "received": 12.5,
+                "deviceId": "d1",
+                "parameterName": "Door Open State",
+                "oldValue": "closed",
+                "newValue": "open",
+                "token_source": "header:X-Omlet-Token",
+            },
+        )
+
+    def test_batches_are_appended_and_reloaded(self):
+        journal = webhook_journal.WebhookJournal(self.path)
+        journal.record(_event("open"), received=1.0)
+        journal.record(_event("closed"), received=2.0)
+        self._flush(journal)
+        journal.record(_event("open"), received=3.0)
+        self._flush(journal)
+
+        self.assertFalse(journal.has_pending())
+        self.assertNotIn("secret-token", self.path.read_text())
+
+        reloaded = webhook_journal.WebhookJournal(self.path)
+        reloaded.load()
+        self.assertEqual([e["received"] for e in reloaded.events()], [1.0, 2.0, 3.0])
+        self.assertEqual([e["received"] for e in reloaded.events(2)], [2.0, 3.0])
+
+    def test_file_is_compacted_past_twice_the_cap(self):
+        journal = webhook_journal.WebhookJournal(self.path, max_events=3)
+        for index in range(7):
+            journal.record(_event(str(index)), received=float(index))
+            self._flush(journal)
+
+        lines = [json.loads(line) for line in self.path.read_text().splitlines()]
+        self.assertEqual(journal.compactions, 1)
+        self.assertEqual([line["received"] for line in lines], [4.0, 5.0, 6.0])
+        self.assertEqual(len(journal), 3)
+
+    def test_load_keeps_events_recorded_meanwhile(self):
+        self.path.parent.mkdir(parents=True)
+        self.path.write_text('{"received": 1.0}\nnot json\n{"received": 2.0}\n')
+        journal = webhook_journal.WebhookJournal(self.path, max_events=2)
+        journal.record(_event("open"), received=3.0)
+
+        journal.load()
+
+        self.assertEqual([e["received"] for e in journal.events()], [2.0, 3.0])
+
+    def test_missing_file_loads_empty_and_removes_quietly(self):
+        journal = webhook_journal.WebhookJournal(self.path)
+
+        journal.load()
+        journal.remove()
+
+        self.assertEqual(journal.events(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
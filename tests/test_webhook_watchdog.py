@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import sys
+import unittest
+
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "omlet_smart_coop"
+    / "webhook_watchdog.py"
+)
+SPEC = importlib.util.spec_from_file_location("omlet_webhook_watchdog", MODULE_PATH)
+webhook_watchdog = importlib.util.module_from_spec(SPEC)
+assert SPEC.loader is not None
+sys.modules[SPEC.name] = webhook_watchdog
+SPEC.loader.exec_module(webhook_watchdog)
+
+
+class WebhookWatchdogTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.watchdog = webhook_watchdog.WebhookWatchdog(
+            3600, missed_threshold=2, clock=lambda: self.now
+        )
+        self.watchdog.fetch_completed("a")
+
+    def _heartbeat(self, fingerprint):
+        self.now += self.watchdog.heartbeat_due_in()
+        return self.watchdog.fetch_completed(fingerprint, heartbeat=True)
+
+    def test_heartbeat_due_after_silence(self):
+        self.now += 1000
+        self.assertEqual(self.watchdog.heartbeat_due_in(), 2600)
+        self.watchdog.webhook_received()
+        self.assertEqual(self.watchdog.heartbeat_due_in(), 3600)
+        self.now += 4000
+        self.assertEqual(self.watchdog.heartbeat_due_in(), 0)
+
+    def test_unannounced_changes_mark_delivery_broken(self):
+        self.assertFalse(self._heartbeat("b"))
+        self.assertTrue(self._heartbeat("c"))
+        self.assertTrue(self.watchdog.delivery_broken)
+        # Reported once, not on every further heartbeat.
+        self.assertFalse(self._heartbeat("d"))
+
+        self.assertTrue(self.watchdog.webhook_received())
+        self.assertFalse(self.watchdog.delivery_broken)
+        self.assertEqual(self.watchdog.missed, 0)
+
+    def test_quiet_devices_or_announced_changes_are_fine(self):
+        self.assertFalse(self._heartbeat("a"))
+        self.watchdog.webhook_received()
+        self.assertFalse(self._heartbeat("b"))
+        self.assertFalse(self._heartbeat("b"))
+        self.assertEqual(self.watchdog.missed, 0)
+
+    def test_changes_found_by_other_fetches_do_not_count(self):
+        self.watchdog.fetch_completed("b")
+        self.watchdog.fetch_completed("c")
+
+        self.assertEqual(self.watchdog.missed, 0)
+        self.assertEqual(self.watchdog.as_dict()["heartbeats"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()